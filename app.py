@@ -3,11 +3,18 @@ CinemaPulse - Flask Application
 Main entry point with API routes and session management
 """
 
-from flask import Flask, render_template, session, redirect
+import time
+from flask import Flask, render_template, session, redirect, request, g, url_for
 from config import get_config
+from services.metrics_service import metrics_service
+from services.profiler_service import profiler_service
+from services.response_service import FastJSONProvider, compress_response
+from services.asset_service import asset_manifest
+from database import query_trace
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = FastJSONProvider(app)  # orjson when installed
 
 # Load configuration based on environment
 config = get_config()
@@ -20,12 +27,123 @@ from routes.movie_routes import movie_bp
 from routes.feedback_routes import feedback_bp
 from routes.analytics_routes import analytics_bp
 from routes.admin_routes import admin_bp
+from routes.metrics_routes import metrics_bp
+from routes.search_routes import search_bp
+from routes.poster_routes import poster_bp
+from routes.asset_routes import asset_bp
+from routes.health_routes import health_bp
 
 app.register_blueprint(auth_bp)
 app.register_blueprint(movie_bp)
 app.register_blueprint(feedback_bp)
 app.register_blueprint(analytics_bp)
 app.register_blueprint(admin_bp)
+app.register_blueprint(metrics_bp)
+app.register_blueprint(search_bp)
+app.register_blueprint(poster_bp)
+app.register_blueprint(asset_bp)
+app.register_blueprint(health_bp)
+
+# ========== STATIC ASSETS ==========
+
+@app.context_processor
+def inject_asset_url():
+    """asset_url('css/main.css') -> fingerprinted URL (plain static URL if not in the manifest)"""
+    def asset_url(filename):
+        return asset_manifest.url(filename) or url_for('static', filename=filename)
+    return {'asset_url': asset_url}
+
+# ========== RESPONSE COMPRESSION ==========
+
+# gzip/brotli by Accept-Encoding. after_request hooks run in reverse
+# registration order, so registering this first makes it run last.
+app.after_request(compress_response)
+
+# ========== REQUEST INSTRUMENTATION ==========
+
+@app.before_request
+def start_request_timer():
+    """Mark request start for latency histograms and in-flight gauge"""
+    if metrics_service.enabled:
+        g.metrics_start = time.perf_counter()
+        metrics_service.request_started()
+
+@app.after_request
+def record_request_metrics(response):
+    """Record latency and status per route template (not raw path)"""
+    start = g.pop('metrics_start', None)
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics_service.request_finished(
+            request.method, route, response.status_code, time.perf_counter() - start
+        )
+    return response
+
+@app.teardown_request
+def close_request_metrics(error):
+    """Requests that never produced a response still leave the in-flight gauge"""
+    start = g.pop('metrics_start', None)
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics_service.request_finished(
+            request.method, route, 500, time.perf_counter() - start
+        )
+
+# ========== QUERY TRACING ==========
+
+@app.before_request
+def start_query_trace():
+    """Collect every DB statement / DynamoDB call made by this request"""
+    if config.QUERY_TRACE_ENABLED:
+        query_trace.start_trace()
+
+@app.after_request
+def report_query_trace(response):
+    """Expose the trace summary in debug mode and warn on budget overruns"""
+    trace = query_trace.finish_trace()
+    if trace is None:
+        return response
+
+    summary = trace.summary()
+    if app.debug:
+        response.headers['X-Query-Trace'] = query_trace.format_summary(summary)
+
+    if (summary['queries'] > config.QUERY_BUDGET_COUNT
+            or summary['capacity'] > config.QUERY_BUDGET_CAPACITY):
+        print(f"⚠️ Query budget exceeded: {request.method} {request.path} "
+              f"({query_trace.format_summary(summary)})")
+        for entry in trace.entries:
+            print(f"   {entry['duration'] * 1000:.2f}ms rows={entry['rows']} {entry['statement']}")
+    return response
+
+@app.teardown_request
+def discard_query_trace(error):
+    """Never leak a trace into the next request on this thread"""
+    query_trace.finish_trace()
+
+# ========== ON-DEMAND PROFILING ==========
+
+@app.before_request
+def start_request_profile():
+    """Admins can profile a single request with X-Profile: 1 or ?_profile=1"""
+    wants_profile = (request.headers.get('X-Profile') == '1'
+                     or request.args.get('_profile') == '1')
+    if not wants_profile:
+        return
+    if 'user_email' not in session or session.get('user_role') != 'admin':
+        return
+    g.profile = profiler_service.start_request_profile()
+
+@app.after_request
+def finish_request_profile(response):
+    """Save the request profile and tell the admin where to fetch it"""
+    profile = g.pop('profile', None)
+    if profile is not None:
+        name = profiler_service.finish_request_profile(
+            profile, f"{request.method}_{request.path}"
+        )
+        response.headers['X-Profile-Id'] = name
+    return response
 
 # ========== PAGE ROUTES (serve HTML templates) ==========
 
@@ -47,7 +165,7 @@ def movie_detail(movie_id):
 @app.route('/feedback/<int:movie_id>')
 def feedback_page(movie_id):
     """Feedback form for a specific movie"""
-    return render_template('feedback.html', movie_id=movie_id)
+    return render_template('feedback.html', movie_id=movie_id, max_comment_length=config.MAX_COMMENT_LENGTH)
 
 @app.route('/thankyou')
 def thankyou():
@@ -86,4 +204,6 @@ def internal_error(error):
 
 if __name__ == '__main__':
     print(f"✓ CinemaPulse starting in {config.ENV_MODE.upper()} mode")
+    from services.worker_service import worker_service
+    worker_service.warmup()
     app.run(debug=config.DEBUG, host=config.HOST, port=config.PORT)
@@ -20,6 +20,8 @@ Session(app)
 
 if __name__ == "__main__":
     print("✓ CinemaPulse running on AWS EC2")
+    from services.worker_service import worker_service
+    worker_service.warmup()
     app.run(
         host="0.0.0.0",
         port=5000,   # keep this
@@ -0,0 +1,11 @@
+"""
+Add the catalog GSI attributes to existing DynamoDB movies
+Run once after creating the catalog-*/genre-* GSIs (AWS mode only):
+    python backfill_catalog_listing.py
+"""
+
+from services.db_service import db_service
+
+db_service.db.backfill_catalog_listing()
+
+print("🎉 Catalog listing attributes backfilled")
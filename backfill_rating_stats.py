@@ -0,0 +1,12 @@
+"""
+Rebuild every movie's rating histogram and scores from raw feedback
+Run once after deploying rating histograms (DynamoDB movies written before
+them have no stars_1..stars_5), or to repair drift:
+    python backfill_rating_stats.py
+"""
+
+from services.db_service import db_service
+
+db_service.rebuild_rating_stats()
+
+print("🎉 Rating histograms and scores rebuilt")
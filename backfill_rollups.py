@@ -0,0 +1,16 @@
+"""
+Rebuild daily rollups from raw feedback
+Run once after deploying rollups, or to repair drift:
+    python backfill_rollups.py
+
+Safe while the app takes writes. SQLite rebuilds everything in one
+transaction. DynamoDB rebuilds days before today (today's rows are still
+being ADDed to) and skips rows that change while it runs; run it again
+to pick those up.
+"""
+
+from services.db_service import db_service
+
+db_service.rebuild_rollups()
+
+print("🎉 Daily rollups rebuilt")
@@ -0,0 +1,12 @@
+"""
+Recount every movie's sentiment counters from the labels stored with its reviews
+Run once after deploying sentiment counters (DynamoDB movies only count
+reviews written since), or to repair drift:
+    python backfill_sentiment_stats.py
+"""
+
+from services.db_service import db_service
+
+db_service.rebuild_sentiment_stats()
+
+print("🎉 Sentiment counters rebuilt")
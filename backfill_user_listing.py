@@ -0,0 +1,11 @@
+"""
+Add the users-by-created_at GSI attribute to existing DynamoDB users
+Run once after creating the GSI (AWS mode only):
+    python backfill_user_listing.py
+"""
+
+from services.db_service import db_service
+
+db_service.db.backfill_user_listing()
+
+print("🎉 User listing attribute backfilled")
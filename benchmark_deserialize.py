@@ -0,0 +1,80 @@
+"""
+Compare DynamoDB item deserialization on a large movie scan
+Old path: boto3 resource TypeDeserializer (Decimal) + recursive decimal_to_float
+New path: dynamo_types.deserialize_item (native int/float, one pass)
+    python benchmark_deserialize.py [movies]
+"""
+
+import sys
+import time
+from decimal import Decimal
+from boto3.dynamodb.types import TypeDeserializer
+from database import dynamo_types
+from database.rating_stats import STAR_FIELDS
+from database.sentiment_stats import FIELDS as SENTIMENT_FIELDS
+
+MOVIES = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+
+def low_level_item(i):
+    """A movie item as the low-level Scan API returns it"""
+    item = {
+        'movie_id': {'N': str(i)},
+        'title': {'S': f'Movie {i}'},
+        'description': {'S': f'Description of movie {i}'},
+        'poster_url': {'S': f'/posters/{i}'},
+        'genre': {'S': 'Drama'},
+        'avg_rating': {'N': '4.2'},
+        'total_reviews': {'N': str(i % 500)},
+        'bayesian_score': {'N': '3.9123'},
+        'wilson_score': {'N': '0.6101'},
+        'created_at': {'S': '2026-01-01T00:00:00'}
+    }
+    for n, field in enumerate(STAR_FIELDS + SENTIMENT_FIELDS):
+        item[field] = {'N': str(n)}
+    return item
+
+
+def decimal_to_float(obj):
+    """The helper DynamoDBDatabase used to run over every result"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, dict):
+        return {k: decimal_to_float(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [decimal_to_float(i) for i in obj]
+    return obj
+
+
+def old_path(items):
+    deserializer = TypeDeserializer()
+    resource_items = [{k: deserializer.deserialize(v) for k, v in item.items()} for item in items]
+    return decimal_to_float(resource_items)
+
+
+def new_path(items):
+    return [dynamo_types.deserialize_item(item) for item in items]
+
+
+def best_of(fn, items, runs=3):
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(items)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+items = [low_level_item(i) for i in range(1, MOVIES + 1)]
+
+# Same values either way (old path gives floats for every number)
+assert all(
+    float(a[k]) == float(b[k]) if isinstance(b[k], (int, float)) else a[k] == b[k]
+    for a, b in zip(old_path(items[:100]), new_path(items[:100])) for k in a
+)
+
+old = best_of(old_path, items)
+new = best_of(new_path, items)
+print(f"{MOVIES:,} movie items, {len(items[0])} attributes each")
+print(f"resource + decimal_to_float: {old * 1000:8.1f} ms")
+print(f"dynamo_types single pass:    {new * 1000:8.1f} ms  ({old / new:.1f}x faster)")
@@ -0,0 +1,48 @@
+"""
+Compare per-row and group-commit feedback inserts on SQLite
+Concurrent reviewers insert feedback through SQLiteDatabase.create_feedback,
+once committing every row on its own and once through the group-commit
+writer, on a scratch database file:
+    python benchmark_group_commit.py [inserts] [threads]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from database.sqlite_db import SQLiteDatabase
+
+INSERTS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+THREADS = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+
+
+def run(group_commit):
+    with tempfile.TemporaryDirectory() as directory:
+        db = SQLiteDatabase(os.path.join(directory, 'bench.db'), group_commit=group_commit)
+        movie_ids = [movie.id for movie in db.get_all_movies()]
+
+        def insert(i):
+            try:
+                db.create_feedback(movie_ids[i % len(movie_ids)], f'user{i}@example.com',
+                                   i % 5 + 1, f'Review number {i}', 'positive')
+                return True
+            except sqlite3.OperationalError:
+                # Per-row writers give up after sqlite3's busy timeout
+                return False
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            failed = list(pool.map(insert, range(INSERTS))).count(False)
+        elapsed = time.perf_counter() - started
+
+        if db.feedback_writer is not None:
+            db.feedback_writer.close()
+        return elapsed, failed
+
+
+print(f"{INSERTS} inserts from {THREADS} threads")
+for label, group_commit in (('Per-row commit', False), ('Group commit', True)):
+    elapsed, failed = run(group_commit)
+    print(f"{label + ':':16} {elapsed:.2f}s ({(INSERTS - failed) / elapsed:,.0f} inserts/s, {failed} failed)")
@@ -0,0 +1,89 @@
+"""
+Compare plain-dict movie records with the slotted Movie model
+Builds an in-memory movies table and reports memory per record plus
+allocations and time for one /api/movies response:
+    python benchmark_models.py [movies]
+"""
+
+import gc
+import sqlite3
+import sys
+import time
+import tracemalloc
+from database.rating_stats import STAR_FIELDS
+from database.sentiment_stats import FIELDS as SENTIMENT_FIELDS
+from models.movie import Movie
+
+MOVIES = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+conn = sqlite3.connect(':memory:')
+conn.row_factory = sqlite3.Row
+columns = (
+    ['id', 'title', 'description', 'poster_url', 'genre', 'avg_rating', 'total_reviews', 'created_at']
+    + list(STAR_FIELDS) + ['bayesian_score', 'wilson_score'] + list(SENTIMENT_FIELDS)
+)
+conn.execute(f"CREATE TABLE movies ({', '.join(columns)})")
+conn.executemany(
+    f"INSERT INTO movies VALUES ({', '.join('?' for _ in columns)})",
+    (
+        (i, f'Movie {i}', f'Description of movie {i}', f'/posters/{i}', 'Drama', 4.2, i % 500,
+         '2026-01-01 00:00:00', 1, 2, 3, 4, 5, 3.9, 0.61, 7, 5, 3, 15, 9.5, 1)
+        for i in range(1, MOVIES + 1)
+    )
+)
+
+
+def format_dict(movie):
+    """What the routes did per movie before the models existed"""
+    return {
+        'id': movie.get('id') or movie.get('movie_id'),
+        'title': movie.get('title'),
+        'description': movie.get('description'),
+        'poster': movie.get('poster_url'),
+        'genre': movie.get('genre', 'General'),
+        'rating': float(movie.get('avg_rating', 0)),
+        'total_reviews': movie.get('total_reviews', 0),
+        'bayesian_score': float(movie.get('bayesian_score', 0)),
+        'wilson_score': float(movie.get('wilson_score', 0))
+    }
+
+
+def load_dicts():
+    return [dict(row) for row in conn.execute('SELECT * FROM movies')]
+
+
+def load_movies():
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return [Movie.from_row(row) for row in cursor.execute(f'SELECT {Movie.sql_columns()} FROM movies')]
+
+
+def measure(label, load, serialize):
+    gc.collect()
+    tracemalloc.start()
+    records = load()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+
+    # One request: query -> records -> response payload
+    tracemalloc.start()
+    payload = serialize(load())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del payload
+
+    # Timed separately: tracemalloc slows every allocation down
+    best = float('inf')
+    for _ in range(3):
+        started = time.perf_counter()
+        serialize(load())
+        best = min(best, time.perf_counter() - started)
+
+    print(f"{label:<8} {held / MOVIES:>8.0f} B/record {peak / 1024 / 1024:>8.1f} MiB/request "
+          f"{best * 1000:>8.1f} ms/request")
+
+
+print(f"{MOVIES:,} movies")
+measure('dict', load_dicts, lambda records: [format_dict(m) for m in records])
+measure('Movie', load_movies, lambda records: [m.to_dict() for m in records])
@@ -0,0 +1,70 @@
+"""
+Benchmark the in-memory movie search index on a synthetic catalog
+Reports build time, memory per movie and query latency:
+    python benchmark_search.py [movies]
+"""
+
+import itertools
+import random
+import sys
+import time
+from database.search_index import MovieSearchIndex
+
+MOVIES = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+QUERIES = 2000
+
+random.seed(42)
+GENRES = ['Action', 'Drama', 'Sci-Fi', 'Comedy', 'Horror', 'Romance', 'Thriller', 'Animation']
+# Zipf-ish vocabulary: a few very common words, a long tail of rare ones
+VOCAB = [f'w{i}' for i in range(50_000)]
+CUM_WEIGHTS = list(itertools.accumulate(1 / (i + 1) for i in range(len(VOCAB))))
+
+
+def words(n):
+    return ' '.join(random.choices(VOCAB, cum_weights=CUM_WEIGHTS, k=n))
+
+
+catalog = [
+    {
+        'movie_id': i,
+        'title': words(3),
+        'genre': random.choice(GENRES),
+        'description': words(25)
+    }
+    for i in range(1, MOVIES + 1)
+]
+
+started = time.perf_counter()
+index = MovieSearchIndex.build(catalog)
+build_seconds = time.perf_counter() - started
+stats = index.memory_stats()
+
+print(f"Movies:          {stats['movies']:,}")
+print(f"Terms:           {stats['terms']:,}")
+print(f"Postings:        {stats['postings']:,}")
+print(f"Index size:      {stats['bytes'] / 1024 / 1024:.1f} MiB")
+print(f"Bytes per movie: {stats['bytes_per_movie']}")
+print(f"Build time:      {build_seconds:.2f}s")
+
+queries = []
+for _ in range(QUERIES):
+    movie = random.choice(catalog)
+    title = movie['title'].split()
+    # Full words plus a partially typed last word, like the search box sends
+    queries.append(' '.join(title[:-1] + [title[-1][:max(2, len(title[-1]) - 1)]]))
+
+latencies = []
+for q in queries:
+    started = time.perf_counter()
+    index.search(q, limit=20)
+    latencies.append((time.perf_counter() - started) * 1000)
+latencies.sort()
+
+print(f"Query p50:       {latencies[len(latencies) // 2]:.3f} ms")
+print(f"Query p95:       {latencies[int(len(latencies) * 0.95)]:.3f} ms")
+print(f"Query p99:       {latencies[int(len(latencies) * 0.99)]:.3f} ms")
+
+started = time.perf_counter()
+for i in range(1000):
+    index.add({'movie_id': MOVIES + i + 1, 'title': words(3), 'genre': 'Drama', 'description': words(25)})
+print(f"Incremental add: {(time.perf_counter() - started) / 1000 * 1000:.3f} ms per movie")
@@ -0,0 +1,73 @@
+"""
+Benchmark app cold start
+Imports the app in fresh interpreters under `python -X importtime` and
+reports the slowest packages to import, the median import wall time
+against a cold-start target, and what warmup() then costs:
+    python benchmark_startup.py [runs] [target_ms]
+
+Exits non-zero when the median import time is over the target.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+COLD_START_TARGET_MS = float(sys.argv[2]) if len(sys.argv) > 2 else 350
+TOP = 15
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PROBE = (
+    "import time; started = time.perf_counter(); import app; "
+    "imported = time.perf_counter(); "
+    "from services.worker_service import worker_service; worker_service.warmup(); "
+    "print(f'{(imported - started) * 1000:.1f} {(time.perf_counter() - imported) * 1000:.1f}')"
+)
+
+
+def parse_importtime(stderr):
+    """{top-level package: microseconds} from -X importtime output"""
+    totals = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        # Self time only, so nested imports aren't counted twice
+        totals[name.strip().split('.')[0]] += int(self_us)
+    return totals
+
+
+def run_once():
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    import_ms, warmup_ms = (float(value) for value in result.stdout.split()[-2:])
+    return import_ms, warmup_ms, parse_importtime(result.stderr)
+
+
+imports, warmups = [], []
+modules = defaultdict(list)
+for _ in range(RUNS):
+    import_ms, warmup_ms, totals = run_once()
+    imports.append(import_ms)
+    warmups.append(warmup_ms)
+    for name, us in totals.items():
+        modules[name].append(us)
+
+print(f"Slowest packages to import (median of {RUNS} runs):")
+ranked = sorted(modules.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+for name, samples in ranked[:TOP]:
+    print(f"  {statistics.median(samples) / 1000:8.1f} ms  {name}")
+
+median_import = statistics.median(imports)
+print(f"Import app:      {median_import:.1f} ms (min {min(imports):.1f}, max {max(imports):.1f})")
+print(f"warmup():        {statistics.median(warmups):.1f} ms")
+print(f"Target:          {COLD_START_TARGET_MS:.0f} ms")
+
+if median_import > COLD_START_TARGET_MS:
+    print(f"❌ Cold start over target by {median_import - COLD_START_TARGET_MS:.1f} ms")
+    sys.exit(1)
+print("✓ Cold start within target")
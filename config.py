@@ -4,10 +4,21 @@ Handles environment-based configuration (LOCAL vs AWS)
 """
 
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env file (local development)
-load_dotenv()
+
+def _load_dotenv():
+    """Load .env (local development) if there is one; python-dotenv is only imported then"""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    path = os.path.join(directory, '.env')
+    if not os.path.exists(path):
+        path = os.path.join(os.getcwd(), '.env')
+        if not os.path.exists(path):
+            return
+    from dotenv import load_dotenv
+    load_dotenv(path)
+
+
+_load_dotenv()
 
 class Config:
     """Base configuration"""
@@ -22,6 +33,64 @@ class Config:
     
     # Flask settings
     DEBUG = os.environ.get('DEBUG', 'True') == 'True'
+    
+    # Observability: latency histograms and counters served at /metrics
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True') == 'True'
+    
+    # Per-request query tracing; requests over budget are logged as warnings
+    QUERY_TRACE_ENABLED = os.environ.get('QUERY_TRACE_ENABLED', 'True') == 'True'
+    QUERY_BUDGET_COUNT = int(os.environ.get('QUERY_BUDGET_COUNT', '10'))
+    QUERY_BUDGET_CAPACITY = float(os.environ.get('QUERY_BUDGET_CAPACITY', '25'))
+    
+    # Admin on-demand profiling (cProfile per request, stack sampler per process)
+    PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+    PROFILER_SAMPLE_INTERVAL_MS = int(os.environ.get('PROFILER_SAMPLE_INTERVAL_MS', '10'))
+    
+    # Trending: seconds before the in-memory top-K is reloaded from storage
+    # (picks up reviews written by other workers)
+    TRENDING_REFRESH_SECONDS = int(os.environ.get('TRENDING_REFRESH_SECONDS', '30'))
+    
+    # Reviews shown with a movie (older ones are paged on demand); on
+    # DynamoDB also the size of the review snapshot kept on each movie item
+    RECENT_REVIEWS = int(os.environ.get('RECENT_REVIEWS', '10'))
+    # Longest review comment accepted, in characters
+    MAX_COMMENT_LENGTH = int(os.environ.get('MAX_COMMENT_LENGTH', '5000'))
+    
+    # Threads for concurrent backend reads within one request (admin overview)
+    DB_FANOUT_WORKERS = int(os.environ.get('DB_FANOUT_WORKERS', '8'))
+    
+    # Production server (gunicorn.conf.py / serve.py): pre-forked worker
+    # processes, each with a pool of request threads
+    WEB_WORKERS = int(os.environ.get('WEB_WORKERS', str(os.cpu_count() or 1)))
+    WEB_THREADS = int(os.environ.get('WEB_THREADS', '8'))
+    WEB_TIMEOUT = int(os.environ.get('WEB_TIMEOUT', '30'))
+    WEB_GRACEFUL_TIMEOUT = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', '30'))
+    # Recycle a worker after this many requests (0 = never)
+    WEB_MAX_REQUESTS = int(os.environ.get('WEB_MAX_REQUESTS', '0'))
+    
+    # gzip/brotli for text responses of at least COMPRESSION_MIN_SIZE bytes
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'True') == 'True'
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))
+    
+    # Pre-encoded hot API responses, dropped on any write in this process
+    # and after RESPONSE_CACHE_TTL seconds (writes by other workers)
+    RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'True') == 'True'
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', '5'))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '256'))
+    
+    # Static files served under content-hash URLs (/assets/...) with
+    # immutable caching and gzip/brotli bodies compressed at startup
+    ASSET_FINGERPRINTING = os.environ.get('ASSET_FINGERPRINTING', 'True') == 'True'
+    
+    # Remote posters are served through /posters/<movie_id> from a disk cache
+    # (LRU-evicted past POSTER_CACHE_MAX_BYTES, revalidated after the
+    # upstream max-age or POSTER_CACHE_TTL seconds)
+    POSTER_PROXY_ENABLED = os.environ.get('POSTER_PROXY_ENABLED', 'True') == 'True'
+    POSTER_CACHE_DIR = os.environ.get('POSTER_CACHE_DIR', 'poster_cache')
+    POSTER_CACHE_MAX_BYTES = int(os.environ.get('POSTER_CACHE_MAX_BYTES', str(200 * 1024 * 1024)))
+    POSTER_CACHE_TTL = int(os.environ.get('POSTER_CACHE_TTL', '86400'))
+    POSTER_FETCH_TIMEOUT = float(os.environ.get('POSTER_FETCH_TIMEOUT', '5'))
+    POSTER_MAX_FETCH_BYTES = int(os.environ.get('POSTER_MAX_FETCH_BYTES', str(10 * 1024 * 1024)))
 
 
 class LocalConfig(Config):
@@ -32,6 +101,11 @@ class LocalConfig(Config):
     DATABASE_TYPE = 'sqlite'
     SQLITE_DB_PATH = 'cinema_pulse.db'
     
+    # Group commit: one writer thread batches feedback inserts under burst load
+    FEEDBACK_GROUP_COMMIT = os.environ.get('FEEDBACK_GROUP_COMMIT', 'False') == 'True'
+    FEEDBACK_GROUP_COMMIT_SIZE = int(os.environ.get('FEEDBACK_GROUP_COMMIT_SIZE', '100'))
+    FEEDBACK_GROUP_COMMIT_MS = int(os.environ.get('FEEDBACK_GROUP_COMMIT_MS', '10'))
+    
     # No AWS services in local mode
     USE_DYNAMODB = False
     USE_SNS = False
@@ -56,6 +130,29 @@ class AWSConfig(Config):
     DYNAMODB_USERS_TABLE = os.environ.get('DYNAMODB_USERS_TABLE', 'CinemaPulse-Users')
     DYNAMODB_MOVIES_TABLE = os.environ.get('DYNAMODB_MOVIES_TABLE', 'CinemaPulse-Movies')
     DYNAMODB_FEEDBACK_TABLE = os.environ.get('DYNAMODB_FEEDBACK_TABLE', 'CinemaPulse-Feedback')
+    DYNAMODB_TRENDING_TABLE = os.environ.get('DYNAMODB_TRENDING_TABLE', 'CinemaPulse-Trending')
+    DYNAMODB_ROLLUPS_TABLE = os.environ.get('DYNAMODB_ROLLUPS_TABLE', 'CinemaPulse-DailyRollups')
+    # Atomic counters (movie ids are allocated here, never reused)
+    DYNAMODB_COUNTERS_TABLE = os.environ.get('DYNAMODB_COUNTERS_TABLE', 'CinemaPulse-Counters')
+    # Background admin job status, readable from every worker (TTL on expires_at)
+    DYNAMODB_JOBS_TABLE = os.environ.get('DYNAMODB_JOBS_TABLE', 'CinemaPulse-Jobs')
+    
+    # Users GSI (PK user_list, SK created_at) for the admin listing; empty
+    # falls back to a paginated scan
+    DYNAMODB_USERS_CREATED_INDEX = os.environ.get('DYNAMODB_USERS_CREATED_INDEX', 'user_list-created_at-index')
+    
+    # Feedback GSI (PK user_email, SK timestamp) for a user's review
+    # history; empty falls back to a filtered scan
+    DYNAMODB_FEEDBACK_USER_INDEX = os.environ.get('DYNAMODB_FEEDBACK_USER_INDEX', 'user_email-timestamp-index')
+    
+    # Movies GSIs for the ranked catalog: catalog-<score>-index (PK catalog,
+    # always "ALL") and genre-<score>-index (PK genre) for each of
+    # avg_rating, bayesian_score and wilson_score; False falls back to a scan
+    DYNAMODB_CATALOG_INDEXES = os.environ.get('DYNAMODB_CATALOG_INDEXES', 'True') == 'True'
+    
+    # In-memory movie search index (parallel scan segments, background refresh)
+    SEARCH_INDEX_SEGMENTS = int(os.environ.get('SEARCH_INDEX_SEGMENTS', '4'))
+    SEARCH_INDEX_REFRESH_SECONDS = int(os.environ.get('SEARCH_INDEX_REFRESH_SECONDS', '300'))
     
     # SNS configuration
     USE_SNS = True
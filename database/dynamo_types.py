@@ -0,0 +1,68 @@
+"""
+DynamoDB Attribute Values
+Single-pass conversion of low-level client attribute values to native
+Python types (int/float instead of Decimal), replacing boto3's resource
+deserializer followed by a recursive decimal_to_float walk
+"""
+
+from typing import Any, Dict
+
+
+def _number(text: str):
+    # DynamoDB numbers are strings; integers stay exact as int
+    if '.' in text or 'e' in text or 'E' in text:
+        return float(text)
+    return int(text)
+
+
+def _map(value: Dict) -> Dict:
+    return {k: deserialize(v) for k, v in value.items()}
+
+
+def _list(value) -> list:
+    return [deserialize(v) for v in value]
+
+
+_DECODERS = {
+    'S': str,
+    'N': _number,
+    'BOOL': bool,
+    'NULL': lambda _: None,
+    'M': _map,
+    'L': _list,
+    'SS': set,
+    'NS': lambda values: {_number(v) for v in values},
+    'B': bytes,
+    'BS': lambda values: {bytes(v) for v in values}
+}
+
+
+def deserialize(value: Dict) -> Any:
+    """{'N': '4.5'} -> 4.5, {'S': 'x'} -> 'x', ... (nested maps/lists included)"""
+    for tag, inner in value.items():
+        return _DECODERS[tag](inner)
+    raise ValueError('Empty attribute value')
+
+
+def deserialize_item(item: Dict) -> Dict:
+    """A low-level item ({'attr': {'N': '1'}}) as a plain dict"""
+    out = {}
+    for k, v in item.items():
+        # Strings and numbers are nearly every attribute: skip the dispatch
+        if 'S' in v:
+            out[k] = v['S']
+        elif 'N' in v:
+            n = v['N']
+            out[k] = float(n) if '.' in n or 'e' in n or 'E' in n else int(n)
+        else:
+            out[k] = deserialize(v)
+    return out
+
+
+def number(n) -> Dict:
+    """Low-level number attribute value for keys/expression values"""
+    return {'N': str(n)}
+
+
+def string(s: str) -> Dict:
+    return {'S': s}
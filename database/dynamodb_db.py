@@ -3,11 +3,65 @@ DynamoDB Database Implementation for AWS Deployment
 Uses boto3 with IAM roles (no hardcoded credentials)
 """
 
+import json
+import threading
+import time
 import boto3
+from botocore.exceptions import ClientError, ParamValidationError
 from boto3.dynamodb.conditions import Key
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 from decimal import Decimal
+from database.query_trace import instrument_boto3_client
+from database import rating_stats
+from database import trending
+from database import rollups
+from database import sentiment_stats
+from database import dynamo_types
+from database import pagination
+from database.search_index import MovieSearchIndex
+from models.movie import Movie
+from models.feedback import Feedback
+from models.user import User
+
+# BatchWriteItem accepts at most 25 requests
+BATCH_WRITE_SIZE = 25
+# Concurrent BatchWriteItem calls during a cascade delete
+DELETE_WORKERS = 8
+# Attempts for a batch whose items keep coming back unprocessed (throttling)
+BATCH_WRITE_ATTEMPTS = 8
+# Same for the full comments of a page being served (then the cut text is shown)
+BATCH_GET_ATTEMPTS = 3
+# Attempts to store a rebuilt histogram while reviews keep changing it
+REBUILD_ATTEMPTS = 5
+
+# Constant partition of the users-by-created_at GSI (every user is in it)
+USER_LIST_PARTITION = 'ALL'
+
+# Constant partition of the catalog GSIs (catalog-<score>-index). Every
+# movie is in it; its write rate is one score update per review, far
+# below a single partition's limit
+CATALOG_PARTITION = 'ALL'
+
+# Counter item the next movie_id is ADDed from
+MOVIE_ID_COUNTER = 'movie_id'
+
+# Review attributes copied into a movie's recent_reviews snapshot
+SNAPSHOT_FIELDS = ('timestamp', 'user_email', 'rating', 'comment', 'sentiment')
+# Comments are cut to this many characters in the snapshot (marked
+# comment_truncated; the feedback item keeps the full text), so a movie
+# item stays far below DynamoDB's 400KB item limit
+SNAPSHOT_COMMENT_LENGTH = 500
+
+# Movie attributes read for listings (everything but the review snapshot);
+# placeholders so no name can collide with a reserved word
+MOVIE_ATTRIBUTES = Movie.COLUMNS[1:] + ('movie_id',)
+MOVIE_PROJECTION = {
+    'ProjectionExpression': ', '.join(f'#m{i}' for i in range(len(MOVIE_ATTRIBUTES))),
+    'ExpressionAttributeNames': {f'#m{i}': name for i, name in enumerate(MOVIE_ATTRIBUTES)}
+}
 
 
 class DynamoDBDatabase:
@@ -16,32 +70,167 @@ class DynamoDBDatabase:
         region_name='us-east-1',
         users_table='CinemaPulse-Users',
         movies_table='CinemaPulse-Movies',
-        feedback_table='CinemaPulse-Feedback'
+        feedback_table='CinemaPulse-Feedback',
+        trending_table='CinemaPulse-Trending',
+        rollups_table='CinemaPulse-DailyRollups',
+        counters_table='CinemaPulse-Counters',
+        jobs_table='CinemaPulse-Jobs',
+        trace_queries=False,
+        users_created_index=None,
+        catalog_indexes=False,
+        feedback_user_index=None,
+        recent_reviews=10,
+        search_index_segments=4,
+        search_index_refresh_seconds=300
     ):
-        self.dynamodb = boto3.resource('dynamodb', region_name=region_name)
+        self.region_name = region_name
+        self.trace_queries = trace_queries
+        self._connect()
 
         self.users_table = self.dynamodb.Table(users_table)
+        # Optional GSI (PK user_list = 'ALL', SK created_at) for the admin
+        # user listing; without it the listing pages through a projected scan
+        self.users_created_index = users_created_index
         self.movies_table = self.dynamodb.Table(movies_table)
+        # Catalog GSIs, one pair per sort score: catalog-<score>-index (PK
+        # catalog = 'ALL') and genre-<score>-index (PK genre), SK the score.
+        # Without them listings fall back to a scan sorted in memory
+        self.catalog_indexes = catalog_indexes
         self.feedback_table = self.dynamodb.Table(feedback_table)
+        # Optional GSI (PK user_email, SK timestamp, projection ALL) for a
+        # user's review history; without it those reads scan with a filter
+        self.feedback_user_index = feedback_user_index
+        # Trending counters (PK bucket "5m#<epoch>", SK movie_id, TTL expires_at)
+        self.trending_table = self.dynamodb.Table(trending_table)
+        # Daily rollups (PK movie_id, 0 = all movies; SK day "YYYY-MM-DD")
+        self.rollups_table = self.dynamodb.Table(rollups_table)
+        # Id allocation (PK counter_name, next_id); see create_movie
+        self.counters_table = self.dynamodb.Table(counters_table)
+        # Background admin jobs (PK job_id, status as JSON, TTL expires_at)
+        self.jobs_table = self.dynamodb.Table(jobs_table)
+
+        # Each movie item carries its newest reviews (recent_reviews, newest
+        # first, at most this many), so a movie page is a single GetItem
+        self.recent_reviews = recent_reviews
+
+        # Movie text search (DynamoDB has none): built once here by a
+        # parallel scan, updated by create_movie, and rebuilt in the
+        # background when older than search_index_refresh_seconds so movies
+        # written by other instances show up
+        self.search_index_segments = search_index_segments
+        self.search_index_refresh_seconds = search_index_refresh_seconds
+        self.search_index = None
+        self._search_index_built_at = 0.0
+        self._search_index_lock = threading.Lock()
+        self._search_index_rebuilding = False
+        try:
+            self.build_search_index()
+        except Exception as e:
+            print("Search index build error:", e)
+
+    def _connect(self):
+        self.dynamodb = boto3.resource('dynamodb', region_name=self.region_name)
+        # Reads go through a plain low-level client and dynamo_types, which
+        # yields int/float in one pass; the resource (Decimal) is kept for
+        # writes, where its automatic serialization is convenient
+        self.client = boto3.client('dynamodb', region_name=self.region_name)
+        if self.trace_queries:
+            instrument_boto3_client(self.dynamodb.meta.client)
+            instrument_boto3_client(self.client)
+
+    def after_fork(self):
+        """
+        Rebuild what a forked worker can't share with its parent: boto3
+        clients (their connection pools aren't fork-safe) and the search
+        index lock. The index itself is kept; its refresh runs as usual.
+        """
+        self._connect()
+        for attr in ('users_table', 'movies_table', 'feedback_table', 'trending_table', 'rollups_table',
+                     'counters_table', 'jobs_table'):
+            setattr(self, attr, self.dynamodb.Table(getattr(self, attr).name))
+        self._search_index_lock = threading.Lock()
+        self._search_index_rebuilding = False
+
+    def ping(self):
+        """Cheapest round trip that proves the movies table is reachable (raises if not)"""
+        self.client.get_item(TableName=self.movies_table.name, Key={'movie_id': dynamo_types.number(0)},
+                             ProjectionExpression='movie_id')
 
     # ========== HELPER ==========
 
-    @staticmethod
-    def decimal_to_float(obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        if isinstance(obj, dict):
-            return {k: DynamoDBDatabase.decimal_to_float(v) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [DynamoDBDatabase.decimal_to_float(i) for i in obj]
-        return obj
+    def _scan(self, table_name: str, **kwargs):
+        """Every item of a (possibly segmented) scan, paginated, as plain dicts"""
+        deserialize_item = dynamo_types.deserialize_item
+        while True:
+            res = self.client.scan(TableName=table_name, **kwargs)
+            for item in res.get('Items', []):
+                yield deserialize_item(item)
+            if 'LastEvaluatedKey' not in res:
+                return
+            kwargs['ExclusiveStartKey'] = res['LastEvaluatedKey']
+
+    def _query(self, table_name: str, **kwargs):
+        """Every item of a query, paginated, as plain dicts"""
+        deserialize_item = dynamo_types.deserialize_item
+        while True:
+            res = self.client.query(TableName=table_name, **kwargs)
+            for item in res.get('Items', []):
+                yield deserialize_item(item)
+            if 'LastEvaluatedKey' not in res:
+                return
+            kwargs['ExclusiveStartKey'] = res['LastEvaluatedKey']
+
+    def _get_item(self, table_name: str, key: Dict, **kwargs) -> Optional[Dict]:
+        res = self.client.get_item(TableName=table_name, Key=key, **kwargs)
+        item = res.get('Item')
+        return dynamo_types.deserialize_item(item) if item else None
+
+    def _keyset_page(self, operation, key_attributes, limit: int, start_key: Optional[Dict], **kwargs):
+        """
+        Up to `limit` items of a Query/Scan plus the key to resume after
+
+        Keeps reading while a FilterExpression leaves pages short. The
+        resume key is the last returned item's key (not LastEvaluatedKey,
+        which may lie past items we didn't return).
+        """
+        items = []
+        while True:
+            if start_key:
+                kwargs['ExclusiveStartKey'] = start_key
+            res = operation(**kwargs)
+            page = res.get('Items', [])
+            for i, item in enumerate(page):
+                items.append(item)
+                if len(items) == limit:
+                    more = i < len(page) - 1 or 'LastEvaluatedKey' in res
+                    next_key = {a: item[a] for a in key_attributes} if more else None
+                    return [dynamo_types.deserialize_item(it) for it in items], next_key
+            start_key = res.get('LastEvaluatedKey')
+            if not start_key:
+                return [dynamo_types.deserialize_item(it) for it in items], None
+
+    def _batch_delete(self, table_name: str, keys: List[Dict]) -> int:
+        """
+        Delete up to 25 low-level keys with BatchWriteItem
+
+        Unprocessed items (throttling) are resent with exponential backoff;
+        raises if some are still left after BATCH_WRITE_ATTEMPTS.
+        """
+        request = {table_name: [{'DeleteRequest': {'Key': key}} for key in keys]}
+        for attempt in range(BATCH_WRITE_ATTEMPTS):
+            res = self.client.batch_write_item(RequestItems=request)
+            request = res.get('UnprocessedItems')
+            if not request:
+                return len(keys)
+            time.sleep(min(0.05 * 2 ** attempt, 2.0))
+        raise RuntimeError(f"{len(request[table_name])} deletes still unprocessed in {table_name}")
 
     # ========== USERS ==========
 
-    def get_user_by_email(self, email: str) -> Optional[Dict]:
+    def get_user_by_email(self, email: str) -> Optional[User]:
         try:
-            res = self.users_table.get_item(Key={'user_email': email})
-            return self.decimal_to_float(res.get('Item'))
+            item = self._get_item(self.users_table.name, {'user_email': dynamo_types.string(email)})
+            return User.from_item(item) if item else None
         except Exception as e:
             print("User fetch error:", e)
             return None
@@ -52,7 +241,8 @@ class DynamoDBDatabase:
                 Item={
                     'user_email': email,
                     'role': role,
-                    'created_at': datetime.utcnow().isoformat()
+                    'created_at': datetime.utcnow().isoformat(),
+                    'user_list': USER_LIST_PARTITION
                 },
                 ConditionExpression='attribute_not_exists(user_email)'
             )
@@ -61,87 +251,1032 @@ class DynamoDBDatabase:
             print("User create error:", e)
             return False
 
+    def list_users(self, limit: int = pagination.DEFAULT_PAGE_SIZE, cursor: Optional[Dict] = None,
+                   email_prefix: Optional[str] = None, role: Optional[str] = None) -> Dict:
+        """
+        One page of users: {'users': [User], 'next': position}
+
+        Newest first via the users_created_index GSI when configured; in
+        key order from a projected scan otherwise. Role and email prefix
+        are filter expressions, so a selective filter reads further.
+        """
+        filters, values = [], {}
+        names = {'#r': 'role', '#n': 'name'}
+        if role:
+            filters.append('#r = :role')
+            values[':role'] = dynamo_types.string(role)
+        if email_prefix:
+            filters.append('begins_with(user_email, :prefix)')
+            values[':prefix'] = dynamo_types.string(email_prefix)
+
+        kwargs = {
+            'TableName': self.users_table.name,
+            'ProjectionExpression': 'user_email, #r, #n, created_at',
+            'ExpressionAttributeNames': names,
+            # Filtered reads come back short, so read more per call
+            'Limit': max(limit * 4, 100) if filters else limit
+        }
+        if filters:
+            kwargs['FilterExpression'] = ' AND '.join(filters)
+
+        if self.users_created_index:
+            values[':list'] = dynamo_types.string(USER_LIST_PARTITION)
+            kwargs.update(IndexName=self.users_created_index,
+                          KeyConditionExpression='user_list = :list',
+                          ScanIndexForward=False)
+            kwargs['ProjectionExpression'] += ', user_list'
+            operation, key_attributes = self.client.query, ('user_email', 'user_list', 'created_at')
+        else:
+            operation, key_attributes = self.client.scan, ('user_email',)
+        if values:
+            kwargs['ExpressionAttributeValues'] = values
+
+        try:
+            items, next_key = self._keyset_page(operation, key_attributes, limit, cursor, **kwargs)
+        except ParamValidationError:
+            if cursor:
+                raise ValueError('Invalid cursor')
+            raise
+        except ClientError as e:
+            if cursor and e.response['Error']['Code'] == 'ValidationException':
+                raise ValueError('Invalid cursor')
+            raise
+        return {'users': [User.from_item(item) for item in items], 'next': next_key}
+
+    def count_users(self) -> int:
+        """Approximate user count (DynamoDB refreshes ItemCount about every six hours)"""
+        return self.client.describe_table(TableName=self.users_table.name)['Table']['ItemCount']
+
+    def backfill_user_listing(self):
+        """Add the GSI partition attribute to users created before it existed"""
+        for item in self._scan(self.users_table.name, ProjectionExpression='user_email, user_list'):
+            if 'user_list' not in item:
+                self.users_table.update_item(
+                    Key={'user_email': item['user_email']},
+                    UpdateExpression='SET user_list = :list',
+                    ExpressionAttributeValues={':list': USER_LIST_PARTITION}
+                )
+
     # ========== MOVIES ==========
 
-    def get_all_movies(self) -> List[Dict]:
+    def get_all_movies(self, sort: str = rating_stats.DEFAULT_SORT) -> List[Movie]:
         try:
-            res = self.movies_table.scan()
-            movies = res.get('Items', [])
-            movies.sort(key=lambda x: x.get('avg_rating', 0), reverse=True)
-            return self.decimal_to_float(movies)
+            return self.list_movies(sort)['movies']
         except Exception as e:
             print("Movies fetch error:", e)
             return []
 
-    def get_movie_by_id(self, movie_id: int) -> Optional[Dict]:
+    def list_movies(self, sort: str = rating_stats.DEFAULT_SORT, genre: Optional[str] = None,
+                    limit: Optional[int] = None, cursor: Optional[Dict] = None) -> Dict:
+        """
+        One page of the ranked catalog: {'movies': [Movie], 'next': position}
+
+        With catalog_indexes this is a Query on the score GSI (or the genre
+        one), so items come back already sorted and only one page is read.
+        limit None returns the rest of the catalog.
+        """
+        field = rating_stats.SORT_FIELDS.get(sort, rating_stats.SORT_FIELDS[rating_stats.DEFAULT_SORT])
+        if not self.catalog_indexes:
+            return self._list_movies_scan(field, genre, limit, cursor)
+
+        partition = 'genre' if genre else 'catalog'
+        kwargs = {
+            'TableName': self.movies_table.name,
+            'IndexName': f'{partition}-{field}-index',
+            'KeyConditionExpression': '#p = :p',
+            'ExpressionAttributeValues': {':p': dynamo_types.string(genre or CATALOG_PARTITION)},
+            'ScanIndexForward': False,
+            'ProjectionExpression': MOVIE_PROJECTION['ProjectionExpression'],
+            'ExpressionAttributeNames': {**MOVIE_PROJECTION['ExpressionAttributeNames'], '#p': partition}
+        }
+        if partition == 'catalog':
+            # Part of the resume key; genre is already a listing attribute
+            kwargs['ProjectionExpression'] += ', #p'
+        if limit is not None:
+            # One extra so the last page isn't followed by an empty one
+            kwargs['Limit'] = limit + 1
+
+        try:
+            items, next_key = self._keyset_page(self.client.query, ('movie_id', partition, field),
+                                                limit, cursor, **kwargs)
+        except ParamValidationError:
+            if cursor:
+                raise ValueError('Invalid cursor')
+            raise
+        except ClientError as e:
+            if cursor and e.response['Error']['Code'] == 'ValidationException':
+                raise ValueError('Invalid cursor')
+            raise
+        return {'movies': [Movie.from_item(item) for item in items], 'next': next_key}
+
+    def _list_movies_scan(self, field: str, genre: Optional[str], limit: Optional[int],
+                          cursor: Optional[Dict]) -> Dict:
+        """list_movies without the catalog GSIs: full projected scan, sorted here"""
+        kwargs = dict(MOVIE_PROJECTION)
+        if genre:
+            kwargs['FilterExpression'] = 'genre = :genre'
+            kwargs['ExpressionAttributeValues'] = {':genre': dynamo_types.string(genre)}
+        movies = [Movie.from_item(item) for item in self._scan(self.movies_table.name, **kwargs)]
+        movies.sort(key=lambda m: (getattr(m, field), m.id), reverse=True)
+        if cursor:
+            try:
+                after = (float(cursor['score']), int(cursor['id']))
+            except (KeyError, TypeError, ValueError):
+                raise ValueError('Invalid cursor')
+            movies = [m for m in movies if (getattr(m, field), m.id) < after]
+        if limit is None or len(movies) <= limit:
+            return {'movies': movies, 'next': None}
+        last = movies[limit - 1]
+        return {'movies': movies[:limit], 'next': {'score': getattr(last, field), 'id': last.id}}
+
+    def backfill_catalog_listing(self):
+        """
+        Put movies created before the catalog GSIs into them: the partition
+        attribute, plus scores for items that never had any (the score GSIs
+        are sparse, so a movie without its sort key would be missing)
+        """
+        score_fields = tuple(rating_stats.SORT_FIELDS.values())
+        for item in self._scan(self.movies_table.name, ProjectionExpression='movie_id, #c, ' + ', '.join(score_fields),
+                               ExpressionAttributeNames={'#c': 'catalog'}):
+            if any(field not in item for field in score_fields):
+                self.update_movie_rating(item['movie_id'])
+            if 'catalog' not in item:
+                self.movies_table.update_item(
+                    Key={'movie_id': item['movie_id']},
+                    UpdateExpression='SET #c = :catalog',
+                    ExpressionAttributeNames={'#c': 'catalog'},
+                    ExpressionAttributeValues={':catalog': CATALOG_PARTITION}
+                )
+
+    def get_movie_by_id(self, movie_id: int) -> Optional[Movie]:
         try:
-            res = self.movies_table.get_item(Key={'movie_id': movie_id})
-            return self.decimal_to_float(res.get('Item'))
+            item = self._get_item(self.movies_table.name, {'movie_id': dynamo_types.number(movie_id)})
+            return Movie.from_item(item) if item else None
         except Exception as e:
             print("Movie fetch error:", e)
             return None
 
-    def update_movie_rating(self, movie_id: int):
+    def get_movies_by_ids(self, movie_ids: List[int]) -> List[Movie]:
+        """BatchGetItem in chunks of 100, retrying unprocessed keys (order not preserved)"""
+        movies = []
+        table = self.movies_table.name
+        try:
+            ids = list(dict.fromkeys(movie_ids))
+            for i in range(0, len(ids), 100):
+                request = {table: {'Keys': [{'movie_id': dynamo_types.number(mid)} for mid in ids[i:i + 100]],
+                                   **MOVIE_PROJECTION}}
+                while request:
+                    res = self.client.batch_get_item(RequestItems=request)
+                    movies.extend(Movie.from_item(dynamo_types.deserialize_item(item))
+                                  for item in res.get('Responses', {}).get(table, []))
+                    request = res.get('UnprocessedKeys')
+            return movies
+        except Exception as e:
+            print("Movies batch fetch error:", e)
+            return movies
+
+    def create_movie(self, title: str, description: str, poster_url: str, genre: str) -> Optional[int]:
+        """
+        Add a movie with an empty histogram; returns the new id
+
+        movie_id comes from an atomic counter, so ids are never reused: a
+        new movie can't inherit a deleted one's trending counters, or lose
+        reviews to a background delete of the old id still in progress.
+        The put is conditional; an id taken by a movie created before the
+        counter existed lifts the counter past the highest indexed id.
+        """
+        try:
+            index = self._get_search_index()
+            values = self._score_values([0] * len(rating_stats.STAR_LEVELS))
+            item = {
+                'title': title,
+                'description': description,
+                'poster_url': poster_url,
+                'genre': genre,
+                'catalog': CATALOG_PARTITION,
+                'avg_rating': values[':a'],
+                'total_reviews': 0,
+                'bayesian_score': values[':b'],
+                'wilson_score': values[':w'],
+                'created_at': datetime.utcnow().isoformat()
+            }
+            for field in rating_stats.STAR_FIELDS:
+                item[field] = 0
+            item['recent_reviews'] = []
+            for _ in range(10):
+                item['movie_id'] = self._next_movie_id()
+                try:
+                    self.movies_table.put_item(
+                        Item=item,
+                        ConditionExpression='attribute_not_exists(movie_id)'
+                    )
+                    index.add(item)
+                    return item['movie_id']
+                except self.dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
+                    self._lift_movie_id_counter(max(index.doc_terms, default=0))
+            print("Create movie error: no free movie_id")
+            return None
+        except Exception as e:
+            print("Create movie error:", e)
+            return None
+
+    def _next_movie_id(self) -> int:
+        res = self.counters_table.update_item(
+            Key={'counter_name': MOVIE_ID_COUNTER},
+            UpdateExpression='ADD next_id :one',
+            ExpressionAttributeValues={':one': 1},
+            ReturnValues='UPDATED_NEW'
+        )
+        return int(res['Attributes']['next_id'])
+
+    def _lift_movie_id_counter(self, floor: int):
+        """Make the next allocated id at least floor + 1 (never lowers the counter)"""
         try:
-            res = self.feedback_table.query(
-                KeyConditionExpression=Key('movie_id').eq(movie_id)
+            self.counters_table.update_item(
+                Key={'counter_name': MOVIE_ID_COUNTER},
+                UpdateExpression='SET next_id = :floor',
+                ConditionExpression='attribute_not_exists(next_id) OR next_id < :floor',
+                ExpressionAttributeValues={':floor': floor}
             )
-            feedback = res.get('Items', [])
-            if not feedback:
-                return
+        except self.dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
+            pass
 
-            avg = sum(f['rating'] for f in feedback) / len(feedback)
+    def delete_movie(self, movie_id: int, progress=None) -> Optional[Dict]:
+        """
+        Delete a movie, its reviews and its rollups
 
-            self.movies_table.update_item(
-                Key={'movie_id': movie_id},
-                UpdateExpression='SET avg_rating = :a, total_reviews = :t',
-                ExpressionAttributeValues={
-                    ':a': Decimal(str(round(avg, 1))),
-                    ':t': len(feedback)
-                }
+        The movie item goes first, so it disappears from listings at once.
+        Each day's rollup row is deleted and subtracted from the all-movies
+        row in one transaction (see _delete_rollup), then the feedback
+        partition is paged through (keys only) and removed with parallel
+        BatchWriteItem calls; progress(reviews_deleted) is called after
+        every page. Trending counters are left to expire by TTL.
+        Re-running finishes an interrupted delete. Returns None if there was
+        nothing to delete.
+        """
+        res = self.client.delete_item(
+            TableName=self.movies_table.name,
+            Key={'movie_id': dynamo_types.number(movie_id)},
+            ReturnValues='ALL_OLD'
+        )
+        found = 'Attributes' in res
+        if self.search_index is not None:
+            self.search_index.remove(movie_id)
+
+        deleted = 0
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS, thread_name_prefix='movie-delete') as pool:
+            days = self._query(
+                self.rollups_table.name,
+                KeyConditionExpression='movie_id = :m',
+                ExpressionAttributeValues={':m': dynamo_types.number(movie_id)}
             )
+            for future in [pool.submit(self._delete_rollup, movie_id, item) for item in days]:
+                future.result()
+
+            kwargs = {
+                'KeyConditionExpression': 'movie_id = :m',
+                'ExpressionAttributeValues': {':m': dynamo_types.number(movie_id)},
+                'ProjectionExpression': 'movie_id, #ts',
+                'ExpressionAttributeNames': {'#ts': 'timestamp'}
+            }
+            while True:
+                page = self.client.query(TableName=self.feedback_table.name, **kwargs)
+                keys = page.get('Items', [])
+                futures = [
+                    pool.submit(self._batch_delete, self.feedback_table.name, keys[i:i + BATCH_WRITE_SIZE])
+                    for i in range(0, len(keys), BATCH_WRITE_SIZE)
+                ]
+                deleted += sum(future.result() for future in futures)
+                if progress and keys:
+                    progress(deleted)
+                if 'LastEvaluatedKey' not in page:
+                    break
+                kwargs['ExclusiveStartKey'] = page['LastEvaluatedKey']
+
+        if not found and not deleted:
+            return None
+        return {'movie_id': movie_id, 'reviews_deleted': deleted}
+
+    def _delete_rollup(self, movie_id: int, item: Dict):
+        """
+        Delete one day's rollup row of a movie and subtract it from the
+        all-movies row, atomically: a delete interrupted between the two
+        would otherwise subtract the row again when re-run
+        """
+        day = dynamo_types.string(item['day'])
+        try:
+            self.client.transact_write_items(TransactItems=[
+                {'Delete': {
+                    'TableName': self.rollups_table.name,
+                    'Key': {'movie_id': dynamo_types.number(movie_id), 'day': day},
+                    'ConditionExpression': 'attribute_exists(movie_id)'
+                }},
+                {'Update': {
+                    'TableName': self.rollups_table.name,
+                    'Key': {'movie_id': dynamo_types.number(rollups.ALL_MOVIES), 'day': day},
+                    'UpdateExpression': 'ADD ' + ', '.join(f'{f} :{f}' for f in rollups.FIELDS),
+                    'ExpressionAttributeValues': {f':{f}': dynamo_types.number(-item.get(f, 0)) for f in rollups.FIELDS}
+                }}
+            ])
+        except self.client.exceptions.TransactionCanceledException as e:
+            reasons = e.response.get('CancellationReasons', [])
+            if not reasons or reasons[0].get('Code') != 'ConditionalCheckFailed':
+                raise
+            # Already deleted (and subtracted) by a concurrent run
+
+    def update_movie_rating(self, movie_id: int):
+        """
+        Rebuild a movie's histogram and scores from its feedback (repair/backfill)
+
+        The write is conditional on the histogram being unchanged since it
+        was read, so a review counted in the meantime sends the rebuild
+        round again instead of being overwritten.
+        """
+        key = {'movie_id': dynamo_types.number(movie_id)}
+        try:
+            for _ in range(REBUILD_ATTEMPTS):
+                before = self._get_item(self.movies_table.name, key, ConsistentRead=True,
+                                        ProjectionExpression='movie_id, ' + ', '.join(rating_stats.STAR_FIELDS))
+                if before is None:
+                    return
+                histogram = [0] * len(rating_stats.STAR_LEVELS)
+                for f in self._query(self.feedback_table.name, ConsistentRead=True,
+                                     KeyConditionExpression='movie_id = :m',
+                                     ExpressionAttributeValues={':m': key['movie_id']},
+                                     ProjectionExpression='rating'):
+                    histogram[int(f['rating']) - 1] += 1
+
+                try:
+                    self._store_rating_stats(movie_id, histogram, *self._unchanged(before, rating_stats.STAR_FIELDS))
+                    return
+                except self.dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
+                    continue
+            print(f"Rating update error: movie {movie_id} kept changing, not rebuilt")
         except Exception as e:
             print("Rating update error:", e)
 
+    def rebuild_rating_stats(self):
+        """Backfill histograms and scores for every movie (one feedback query per movie)"""
+        kwargs = {'ProjectionExpression': 'movie_id'}
+        while True:
+            res = self.movies_table.scan(**kwargs)
+            for movie in res.get('Items', []):
+                self.update_movie_rating(int(movie['movie_id']))
+            if 'LastEvaluatedKey' not in res:
+                break
+            kwargs['ExclusiveStartKey'] = res['LastEvaluatedKey']
+
+    @staticmethod
+    def _unchanged(before: Dict, fields):
+        """(ConditionExpression, values): the movie exists and `fields` still hold what `before` read"""
+        condition, values = ['attribute_exists(movie_id)'], {}
+        for field in fields:
+            if field in before:
+                condition.append(f'{field} = :old_{field}')
+                value = before[field]
+                values[f':old_{field}'] = Decimal(str(value)) if isinstance(value, float) else value
+            else:
+                condition.append(f'attribute_not_exists({field})')
+        return ' AND '.join(condition), values
+
+    @staticmethod
+    def _score_values(histogram):
+        scores = rating_stats.compute_scores(histogram)
+        return {
+            ':a': Decimal(str(scores['avg_rating'])),
+            ':t': scores['total_reviews'],
+            ':b': Decimal(str(scores['bayesian_score'])),
+            ':w': Decimal(str(scores['wilson_score']))
+        }
+
+    def _store_rating_stats(self, movie_id: int, histogram, condition=None, condition_values=None):
+        """Write a histogram and its scores, optionally only if `condition` holds"""
+        values = self._score_values(histogram)
+        values.update(condition_values or {})
+        assignments = []
+        for field, count in zip(rating_stats.STAR_FIELDS, histogram):
+            assignments.append(f'{field} = :{field}')
+            values[f':{field}'] = count
+        kwargs = {
+            'Key': {'movie_id': movie_id},
+            'UpdateExpression': 'SET ' + ', '.join(assignments) +
+                                ', avg_rating = :a, total_reviews = :t, bayesian_score = :b, wilson_score = :w',
+            'ExpressionAttributeValues': values
+        }
+        if condition:
+            kwargs['ConditionExpression'] = condition
+        self.movies_table.update_item(**kwargs)
+
+    def _write_feedback(self, item: Dict, row):
+        """
+        Store a review and count it on its movie in one transaction
+
+        The movie update ADDs the rating to the histogram and the stored
+        sentiment to the sentiment counters, and prepends the review to
+        recent_reviews. It is conditional on the movie existing, so a
+        review for a missing movie writes nothing, and on the movie having
+        a histogram: see _write_feedback_unbackfilled for movies without one.
+        """
+        movie_id, rating = item['movie_id'], item['rating']
+        values = {':zero': 0, ':one': 1, ':empty': [],
+                  ':review': [self._snapshot_entry(item)]}
+        adds = [f'{field} :{"one" if star == rating else "zero"}'
+                for star, field in zip(rating_stats.STAR_LEVELS, rating_stats.STAR_FIELDS)]
+        for field, delta in zip(sentiment_stats.FIELDS, sentiment_stats.deltas([row])):
+            adds.append(f'{field} :{field}')
+            values[f':{field}'] = Decimal(str(delta)) if isinstance(delta, float) else delta
+
+        client = self.dynamodb.meta.client
+        try:
+            client.transact_write_items(TransactItems=[
+                {'Put': {
+                    'TableName': self.feedback_table.name,
+                    'Item': item,
+                    'ConditionExpression': 'attribute_not_exists(#ts)',
+                    'ExpressionAttributeNames': {'#ts': 'timestamp'}
+                }},
+                {'Update': {
+                    'TableName': self.movies_table.name,
+                    'Key': {'movie_id': movie_id},
+                    'UpdateExpression': 'ADD ' + ', '.join(adds) +
+                                        ' SET recent_reviews = list_append(:review, if_not_exists(recent_reviews, :empty))',
+                    'ConditionExpression': f'attribute_exists(movie_id) AND attribute_exists({rating_stats.STAR_FIELDS[0]})',
+                    'ExpressionAttributeValues': values,
+                    'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+                }}
+            ])
+        except client.exceptions.TransactionCanceledException as e:
+            reasons = e.response.get('CancellationReasons', [])
+            movie = reasons[1] if len(reasons) > 1 else {}
+            if (movie.get('Code') != 'ConditionalCheckFailed' or 'Item' not in movie
+                    or rating_stats.STAR_FIELDS[0] in movie['Item']):
+                raise
+            self._write_feedback_unbackfilled(item)
+
+    def _write_feedback_unbackfilled(self, item: Dict):
+        """
+        Store a review for a movie written before the rating histogram
+
+        ADDing to its missing histogram would start the counts at zero and
+        reset the movie to this one review, so the review is stored on its
+        own and the histogram, sentiment counters and snapshot are rebuilt
+        from all of the movie's feedback (backfill_rating_stats.py and
+        backfill_sentiment_stats.py do every movie at once)
+        """
+        movie_id = item['movie_id']
+        self.feedback_table.put_item(
+            Item=item,
+            ConditionExpression='attribute_not_exists(#ts)',
+            ExpressionAttributeNames={'#ts': 'timestamp'}
+        )
+        self.update_movie_rating(movie_id)
+        self.update_movie_sentiment(movie_id)
+        reviews, _ = self.get_reviews_page(movie_id, self.recent_reviews)
+        # The page may be read before the new review is visible to queries
+        if item['timestamp'] not in {review.timestamp for review in reviews}:
+            reviews = sorted(reviews + [Feedback.from_item(item)], key=lambda r: r.timestamp, reverse=True)
+        self._store_snapshot(movie_id, reviews[:self.recent_reviews], overwrite=True)
+
+    def _refresh_scores(self, movie_id: int):
+        """
+        Recompute a movie's scores from its histogram and trim recent_reviews
+
+        Conditional on the histogram still matching what we read, so a
+        concurrent writer that saw a newer histogram always wins, scores
+        never go backwards, and the last writer does the trimming.
+        """
+        names = {'#r': 'recent_reviews'}
+        item = self._get_item(
+            self.movies_table.name, {'movie_id': dynamo_types.number(movie_id)},
+            ConsistentRead=True,
+            ProjectionExpression=', '.join(rating_stats.STAR_FIELDS) + ', #r',
+            ExpressionAttributeNames=names
+        )
+        if item is None:
+            return
+        histogram = rating_stats.histogram_from(item)
+        values = self._score_values(histogram)
+        for field, count in zip(rating_stats.STAR_FIELDS, histogram):
+            values[f':{field}'] = count
+        kwargs = {
+            'Key': {'movie_id': movie_id},
+            'UpdateExpression': 'SET avg_rating = :a, total_reviews = :t, bayesian_score = :b, wilson_score = :w',
+            'ConditionExpression': ' AND '.join(f'{field} = :{field}' for field in rating_stats.STAR_FIELDS),
+            'ExpressionAttributeValues': values
+        }
+        overflow = range(self.recent_reviews, len(item.get('recent_reviews', [])))
+        if overflow:
+            kwargs['UpdateExpression'] += ' REMOVE ' + ', '.join(f'#r[{i}]' for i in overflow)
+            kwargs['ExpressionAttributeNames'] = names
+        try:
+            self.movies_table.update_item(**kwargs)
+        except self.dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
+            # A newer write already stored scores for a larger histogram
+            pass
+
+    # ========== SEARCH ==========
+
+    def _scan_segment(self, segment: int, total_segments: int) -> List[Dict]:
+        """One segment of a parallel scan (the low-level client is thread-safe)"""
+        return list(self._scan(
+            self.movies_table.name,
+            Segment=segment,
+            TotalSegments=total_segments,
+            # Placeholders so no field name can collide with a reserved word
+            ProjectionExpression='movie_id, #t, #g, #d',
+            ExpressionAttributeNames={'#t': 'title', '#g': 'genre', '#d': 'description'}
+        ))
+
+    def build_search_index(self) -> MovieSearchIndex:
+        """Scan the movie text fields in parallel segments and index them"""
+        started = time.perf_counter()
+        segments = max(1, self.search_index_segments)
+        with ThreadPoolExecutor(max_workers=segments) as pool:
+            parts = list(pool.map(lambda s: self._scan_segment(s, segments), range(segments)))
+        index = MovieSearchIndex.build(item for part in parts for item in part)
+        self.search_index = index
+        self._search_index_built_at = time.time()
+        stats = index.memory_stats()
+        print(f"✓ Search index: {stats['movies']} movies, {stats['terms']} terms, "
+              f"{stats['bytes_per_movie']} bytes/movie, built in {time.perf_counter() - started:.2f}s")
+        return index
+
+    def _rebuild_search_index_async(self):
+        try:
+            self.build_search_index()
+        except Exception as e:
+            print("Search index rebuild error:", e)
+        finally:
+            self._search_index_rebuilding = False
+
+    def _get_search_index(self) -> MovieSearchIndex:
+        """The current index; built now if startup failed, refreshed in the background when stale"""
+        if self.search_index is None:
+            with self._search_index_lock:
+                if self.search_index is None:
+                    self.build_search_index()
+        elif time.time() - self._search_index_built_at > self.search_index_refresh_seconds:
+            with self._search_index_lock:
+                if not self._search_index_rebuilding:
+                    self._search_index_rebuilding = True
+                    threading.Thread(target=self._rebuild_search_index_async, daemon=True).start()
+        return self.search_index
+
+    def search(self, text: str, kind: str = 'all', limit: int = 20, offset: int = 0) -> Dict:
+        """
+        Movie search from the in-memory index (same shape as SQLite search)
+
+        Review comments are not indexed on DynamoDB, so 'reviews' is always empty.
+        """
+        result = {'movies': [], 'reviews': [], 'has_more': {'movies': False, 'reviews': False}}
+        if kind not in ('all', 'movies'):
+            return result
+        try:
+            hits, has_more = self._get_search_index().search(text, limit, offset)
+            by_id = {m.id: m for m in self.get_movies_by_ids([mid for mid, _ in hits])}
+            result['movies'] = [by_id[mid] for mid, _ in hits if mid in by_id]
+            result['has_more']['movies'] = has_more
+        except Exception as e:
+            print("Search error:", e)
+        return result
+
     # ========== FEEDBACK ==========
 
     def create_feedback(self, movie_id: int, user_email: str, rating: int,
-                        comment: str, sentiment='neutral') -> Optional[str]:
+                        comment: str, sentiment='neutral',
+                        sentiment_confidence=None,
+                        sentiment_disagreement=False) -> Optional[str]:
         try:
             ts = datetime.utcnow().isoformat()
-            self.feedback_table.put_item(
-                Item={
-                    'movie_id': movie_id,
-                    'timestamp': ts,
-                    'user_email': user_email,
-                    'rating': rating,
-                    'comment': comment,
-                    'sentiment': sentiment
-                }
-            )
-            self.update_movie_rating(movie_id)
+            item = {
+                'movie_id': movie_id,
+                'timestamp': ts,
+                'user_email': user_email,
+                'rating': rating,
+                'comment': comment,
+                'sentiment': sentiment,
+                'sentiment_disagreement': bool(sentiment_disagreement)
+            }
+            if sentiment_confidence is not None:
+                item['sentiment_confidence'] = Decimal(str(round(float(sentiment_confidence), 4)))
+
+            row = (movie_id, user_email, rating, comment, sentiment,
+                   sentiment_confidence, sentiment_disagreement)
+            try:
+                self._write_feedback(item, row)
+            except self.dynamodb.meta.client.exceptions.TransactionCanceledException as e:
+                print("Feedback error (movie missing or duplicate timestamp):", e)
+                return None
+            try:
+                self._refresh_scores(movie_id)
+            except Exception as e:
+                # Feedback and histogram are saved; scores can be repaired with rebuild_rating_stats
+                print("Rating update error:", e)
+            self._record_activity(movie_id)
+            self._record_rollups(row, ts[:10])
             return ts
         except Exception as e:
             print("Feedback error:", e)
             return None
 
-    def get_feedback_by_movie(self, movie_id: int) -> List[Dict]:
+    def get_movie_with_reviews(self, movie_id: int, limit: int = 10):
+        """
+        A movie and its newest `limit` reviews, usually from one GetItem
+
+        Served from the item's recent_reviews snapshot when it covers the
+        page, plus a BatchGetItem for any long comments it cut. Items
+        written before the snapshot existed (or a page larger than it) fall
+        back to a feedback Query, and a missing snapshot is stored so the
+        next read is a single GetItem.
+        Returns (movie, reviews, next position) or (None, [], None).
+        """
+        item = self._get_item(self.movies_table.name, {'movie_id': dynamo_types.number(movie_id)})
+        if item is None:
+            return None, [], None
+        movie = Movie.from_item(item)
+        total = sum(movie.histogram)
+        snapshot = item.get('recent_reviews')
+
+        if snapshot is not None and (len(snapshot) >= limit or len(snapshot) >= total):
+            reviews = [Feedback.from_item(dict(review, movie_id=movie_id))
+                       for review in self._full_comments(movie_id, snapshot[:limit])]
+        else:
+            reviews, _ = self.get_reviews_page(movie_id, limit)
+            if snapshot is None:
+                self._store_snapshot(movie_id, reviews[:self.recent_reviews])
+
+        next_position = {'timestamp': reviews[-1].timestamp} if reviews and total > len(reviews) else None
+        return movie, reviews, next_position
+
+    def _store_snapshot(self, movie_id: int, reviews: List[Feedback], overwrite=False):
+        """Backfill recent_reviews on an item that predates it (replaced only with overwrite)"""
+        try:
+            self.movies_table.update_item(
+                Key={'movie_id': movie_id},
+                UpdateExpression='SET recent_reviews = ' + (':recent' if overwrite else 'if_not_exists(recent_reviews, :recent)'),
+                ConditionExpression='attribute_exists(movie_id)',
+                ExpressionAttributeValues={':recent': [
+                    self._snapshot_entry({field: getattr(r, field) for field in SNAPSHOT_FIELDS}) for r in reviews
+                ]}
+            )
+        except Exception as e:
+            print("Review snapshot backfill error:", e)
+
+    @staticmethod
+    def _snapshot_entry(review: Dict) -> Dict:
+        """A review's SNAPSHOT_FIELDS with its comment cut to SNAPSHOT_COMMENT_LENGTH"""
+        entry = {k: review[k] for k in SNAPSHOT_FIELDS if review.get(k) is not None}
+        if len(entry.get('comment', '')) > SNAPSHOT_COMMENT_LENGTH:
+            entry['comment'] = entry['comment'][:SNAPSHOT_COMMENT_LENGTH]
+            entry['comment_truncated'] = True
+        return entry
+
+    def _full_comments(self, movie_id: int, snapshot: List[Dict]) -> List[Dict]:
+        """
+        Snapshot entries with truncated comments replaced by the feedback
+        items' full text
+
+        Unprocessed keys (throttling) are retried with exponential backoff;
+        comments still missing after BATCH_GET_ATTEMPTS keep the cut text.
+        """
+        truncated = [entry['timestamp'] for entry in snapshot if entry.get('comment_truncated')]
+        if not truncated:
+            return snapshot
+        table = self.feedback_table.name
+        comments = {}
+        request = {table: {
+            'Keys': [{'movie_id': dynamo_types.number(movie_id), 'timestamp': dynamo_types.string(ts)}
+                     for ts in truncated],
+            'ProjectionExpression': '#ts, #c',
+            'ExpressionAttributeNames': {'#ts': 'timestamp', '#c': 'comment'}
+        }}
         try:
-            res = self.feedback_table.query(
-                KeyConditionExpression=Key('movie_id').eq(movie_id),
+            for attempt in range(BATCH_GET_ATTEMPTS):
+                if attempt:
+                    time.sleep(min(0.05 * 2 ** (attempt - 1), 2.0))
+                res = self.client.batch_get_item(RequestItems=request)
+                for item in res.get('Responses', {}).get(table, []):
+                    item = dynamo_types.deserialize_item(item)
+                    comments[item['timestamp']] = item.get('comment')
+                request = res.get('UnprocessedKeys')
+                if not request:
+                    break
+        except Exception as e:
+            print("Full comment fetch error:", e)
+        return [dict(entry, comment=comments.get(entry['timestamp'], entry.get('comment'))) for entry in snapshot]
+
+    def get_reviews_page(self, movie_id: int, limit: int, cursor: Optional[Dict] = None):
+        """Reviews older than the cursor position, newest first: (reviews, next position)"""
+        start_key = None
+        if cursor:
+            if not isinstance(cursor.get('timestamp'), str):
+                raise ValueError('Invalid cursor')
+            start_key = {'movie_id': dynamo_types.number(movie_id), 'timestamp': dynamo_types.string(cursor['timestamp'])}
+        items, next_key = self._keyset_page(
+            self.client.query, ('movie_id', 'timestamp'), limit, start_key,
+            TableName=self.feedback_table.name,
+            KeyConditionExpression='movie_id = :m',
+            ExpressionAttributeValues={':m': dynamo_types.number(movie_id)},
+            ScanIndexForward=False,
+            Limit=limit
+        )
+        reviews = [Feedback.from_item(item) for item in items]
+        return reviews, ({'timestamp': next_key['timestamp']['S']} if next_key else None)
+
+    def get_user_reviews(self, user_email: str, limit: int, cursor: Optional[Dict] = None):
+        """A user's reviews, newest first: (reviews, next position)"""
+        after = None
+        if cursor:
+            if not isinstance(cursor.get('timestamp'), str) or not isinstance(cursor.get('movie_id'), int):
+                raise ValueError('Invalid cursor')
+            after = (cursor['timestamp'], cursor['movie_id'])
+
+        if not self.feedback_user_index:
+            return self._user_reviews_scan(user_email, limit, after)
+
+        start_key = None
+        if after:
+            start_key = {'user_email': dynamo_types.string(user_email),
+                         'timestamp': dynamo_types.string(after[0]),
+                         'movie_id': dynamo_types.number(after[1])}
+        items, next_key = self._keyset_page(
+            self.client.query, ('user_email', 'timestamp', 'movie_id'), limit, start_key,
+            TableName=self.feedback_table.name,
+            IndexName=self.feedback_user_index,
+            KeyConditionExpression='user_email = :e',
+            ExpressionAttributeValues={':e': dynamo_types.string(user_email)},
+            ScanIndexForward=False,
+            Limit=limit + 1
+        )
+        reviews = [Feedback.from_item(item) for item in items]
+        if not next_key:
+            return reviews, None
+        return reviews, {'timestamp': next_key['timestamp']['S'], 'movie_id': int(next_key['movie_id']['N'])}
+
+    def _user_reviews_scan(self, user_email: str, limit: int, after):
+        """get_user_reviews without the GSI: filtered scan, sorted here"""
+        items = self._scan(
+            self.feedback_table.name,
+            FilterExpression='user_email = :e',
+            ExpressionAttributeValues={':e': dynamo_types.string(user_email)}
+        )
+        reviews = sorted((Feedback.from_item(item) for item in items),
+                         key=lambda f: (f.timestamp, f.movie_id), reverse=True)
+        if after:
+            reviews = [f for f in reviews if (f.timestamp, f.movie_id) < after]
+        if len(reviews) <= limit:
+            return reviews, None
+        last = reviews[limit - 1]
+        return reviews[:limit], {'timestamp': last.timestamp, 'movie_id': last.movie_id}
+
+    def get_reviewed_movie_ids(self, user_email: str) -> Set[int]:
+        """Ids of every movie the user has reviewed (one keys-only GSI query)"""
+        kwargs = {
+            'ProjectionExpression': 'movie_id',
+            'ExpressionAttributeValues': {':e': dynamo_types.string(user_email)}
+        }
+        if self.feedback_user_index:
+            items = self._query(self.feedback_table.name, IndexName=self.feedback_user_index,
+                                KeyConditionExpression='user_email = :e', **kwargs)
+        else:
+            items = self._scan(self.feedback_table.name, FilterExpression='user_email = :e', **kwargs)
+        return {int(item['movie_id']) for item in items}
+
+    def get_feedback_by_movie(self, movie_id: int) -> List[Feedback]:
+        try:
+            items = self._query(
+                self.feedback_table.name,
+                KeyConditionExpression='movie_id = :m',
+                ExpressionAttributeValues={':m': dynamo_types.number(movie_id)},
                 ScanIndexForward=False
             )
-            return self.decimal_to_float(res.get('Items', []))
+            return [Feedback.from_item(item) for item in items]
         except Exception as e:
             print("Feedback fetch error:", e)
             return []
 
+    # ========== SENTIMENT ==========
+
+    def update_movie_sentiment(self, movie_id: int):
+        """
+        Recount a movie's sentiment counters from its stored labels (repair/backfill)
+
+        Conditional on the counters being unchanged since they were read,
+        like update_movie_rating, so reviews arriving meanwhile aren't lost.
+        """
+        key = {'movie_id': dynamo_types.number(movie_id)}
+        try:
+            for _ in range(REBUILD_ATTEMPTS):
+                before = self._get_item(self.movies_table.name, key, ConsistentRead=True,
+                                        ProjectionExpression='movie_id, ' + ', '.join(sentiment_stats.FIELDS))
+                if before is None:
+                    return
+                rows = [
+                    (None, None, None, None, f.get('sentiment'),
+                     f.get('sentiment_confidence'), f.get('sentiment_disagreement'))
+                    for f in self._query(self.feedback_table.name, ConsistentRead=True,
+                                         KeyConditionExpression='movie_id = :m',
+                                         ExpressionAttributeValues={':m': key['movie_id']},
+                                         ProjectionExpression='sentiment, sentiment_confidence, sentiment_disagreement')
+                ]
+                condition, values = self._unchanged(before, sentiment_stats.FIELDS)
+                for field, value in zip(sentiment_stats.FIELDS, sentiment_stats.deltas(rows)):
+                    values[f':{field}'] = Decimal(str(value)) if isinstance(value, float) else value
+                try:
+                    self.movies_table.update_item(
+                        Key={'movie_id': movie_id},
+                        UpdateExpression='SET ' + ', '.join(f'{f} = :{f}' for f in sentiment_stats.FIELDS),
+                        ConditionExpression=condition,
+                        ExpressionAttributeValues=values
+                    )
+                    return
+                except self.dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
+                    continue
+            print(f"Sentiment update error: movie {movie_id} kept changing, not rebuilt")
+        except Exception as e:
+            print("Sentiment update error:", e)
+
+    def rebuild_sentiment_stats(self):
+        """Recount every movie's sentiment counters (one feedback query per movie)"""
+        for item in self._scan(self.movies_table.name, ProjectionExpression='movie_id'):
+            self.update_movie_sentiment(item['movie_id'])
+
+    def get_sentiment_counters(self, movie_id: Optional[int] = None) -> Optional[Dict]:
+        """Sentiment counters for one movie (GetItem) or summed over all movies (projected scan)"""
+        projection = ', '.join(sentiment_stats.FIELDS)
+        try:
+            if movie_id is not None:
+                item = self._get_item(self.movies_table.name, {'movie_id': dynamo_types.number(movie_id)},
+                                      ProjectionExpression=projection)
+                if item is None:
+                    return None
+                return {f: item.get(f, 0) for f in sentiment_stats.FIELDS}
+
+            totals = dict.fromkeys(sentiment_stats.FIELDS, 0)
+            for item in self._scan(self.movies_table.name, ProjectionExpression=projection):
+                for f in sentiment_stats.FIELDS:
+                    totals[f] += item.get(f, 0)
+            return totals
+        except Exception as e:
+            print("Sentiment fetch error:", e)
+            return dict.fromkeys(sentiment_stats.FIELDS, 0)
+
+    # ========== ROLLUPS ==========
+
+    def _record_rollups(self, row, day: str):
+        """ADD one feedback row to its movie's and the all-movies rollup for the day"""
+        for (movie_id, day), values in rollups.deltas([row], day).items():
+            try:
+                self.rollups_table.update_item(
+                    Key={'movie_id': movie_id, 'day': day},
+                    UpdateExpression='ADD ' + ', '.join(f'{f} :{f}' for f in rollups.FIELDS),
+                    ExpressionAttributeValues={f':{f}': v for f, v in zip(rollups.FIELDS, values)}
+                )
+            except Exception as e:
+                print("Rollup update error:", e)
+
+    def rebuild_rollups(self):
+        """
+        Recompute rollups with one paginated feedback scan (backfill/repair)
+
+        Reviews only ADD to their own day's rows, so days before today are
+        final: their rows are set to the recomputed totals and rows of days
+        without feedback are deleted. Today's rows are left to the live
+        writes. Each write is conditional on the row being unchanged since
+        it was read, so a concurrent delete_movie (or a review straddling
+        midnight) isn't undone; such rows are skipped, and a re-run fixes them.
+        """
+        today = rollups.day_of()
+        before = {(item['movie_id'], item['day']): item
+                  for item in self._scan(self.rollups_table.name, ConsistentRead=True)
+                  if item['day'] < today}
+
+        totals = {}
+        feedback = self._scan(self.feedback_table.name, ConsistentRead=True,
+                              ProjectionExpression='movie_id, #ts, rating, sentiment',
+                              ExpressionAttributeNames={'#ts': 'timestamp'})
+        for f in feedback:
+            day = f['timestamp'][:10]
+            if day >= today:
+                continue
+            row = (f['movie_id'], None, f['rating'], None, f.get('sentiment'))
+            for key, values in rollups.deltas([row], day).items():
+                current = totals.setdefault(key, [0] * len(rollups.FIELDS))
+                for i, v in enumerate(values):
+                    current[i] += v
+
+        outcomes = Counter()
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS, thread_name_prefix='rollup-rebuild') as pool:
+            futures = [pool.submit(self._rebuild_rollup, key, totals.get(key), before.get(key))
+                       for key in set(totals) | set(before)]
+            for future in futures:
+                outcomes[future.result()] += 1
+        print(f"✓ Rollups before {today}: {outcomes['set']} set, {outcomes['deleted']} deleted, "
+              f"{outcomes['unchanged']} already right, {outcomes['skipped']} skipped (changed meanwhile)")
+
+    def _rebuild_rollup(self, key, values: Optional[List[int]], before: Optional[Dict]) -> str:
+        """Set one rollup row to `values` (None: delete it) unless it changed since `before` was read"""
+        movie_id, day = key
+        if values is not None and before is not None and \
+                all(before.get(f, 0) == v for f, v in zip(rollups.FIELDS, values)):
+            return 'unchanged'
+        if before is None:
+            condition, condition_values = 'attribute_not_exists(movie_id)', {}
+        else:
+            condition, condition_values = self._unchanged(before, rollups.FIELDS)
+        try:
+            if values is None:
+                kwargs = {'ExpressionAttributeValues': condition_values} if condition_values else {}
+                self.rollups_table.delete_item(
+                    Key={'movie_id': movie_id, 'day': day},
+                    ConditionExpression=condition,
+                    **kwargs
+                )
+                return 'deleted'
+            self.rollups_table.update_item(
+                Key={'movie_id': movie_id, 'day': day},
+                UpdateExpression='SET ' + ', '.join(f'{f} = :{f}' for f in rollups.FIELDS),
+                ConditionExpression=condition,
+                ExpressionAttributeValues={**{f':{f}': v for f, v in zip(rollups.FIELDS, values)},
+                                           **condition_values}
+            )
+            return 'set'
+        except self.dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
+            return 'skipped'
+
+    def get_daily_rollups(self, movie_id: int, from_day: str, to_day: str) -> Dict[str, Dict]:
+        """Rollup rows as {day: {field: value}} via one range Query"""
+        result = {}
+        kwargs = {'KeyConditionExpression': Key('movie_id').eq(movie_id) & Key('day').between(from_day, to_day)}
+        try:
+            while True:
+                res = self.rollups_table.query(**kwargs)
+                for item in res.get('Items', []):
+                    result[item['day']] = {f: int(item.get(f, 0)) for f in rollups.FIELDS}
+                if 'LastEvaluatedKey' not in res:
+                    break
+                kwargs['ExclusiveStartKey'] = res['LastEvaluatedKey']
+        except Exception as e:
+            print("Rollup fetch error:", e)
+        return result
+
+    # ========== TRENDING ==========
+
+    def _record_activity(self, movie_id: int):
+        """Count one review in the current bucket of every granularity"""
+        now = time.time()
+        for granularity in trending.GRANULARITIES:
+            start = trending.bucket_start(granularity, now)
+            try:
+                self.trending_table.update_item(
+                    Key={'bucket': trending.bucket_key(granularity, start), 'movie_id': movie_id},
+                    UpdateExpression='ADD reviews :one SET expires_at = :exp',
+                    ExpressionAttributeValues={
+                        ':one': 1,
+                        ':exp': trending.expires_at(granularity, start)
+                    }
+                )
+            except Exception as e:
+                print("Trending update error:", e)
+
+    def get_activity_counts(self, granularity: str, bucket_starts: List[int]) -> Dict[int, Dict[int, int]]:
+        """Review counts as {bucket_start: {movie_id: reviews}}, one Query per bucket"""
+        counts = {}
+        for start in bucket_starts:
+            bucket = {}
+            kwargs = {'KeyConditionExpression': Key('bucket').eq(trending.bucket_key(granularity, start))}
+            try:
+                while True:
+                    res = self.trending_table.query(**kwargs)
+                    for item in res.get('Items', []):
+                        bucket[int(item['movie_id'])] = int(item['reviews'])
+                    if 'LastEvaluatedKey' not in res:
+                        break
+                    kwargs['ExclusiveStartKey'] = res['LastEvaluatedKey']
+            except Exception as e:
+                print("Trending fetch error:", e)
+            counts[start] = bucket
+        return counts
+
+    # ========== JOBS ==========
+
+    def save_job(self, job: Dict, expires_at: float):
+        """Put a job's status; DynamoDB's TTL removes it after expires_at"""
+        self.jobs_table.put_item(Item={'job_id': job['id'], 'data': json.dumps(job), 'expires_at': int(expires_at)})
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        item = self._get_item(self.jobs_table.name, {'job_id': dynamo_types.string(job_id)},
+                              ConsistentRead=True, ProjectionExpression='#d',
+                              ExpressionAttributeNames={'#d': 'data'})
+        return json.loads(item['data']) if item else None
+
     # ========== ANALYTICS ==========
 
     def get_analytics(self) -> Dict:
         try:
-            movies = self.movies_table.scan().get('Items', [])
-            feedback = self.feedback_table.scan().get('Items', [])
+            movies = list(self._scan(self.movies_table.name, ProjectionExpression='movie_id'))
+            feedback = list(self._scan(self.feedback_table.name, ProjectionExpression='#r',
+                                       ExpressionAttributeNames={'#r': 'rating'}))
 
             total_movies = len(movies)
             total_reviews = len(feedback)
@@ -0,0 +1,131 @@
+"""
+Group Commit Writer for SQLite
+A single writer thread drains a queue of pending rows and commits them in
+batches, so concurrent writers share one transaction (and one fsync)
+instead of fighting over the database lock
+"""
+
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """
+    Batches writes into transactions of up to `max_batch` rows, waiting at
+    most `max_delay_ms` after the first row for more to arrive.
+
+    connect:     callable returning a sqlite3 connection (isolation_level=None)
+    write_batch: callable(cursor, rows) -> list of row ids, one per row
+    """
+
+    def __init__(self, connect, write_batch, max_batch=100, max_delay_ms=10, name='group-commit'):
+        self.connect = connect
+        self.write_batch = write_batch
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000.0
+        self._queue = queue.Queue()
+        self._closed = False
+        # Guards _closed against a submit racing the writer thread's failure
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, row) -> Future:
+        """Queue a row; the future resolves to its row id once committed"""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Group commit writer is closed')
+            self._queue.put((row, future))
+        return future
+
+    def close(self):
+        """Flush pending rows and stop the writer thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    # ========== WRITER THREAD ==========
+
+    def _next_batch(self):
+        """Block for one row, then gather more until the batch is full or the window ends"""
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _commit(self, conn, batch):
+        cursor = conn.cursor()
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            ids = self.write_batch(cursor, [row for row, _ in batch])
+            cursor.execute('COMMIT')
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            if len(batch) > 1:
+                # Retry one by one so a single bad row only fails its own caller
+                for item in batch:
+                    self._commit(conn, [item])
+                return
+            batch[0][1].set_exception(e)
+            return
+
+        for (_, future), row_id in zip(batch, ids):
+            future.set_result(row_id)
+
+    def _run(self):
+        batch = []
+        try:
+            conn = self.connect()
+            try:
+                while True:
+                    batch, stop = self._next_batch()
+                    if batch:
+                        self._commit(conn, batch)
+                    batch = []
+                    if stop:
+                        break
+            finally:
+                conn.close()
+        except Exception as e:
+            # Without the thread nothing would ever resolve queued futures,
+            # so fail them and refuse new rows instead of letting callers time out
+            print(f"❌ Group commit writer {self._thread.name} stopped: {e}")
+            self._fail(batch, e)
+
+    def _fail(self, batch, error):
+        with self._lock:
+            self._closed = True
+        pending = list(batch)
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                pending.append(item)
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(error)
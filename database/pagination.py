@@ -0,0 +1,38 @@
+"""
+Keyset Pagination
+Opaque cursors for paginated listings: the position the previous page
+ended at (a SQLite sort key or a DynamoDB key), as a URL-safe token
+Shared by the SQLite and DynamoDB backends
+"""
+
+import base64
+import json
+from typing import Dict, Optional
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(position: Optional[Dict]) -> Optional[str]:
+    if not position:
+        return None
+    data = json.dumps(position, separators=(',', ':'), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Dict]:
+    """Position from a cursor token; ValueError if it was tampered with or truncated"""
+    if not token:
+        return None
+    try:
+        position = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(position, dict):
+        raise ValueError('Invalid cursor')
+    return position
+
+
+def like_prefix(prefix: str) -> str:
+    """LIKE pattern matching strings that start with prefix (ESCAPE '\\')"""
+    return prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
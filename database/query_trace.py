@@ -0,0 +1,206 @@
+"""
+Per-Request Query Tracing
+Records every SQLite statement and DynamoDB API call made while serving a
+request, so N+1 patterns and redundant queries show up without reading code
+"""
+
+import sqlite3
+import time
+from collections.abc import Mapping
+from contextvars import ContextVar
+
+# Active trace for the current request (None outside a request)
+_current_trace = ContextVar('query_trace', default=None)
+
+# DynamoDB operations that accept ReturnConsumedCapacity
+_CAPACITY_OPERATIONS = {
+    'GetItem', 'PutItem', 'UpdateItem', 'DeleteItem', 'Query', 'Scan',
+    'BatchGetItem', 'BatchWriteItem', 'TransactGetItems', 'TransactWriteItems'
+}
+
+
+class QueryTrace:
+    """Queries recorded for one request"""
+    __slots__ = ('entries', 'connections')
+
+    def __init__(self):
+        self.entries = []
+        self.connections = 0
+
+    def record(self, statement, duration, rows=0, capacity=0.0, params=None):
+        entry = {
+            'statement': statement,
+            'duration': duration,
+            'rows': rows,
+            'capacity': capacity,
+            'params': params
+        }
+        self.entries.append(entry)
+        return entry
+
+    def summary(self) -> dict:
+        """Totals for the request, including repeated identical queries"""
+        seen = set()
+        duplicates = 0
+        for e in self.entries:
+            key = (e['statement'], repr(e['params']))
+            if key in seen:
+                duplicates += 1
+            seen.add(key)
+        return {
+            'queries': len(self.entries),
+            'connections': self.connections,
+            'duplicates': duplicates,
+            'rows': sum(e['rows'] for e in self.entries),
+            'time_ms': round(sum(e['duration'] for e in self.entries) * 1000, 3),
+            'capacity': round(sum(e['capacity'] for e in self.entries), 2)
+        }
+
+
+def start_trace() -> QueryTrace:
+    trace = QueryTrace()
+    _current_trace.set(trace)
+    return trace
+
+
+def finish_trace():
+    """Detach and return the current trace (or None if none was started)"""
+    trace = _current_trace.get()
+    _current_trace.set(None)
+    return trace
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def format_summary(summary: dict) -> str:
+    """Render a summary as a compact header value"""
+    return '; '.join(f'{k}={v}' for k, v in summary.items())
+
+
+# ========== SQLITE ==========
+
+def _trace_params(parameters):
+    """Parameters as given: named ones stay a dict (a tuple would keep only the names)"""
+    return dict(parameters) if isinstance(parameters, Mapping) else tuple(parameters)
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor that records each statement's duration and row count"""
+
+    def execute(self, sql, parameters=()):
+        trace = _current_trace.get()
+        if trace is None:
+            return super().execute(sql, parameters)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._trace_entry = trace.record(
+                ' '.join(sql.split()), time.perf_counter() - start,
+                rows=max(self.rowcount, 0), params=_trace_params(parameters)
+            )
+
+    def executemany(self, sql, seq_of_parameters):
+        trace = _current_trace.get()
+        if trace is None:
+            return super().executemany(sql, seq_of_parameters)
+        # Kept for the trace; a generator would be used up by the call
+        seq_of_parameters = [_trace_params(parameters) for parameters in seq_of_parameters]
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._trace_entry = trace.record(
+                ' '.join(sql.split()), time.perf_counter() - start,
+                rows=max(self.rowcount, 0), params=tuple(seq_of_parameters)
+            )
+
+    def _count_rows(self, n):
+        entry = getattr(self, '_trace_entry', None)
+        if entry is not None:
+            entry['rows'] += n
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            self._count_rows(1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(size if size is not None else self.arraysize)
+        self._count_rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        self._count_rows(len(rows))
+        return rows
+
+
+class TracedConnection(sqlite3.Connection):
+    """Connection factory that hands out TracedCursor instances"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.connections += 1
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+# ========== DYNAMODB ==========
+
+def _sum_capacity(consumed) -> float:
+    if not consumed:
+        return 0.0
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return float(sum(c.get('CapacityUnits', 0) for c in consumed))
+
+
+def _before_call(params, model, context, **kwargs):
+    """Start the call timer and ask DynamoDB to report consumed capacity"""
+    if _current_trace.get() is None:
+        return
+    context['query_trace_start'] = time.perf_counter()
+    if model.name in _CAPACITY_OPERATIONS:
+        params.setdefault('ReturnConsumedCapacity', 'TOTAL')
+
+
+def _after_call(http_response, parsed, model, context, **kwargs):
+    trace = _current_trace.get()
+    start = context.get('query_trace_start')
+    if trace is None or start is None:
+        return
+    if 'Count' in parsed:
+        rows = parsed['Count']
+    elif 'Item' in parsed:
+        rows = 1
+    elif isinstance(parsed.get('Responses'), dict):
+        # BatchGetItem: {table_name: [items]}
+        rows = sum(len(items) for items in parsed['Responses'].values())
+    else:
+        rows = len(parsed.get('Items', parsed.get('Responses', [])))
+    trace.record(
+        model.name, time.perf_counter() - start,
+        rows=rows, capacity=_sum_capacity(parsed.get('ConsumedCapacity'))
+    )
+
+
+def instrument_boto3_client(client):
+    """Register tracing hooks on a boto3 DynamoDB client"""
+    events = client.meta.events
+    # provide-client-params fires before parameter validation, so the
+    # injected ReturnConsumedCapacity is validated like a caller's own
+    events.register('provide-client-params.dynamodb.*', _before_call)
+    events.register('after-call.dynamodb.*', _after_call)
@@ -0,0 +1,89 @@
+"""
+Rating Statistics
+Per-movie 1-5 star histograms and the ranking scores derived from them
+Shared by the SQLite and DynamoDB backends so both rank identically
+"""
+
+import math
+from typing import Dict, List
+
+STAR_LEVELS = (1, 2, 3, 4, 5)
+
+# Histogram attribute/column names: stars_1 .. stars_5
+STAR_FIELDS = tuple(f'stars_{s}' for s in STAR_LEVELS)
+
+# Bayesian average prior: every movie starts with PRIOR_WEIGHT virtual
+# reviews averaging PRIOR_MEAN, so a single 5-star review can't top the chart
+PRIOR_MEAN = 3.0
+PRIOR_WEIGHT = 10
+
+# z for a 95% confidence Wilson interval
+WILSON_Z = 1.96
+
+# Supported catalog orderings -> score field
+SORT_FIELDS = {
+    'bayesian': 'bayesian_score',
+    'wilson': 'wilson_score',
+    'rating': 'avg_rating'
+}
+DEFAULT_SORT = 'bayesian'
+
+
+def histogram_from(record: Dict) -> List[int]:
+    """Read the star counts off a movie row/item as a list indexed 0..4"""
+    return [int(record.get(field) or 0) for field in STAR_FIELDS]
+
+
+def bayesian_average(histogram: List[int]) -> float:
+    total = sum(histogram)
+    rating_sum = sum(star * count for star, count in zip(STAR_LEVELS, histogram))
+    return (PRIOR_MEAN * PRIOR_WEIGHT + rating_sum) / (PRIOR_WEIGHT + total)
+
+
+def wilson_lower_bound(histogram: List[int]) -> float:
+    """Lower bound of the 95% Wilson interval on the share of 4-5 star reviews"""
+    total = sum(histogram)
+    if total == 0:
+        return 0.0
+    positive = histogram[3] + histogram[4]
+    phat = positive / total
+    z2 = WILSON_Z * WILSON_Z
+    centre = phat + z2 / (2 * total)
+    margin = WILSON_Z * math.sqrt((phat * (1 - phat) + z2 / (4 * total)) / total)
+    return (centre - margin) / (1 + z2 / total)
+
+
+def catalog_summary(histograms) -> Dict:
+    """
+    Review totals over a list of movie histograms, so callers that already
+    hold the catalog need no feedback scan
+
+    Same keys and meaning as the backends' get_analytics: overall_avg_rating
+    is the average over all reviews, not the mean of per-movie averages.
+    """
+    movies = 0
+    totals = [0] * len(STAR_LEVELS)
+    for histogram in histograms:
+        movies += 1
+        for i, count in enumerate(histogram):
+            totals[i] += count
+    reviews = sum(totals)
+    rating_sum = sum(star * count for star, count in zip(STAR_LEVELS, totals))
+    return {
+        'total_movies': movies,
+        'total_reviews': reviews,
+        'overall_avg_rating': round(rating_sum / reviews, 1) if reviews else 0,
+        'positive_percentage': round((totals[3] + totals[4]) / reviews * 100, 1) if reviews else 0
+    }
+
+
+def compute_scores(histogram: List[int]) -> Dict:
+    """All denormalized rating fields for a movie, from its histogram alone"""
+    total = sum(histogram)
+    rating_sum = sum(star * count for star, count in zip(STAR_LEVELS, histogram))
+    return {
+        'avg_rating': round(rating_sum / total, 1) if total else 0,
+        'total_reviews': total,
+        'bayesian_score': round(bayesian_average(histogram), 4),
+        'wilson_score': round(wilson_lower_bound(histogram), 4)
+    }
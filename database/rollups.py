@@ -0,0 +1,92 @@
+"""
+Daily Rollups
+Per-day and per-movie-per-day review aggregates, maintained on write so
+time-range analytics cost O(days) instead of O(reviews)
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List
+
+# movie_id used for the all-movies rollup rows
+ALL_MOVIES = 0
+
+# Counter fields stored per (movie_id, day)
+FIELDS = (
+    'reviews', 'rating_sum', 'positive',
+    'sentiment_positive', 'sentiment_neutral', 'sentiment_negative'
+)
+
+GRANULARITIES = ('day', 'week', 'month')
+
+# Longest range the timeseries API will answer in one call
+MAX_RANGE_DAYS = 3660
+
+
+def day_of(ts: datetime = None) -> str:
+    """UTC day key, e.g. '2026-10-19'"""
+    return (ts or datetime.utcnow()).strftime('%Y-%m-%d')
+
+
+def deltas(rows: Iterable, day: str) -> Dict[tuple, List[int]]:
+    """
+    Counter increments for a group of feedback rows written on `day`
+
+    rows: (movie_id, user_email, rating, comment, sentiment, ...) tuples
+    Returns {(movie_id, day): [value per FIELDS]}, including the
+    ALL_MOVIES row.
+    """
+    out = {}
+    for row in rows:
+        movie_id, rating, sentiment = row[0], row[2], row[4]
+        # Labels other than positive/negative (e.g. 'mixed') count as neutral
+        label = sentiment if sentiment in ('positive', 'negative') else 'neutral'
+        values = [1, rating, 1 if rating >= 4 else 0,
+                  int(label == 'positive'), int(label == 'neutral'), int(label == 'negative')]
+        for key in ((movie_id, day), (ALL_MOVIES, day)):
+            current = out.setdefault(key, [0] * len(FIELDS))
+            for i, v in enumerate(values):
+                current[i] += v
+    return out
+
+
+def _period_start(d: date, granularity: str) -> date:
+    if granularity == 'week':
+        return d - timedelta(days=d.weekday())
+    if granularity == 'month':
+        return d.replace(day=1)
+    return d
+
+
+def timeseries(rollups: Dict[str, Dict], start: date, end: date, granularity: str = 'day') -> List[Dict]:
+    """
+    Fold daily rollups into periods between start and end (inclusive)
+
+    rollups: {day: {field: value}} for days that have data; missing days
+    count as zero so the series has no gaps.
+    """
+    periods = {}
+    d = start
+    while d <= end:
+        period = _period_start(d, granularity).isoformat()
+        totals = periods.setdefault(period, dict.fromkeys(FIELDS, 0))
+        row = rollups.get(d.isoformat())
+        if row:
+            for field in FIELDS:
+                totals[field] += int(row.get(field, 0))
+        d += timedelta(days=1)
+
+    points = []
+    for period, t in periods.items():
+        reviews = t['reviews']
+        points.append({
+            'period': period,
+            'reviews': reviews,
+            'avg_rating': round(t['rating_sum'] / reviews, 2) if reviews else 0,
+            'positive_percentage': round(t['positive'] / reviews * 100, 1) if reviews else 0,
+            'sentiment': {
+                'positive': t['sentiment_positive'],
+                'neutral': t['sentiment_neutral'],
+                'negative': t['sentiment_negative']
+            }
+        })
+    return points
@@ -0,0 +1,228 @@
+"""
+Movie Search Index
+In-process inverted index over movie titles, genres and descriptions for
+the DynamoDB backend, which has no text search of its own
+"""
+
+import bisect
+import heapq
+import math
+import re
+import sys
+import threading
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+# Indexed fields and their weights (same ordering as the SQLite bm25 weights)
+FIELDS = ('title', 'genre', 'description')
+FIELD_WEIGHTS = (10.0, 3.0, 1.0)
+
+# Most index terms a trailing prefix may expand to
+MAX_PREFIX_TERMS = 64
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def tokenize(text) -> List[str]:
+    """Lower-cased word tokens, in order"""
+    return _WORD_RE.findall(str(text or '').lower())
+
+
+class MovieSearchIndex:
+    """
+    Term -> sorted movie_id postings, one table per field
+
+    Postings are array('I') rather than lists of ints, so each posting
+    costs 4 bytes instead of a pointer plus an int object. A sorted term
+    list answers prefix (search-as-you-type) lookups with bisect, and a
+    forward index of each movie's terms makes updates and removals cheap.
+    """
+
+    def __init__(self):
+        self.postings = tuple({} for _ in FIELDS)   # field -> {term: array('I')}
+        self.doc_terms = {}                          # movie_id -> tuple of per-field term tuples
+        self._terms = []                             # sorted union of all terms
+        self._terms_dirty = False
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    # ========== WRITES ==========
+
+    def add(self, movie: Dict):
+        """Index (or re-index) one movie item"""
+        movie_id = int(movie['movie_id'])
+        fields = tuple(
+            tuple(sys.intern(t) for t in dict.fromkeys(tokenize(movie.get(field))))
+            for field in FIELDS
+        )
+        with self._lock:
+            if movie_id in self.doc_terms:
+                self._remove(movie_id)
+            for table, terms in zip(self.postings, fields):
+                for term in terms:
+                    ids = table.get(term)
+                    if ids is None:
+                        table[term] = array('I', (movie_id,))
+                        self._terms_dirty = True
+                    elif ids[-1] < movie_id:
+                        ids.append(movie_id)
+                    else:
+                        ids.insert(bisect.bisect_left(ids, movie_id), movie_id)
+            self.doc_terms[movie_id] = fields
+
+    def remove(self, movie_id: int):
+        with self._lock:
+            self._remove(int(movie_id))
+
+    def _remove(self, movie_id: int):
+        fields = self.doc_terms.pop(movie_id, None)
+        if fields is None:
+            return
+        for table, terms in zip(self.postings, fields):
+            for term in terms:
+                ids = table[term]
+                i = bisect.bisect_left(ids, movie_id)
+                if i < len(ids) and ids[i] == movie_id:
+                    del ids[i]
+                if not ids:
+                    del table[term]
+                    self._terms_dirty = True
+
+    @classmethod
+    def build(cls, movies: Iterable[Dict]) -> 'MovieSearchIndex':
+        """Bulk-build: sort postings once instead of inserting one id at a time"""
+        index = cls()
+        tables = tuple({} for _ in FIELDS)
+        for movie in movies:
+            movie_id = int(movie['movie_id'])
+            fields = tuple(
+                tuple(sys.intern(t) for t in dict.fromkeys(tokenize(movie.get(field))))
+                for field in FIELDS
+            )
+            index.doc_terms[movie_id] = fields
+            for table, terms in zip(tables, fields):
+                for term in terms:
+                    table.setdefault(term, []).append(movie_id)
+        for table, built in zip(index.postings, tables):
+            for term, ids in built.items():
+                table[term] = array('I', sorted(ids))
+        index._terms_dirty = True
+        return index
+
+    # ========== QUERIES ==========
+
+    def _sorted_terms(self) -> List[str]:
+        if self._terms_dirty:
+            self._terms = sorted(set().union(*self.postings))
+            self._terms_dirty = False
+        return self._terms
+
+    def expand_prefix(self, prefix: str, limit: int = MAX_PREFIX_TERMS) -> List[str]:
+        """Index terms starting with `prefix`, alphabetically"""
+        with self._lock:
+            terms = self._sorted_terms()
+            out = []
+            i = bisect.bisect_left(terms, prefix)
+            while i < len(terms) and terms[i].startswith(prefix) and len(out) < limit:
+                out.append(terms[i])
+                i += 1
+            return out
+
+    def _word_postings(self, terms: List[str], total: int) -> List[Tuple[array, float]]:
+        """(postings, weighted idf) for every field/term a query word can match"""
+        lists = []
+        for table, weight in zip(self.postings, FIELD_WEIGHTS):
+            for term in terms:
+                ids = table.get(term)
+                if ids:
+                    lists.append((ids, weight * math.log(1 + total / len(ids))))
+        return lists
+
+    @staticmethod
+    def _walk(lists) -> Dict[int, float]:
+        """movie_id -> best score, visiting every posting"""
+        scores = {}
+        for ids, score in lists:
+            for movie_id in ids:
+                if scores.get(movie_id, 0) < score:
+                    scores[movie_id] = score
+        return scores
+
+    @staticmethod
+    def _probe(lists, candidates: Dict[int, float]) -> Dict[int, float]:
+        """Add each candidate's best score from `lists`, dropping candidates with no hit"""
+        out = {}
+        for movie_id, score in candidates.items():
+            best = 0
+            for ids, term_score in lists:
+                if term_score > best:
+                    i = bisect.bisect_left(ids, movie_id)
+                    if i < len(ids) and ids[i] == movie_id:
+                        best = term_score
+            if best:
+                out[movie_id] = score + best
+        return out
+
+    def search(self, text: str, limit: int = 20, offset: int = 0) -> Tuple[List[Tuple[int, float]], bool]:
+        """
+        Movies matching every word of `text`, best first
+
+        The last word is a prefix match. Returns ([(movie_id, score)], has_more).
+        """
+        words = tokenize(text)
+        if not words:
+            return [], False
+        with self._lock:
+            total = len(self.doc_terms) or 1
+            words_postings = [
+                self._word_postings(self.expand_prefix(word) if i == len(words) - 1 else [word], total)
+                for i, word in enumerate(words)
+            ]
+            # Rarest word first: walk its postings, then only probe the
+            # (few) surviving candidates against the common words
+            words_postings.sort(key=lambda lists: sum(len(ids) for ids, _ in lists))
+            matched = self._walk(words_postings[0])
+            for lists in words_postings[1:]:
+                if not matched:
+                    break
+                if len(matched) * len(lists) < sum(len(ids) for ids, _ in lists):
+                    matched = self._probe(lists, matched)
+                else:
+                    walked = self._walk(lists)
+                    matched = {mid: s + walked[mid] for mid, s in matched.items() if mid in walked}
+            if not matched:
+                return [], False
+        # Only the requested page (plus one, for has_more) is ordered
+        ranked = heapq.nsmallest(offset + limit + 1, matched.items(), key=lambda item: (-item[1], item[0]))
+        page = ranked[offset:offset + limit]
+        return [(mid, round(score, 4)) for mid, score in page], len(ranked) > offset + limit
+
+    # ========== STATS ==========
+
+    def memory_stats(self) -> Dict:
+        """Approximate index footprint (dicts, postings arrays, term strings)"""
+        with self._lock:
+            postings_bytes = 0
+            dict_bytes = sys.getsizeof(self.doc_terms)
+            terms = set()
+            entries = 0
+            for table in self.postings:
+                dict_bytes += sys.getsizeof(table)
+                for term, ids in table.items():
+                    postings_bytes += sys.getsizeof(ids)
+                    entries += len(ids)
+                    terms.add(term)
+            for fields in self.doc_terms.values():
+                dict_bytes += sys.getsizeof(fields) + sum(sys.getsizeof(t) for t in fields)
+            term_bytes = sum(sys.getsizeof(t) for t in terms) + sys.getsizeof(self._terms)
+            total = postings_bytes + dict_bytes + term_bytes
+            movies = len(self.doc_terms)
+            return {
+                'movies': movies,
+                'terms': len(terms),
+                'postings': entries,
+                'bytes': total,
+                'bytes_per_movie': round(total / movies) if movies else 0
+            }
@@ -0,0 +1,59 @@
+"""
+Sentiment Statistics
+Per-movie counters over the sentiment labels stored with each review, so
+sentiment analytics never re-run the analyzer
+"""
+
+from typing import Dict, Iterable, List
+
+LABELS = ('positive', 'neutral', 'negative')
+
+# Counter fields kept on each movie row/item
+FIELDS = (
+    'sentiment_positive', 'sentiment_neutral', 'sentiment_negative',
+    'sentiment_scored',          # reviews with a stored confidence
+    'sentiment_confidence_sum',
+    'sentiment_disagreements'    # text sentiment contradicts star rating
+)
+
+
+def label_of(sentiment) -> str:
+    """Stored label bucket; anything else (e.g. 'mixed') counts as neutral"""
+    return sentiment if sentiment in ('positive', 'negative') else 'neutral'
+
+
+def deltas(rows: Iterable) -> List:
+    """
+    Counter increments for feedback rows, in FIELDS order
+
+    rows: (movie_id, user_email, rating, comment, sentiment, confidence, disagreement)
+    """
+    values = [0, 0, 0, 0, 0.0, 0]
+    for row in rows:
+        sentiment, confidence, disagreement = row[4], row[5], row[6]
+        values[LABELS.index(label_of(sentiment))] += 1
+        if confidence is not None:
+            values[3] += 1
+            values[4] += float(confidence)
+        if disagreement:
+            values[5] += 1
+    return values
+
+
+def summarize(counters: Dict) -> Dict:
+    """Distribution, disagreement rate and average confidence from counters"""
+    counts = {label: int(counters.get(f'sentiment_{label}') or 0) for label in LABELS}
+    total = sum(counts.values())
+    scored = int(counters.get('sentiment_scored') or 0)
+    disagreements = int(counters.get('sentiment_disagreements') or 0)
+    return {
+        'total': total,
+        'counts': counts,
+        'distribution': {
+            label: round(n / total * 100, 1) if total else 0
+            for label, n in counts.items()
+        },
+        'disagreements': disagreements,
+        'disagreement_rate': round(disagreements / total * 100, 1) if total else 0,
+        'average_confidence': round(float(counters.get('sentiment_confidence_sum') or 0) / scored, 3) if scored else 0
+    }
@@ -2,21 +2,84 @@
 SQLite Database Implementation for Local Development
 """
 
+import html
+import json
+import re
 import sqlite3
+import time
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
+from database.query_trace import TracedConnection
+from database.group_commit import GroupCommitWriter
+from database import rating_stats
+from database import trending
+from database import rollups
+from database import sentiment_stats
+from database import pagination
+from models.movie import Movie
+from models.feedback import Feedback
+from models.user import User
+
+# Seconds a caller waits for the group-commit writer before giving up
+FEEDBACK_WRITE_TIMEOUT = 30
+
+# Feedback rows removed per transaction by delete_movie
+DELETE_BATCH_SIZE = 5000
 
 class SQLiteDatabase:
-    def __init__(self, db_path='cinema_pulse.db'):
+    def __init__(self, db_path='cinema_pulse.db', trace_queries=False,
+                 group_commit=False, group_commit_size=100, group_commit_ms=10):
         self.db_path = db_path
+        # Bucket start of the last movie_activity retention sweep
+        self._activity_pruned_bucket = None
+        # Traced connections record statements for the active request trace
+        self.connection_factory = TracedConnection if trace_queries else sqlite3.Connection
         self.init_database()
+        
+        # Optional single writer that commits feedback inserts in groups
+        self.group_commit = group_commit
+        self.group_commit_size = group_commit_size
+        self.group_commit_ms = group_commit_ms
+        self.feedback_writer = None
+        if group_commit:
+            self._start_feedback_writer()
+    
+    def _start_feedback_writer(self):
+        self.feedback_writer = GroupCommitWriter(
+            connect=self.get_writer_connection,
+            write_batch=self._insert_feedback_batch,
+            max_batch=self.group_commit_size,
+            max_delay_ms=self.group_commit_ms,
+            name='feedback-writer'
+        )
+    
+    def after_fork(self):
+        """Start this process's own group-commit writer (the parent's thread doesn't survive fork)"""
+        if self.group_commit:
+            self._start_feedback_writer()
+    
+    def ping(self):
+        """Open the database and run a trivial query (raises if unusable)"""
+        conn = self.get_connection()
+        try:
+            conn.execute('SELECT 1 FROM movies LIMIT 1').fetchall()
+        finally:
+            conn.close()
     
     def get_connection(self):
         """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, factory=self.connection_factory)
         conn.row_factory = sqlite3.Row  # Return rows as dictionaries
         return conn
     
+    def get_writer_connection(self):
+        """Connection for the group-commit writer (explicit transactions)"""
+        conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=FEEDBACK_WRITE_TIMEOUT)
+        conn.row_factory = sqlite3.Row
+        # WAL lets readers proceed while the writer holds the lock
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+    
     def init_database(self):
         """Initialize database schema"""
         conn = self.get_connection()
@@ -34,6 +97,10 @@ class SQLiteDatabase:
             )
         ''')
         
+        # Admin user listing: newest first, optionally within one role
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_created ON users (created_at DESC, email DESC)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_role_created ON users (role, created_at DESC, email DESC)')
+        
         # Movies table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS movies (
@@ -48,6 +115,20 @@ class SQLiteDatabase:
             )
         ''')
         
+        # Rating histogram + ranking scores (added after the first release,
+        # so older databases are migrated in place and backfilled once)
+        rating_columns = {field: 'INTEGER DEFAULT 0' for field in rating_stats.STAR_FIELDS}
+        rating_columns['bayesian_score'] = 'REAL DEFAULT 0'
+        rating_columns['wilson_score'] = 'REAL DEFAULT 0'
+        needs_rating_backfill = self._add_missing_columns(cursor, 'movies', rating_columns)
+        # Catalog order (score, then id, both descending), overall and per
+        # genre; these replace the score-only indexes, which left ties to a sort
+        for name, field in rating_stats.SORT_FIELDS.items():
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_movies_rank_{name} ON movies ({field} DESC, id DESC)')
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_movies_genre_{name} ON movies (genre, {field} DESC, id DESC)')
+        for old_index in ('idx_movies_bayesian', 'idx_movies_wilson', 'idx_movies_avg_rating'):
+            cursor.execute(f'DROP INDEX IF EXISTS {old_index}')
+        
         # Feedback table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS feedback (
@@ -63,14 +144,132 @@ class SQLiteDatabase:
             )
         ''')
         
+        # Per-movie review listing and cascade delete
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_feedback_movie ON feedback (movie_id, timestamp)')
+        # A user's review history, newest first; movie_id makes the
+        # "already reviewed" lookup index-only
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_feedback_user ON feedback '
+                       '(user_email, timestamp DESC, id DESC, movie_id)')
+        
+        # Analyzer output persisted at write time so analytics never re-score
+        self._add_missing_columns(cursor, 'feedback', {
+            'sentiment_confidence': 'REAL',
+            'sentiment_disagreement': 'INTEGER DEFAULT 0'
+        })
+        sentiment_columns = {field: 'INTEGER DEFAULT 0' for field in sentiment_stats.FIELDS}
+        sentiment_columns['sentiment_confidence_sum'] = 'REAL DEFAULT 0'
+        needs_sentiment_backfill = self._add_missing_columns(cursor, 'movies', sentiment_columns)
+        
+        # Daily rollups per movie per day (movie_id 0 = all movies)
+        needs_rollup_backfill = not self._table_exists(cursor, 'daily_rollups')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS daily_rollups (
+                movie_id INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                reviews INTEGER NOT NULL DEFAULT 0,
+                rating_sum INTEGER NOT NULL DEFAULT 0,
+                positive INTEGER NOT NULL DEFAULT 0,
+                sentiment_positive INTEGER NOT NULL DEFAULT 0,
+                sentiment_neutral INTEGER NOT NULL DEFAULT 0,
+                sentiment_negative INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (movie_id, day)
+            ) WITHOUT ROWID
+        ''')
+        
+        # Full-text search: external-content FTS5 indexes kept in sync by triggers
+        needs_fts_rebuild = not self._table_exists(cursor, 'movies_fts')
+        cursor.executescript('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+                title, genre, description,
+                content='movies', content_rowid='id', tokenize='porter unicode61'
+            );
+            CREATE TRIGGER IF NOT EXISTS movies_fts_ai AFTER INSERT ON movies BEGIN
+                INSERT INTO movies_fts (rowid, title, genre, description)
+                VALUES (new.id, new.title, new.genre, new.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS movies_fts_ad AFTER DELETE ON movies BEGIN
+                INSERT INTO movies_fts (movies_fts, rowid, title, genre, description)
+                VALUES ('delete', old.id, old.title, old.genre, old.description);
+            END;
+            -- Only text columns: rating updates must not touch the index
+            CREATE TRIGGER IF NOT EXISTS movies_fts_au AFTER UPDATE OF title, genre, description ON movies BEGIN
+                INSERT INTO movies_fts (movies_fts, rowid, title, genre, description)
+                VALUES ('delete', old.id, old.title, old.genre, old.description);
+                INSERT INTO movies_fts (rowid, title, genre, description)
+                VALUES (new.id, new.title, new.genre, new.description);
+            END;
+            
+            CREATE VIRTUAL TABLE IF NOT EXISTS feedback_fts USING fts5(
+                comment,
+                content='feedback', content_rowid='id', tokenize='porter unicode61'
+            );
+            CREATE TRIGGER IF NOT EXISTS feedback_fts_ai AFTER INSERT ON feedback BEGIN
+                INSERT INTO feedback_fts (rowid, comment) VALUES (new.id, new.comment);
+            END;
+            CREATE TRIGGER IF NOT EXISTS feedback_fts_ad AFTER DELETE ON feedback BEGIN
+                INSERT INTO feedback_fts (feedback_fts, rowid, comment) VALUES ('delete', old.id, old.comment);
+            END;
+            CREATE TRIGGER IF NOT EXISTS feedback_fts_au AFTER UPDATE OF comment ON feedback BEGIN
+                INSERT INTO feedback_fts (feedback_fts, rowid, comment) VALUES ('delete', old.id, old.comment);
+                INSERT INTO feedback_fts (rowid, comment) VALUES (new.id, new.comment);
+            END;
+        ''')
+        if needs_fts_rebuild:
+            cursor.execute("INSERT INTO movies_fts (movies_fts) VALUES ('rebuild')")
+            cursor.execute("INSERT INTO feedback_fts (feedback_fts) VALUES ('rebuild')")
+        
+        # Trending counters: reviews per movie per time bucket
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS movie_activity (
+                granularity TEXT NOT NULL,
+                bucket_start INTEGER NOT NULL,
+                movie_id INTEGER NOT NULL,
+                reviews INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (granularity, bucket_start, movie_id)
+            ) WITHOUT ROWID
+        ''')
+        
+        # Background admin jobs (status as JSON), shared by every worker
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        ''')
+        
         conn.commit()
         conn.close()
         
         # Insert default data
-        self.seed_default_data()
+        seeded = self.seed_default_data()
+        
+        if needs_rating_backfill or seeded:
+            self.rebuild_rating_stats()
+        if needs_rollup_backfill or seeded:
+            self.rebuild_rollups()
+        if needs_sentiment_backfill or seeded:
+            self.rebuild_sentiment_stats()
+    
+    @staticmethod
+    def _table_exists(cursor, table: str) -> bool:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        return cursor.fetchone() is not None
     
-    def seed_default_data(self):
-        """Insert default users and movies"""
+    @staticmethod
+    def _add_missing_columns(cursor, table: str, columns: Dict[str, str]) -> bool:
+        """ALTER TABLE ADD COLUMN for each missing column; True if any were added"""
+        cursor.execute(f'PRAGMA table_info({table})')
+        existing = {row['name'] for row in cursor.fetchall()}
+        added = False
+        for name, ddl in columns.items():
+            if name not in existing:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {ddl}')
+                added = True
+        return added
+    
+    def seed_default_data(self) -> bool:
+        """Insert default users and movies; returns True if anything was seeded"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
@@ -78,7 +277,7 @@ class SQLiteDatabase:
         cursor.execute('SELECT COUNT(*) as count FROM users')
         if cursor.fetchone()['count'] > 0:
             conn.close()
-            return
+            return False
         
         # Import auth service for password hashing
         import hashlib
@@ -146,17 +345,18 @@ class SQLiteDatabase:
         
         conn.commit()
         conn.close()
+        return True
     
     # ========== USER OPERATIONS ==========
     
-    def get_user_by_email(self, email: str) -> Optional[Dict]:
+    def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute('SELECT * FROM users WHERE email = ?', (email,))
+        cursor.execute(f'SELECT {User.sql_columns()} FROM users WHERE email = ?', (email,))
         user = cursor.fetchone()
         conn.close()
-        return dict(user) if user else None
+        return User.from_row(user) if user else None
     
     def create_user(self, email: str, role: str = 'viewer') -> bool:
         """Create new user"""
@@ -170,85 +370,614 @@ class SQLiteDatabase:
         except sqlite3.IntegrityError:
             return False
     
+    def list_users(self, limit: int = pagination.DEFAULT_PAGE_SIZE, cursor: Optional[Dict] = None,
+                   email_prefix: Optional[str] = None, role: Optional[str] = None) -> Dict:
+        """
+        One page of users, newest first: {'users': [User], 'next': position}
+
+        Keyset pagination on (created_at, email), so every page is an index
+        range scan however deep it is. Credentials are not selected.
+        """
+        where, params = [], []
+        if role:
+            where.append('role = ?')
+            params.append(role)
+        if email_prefix:
+            where.append("email LIKE ? ESCAPE '\\'")
+            params.append(pagination.like_prefix(email_prefix))
+        if cursor:
+            try:
+                params.extend((cursor['created_at'], cursor['email']))
+            except KeyError:
+                raise ValueError('Invalid cursor')
+            where.append('(created_at, email) < (?, ?)')
+
+        conn = self.get_connection()
+        db_cursor = conn.cursor()
+        db_cursor.execute(f'''
+            SELECT email, name, role, created_at FROM users
+            {'WHERE ' + ' AND '.join(where) if where else ''}
+            ORDER BY created_at DESC, email DESC
+            LIMIT ?
+        ''', (*params, limit + 1))
+        rows = db_cursor.fetchall()
+        conn.close()
+
+        users = [User(email, name, role, created_at=created_at) for email, name, role, created_at in rows[:limit]]
+        next_position = None
+        if len(rows) > limit:
+            next_position = {'created_at': users[-1].created_at, 'email': users[-1].email}
+        return {'users': users, 'next': next_position}
+    
+    def count_users(self) -> int:
+        conn = self.get_connection()
+        count = conn.execute('SELECT COUNT(*) FROM users').fetchone()[0]
+        conn.close()
+        return count
+    
     # ========== MOVIE OPERATIONS ==========
     
-    def get_all_movies(self) -> List[Dict]:
-        """Get all movies"""
+    def get_all_movies(self, sort: str = rating_stats.DEFAULT_SORT) -> List[Movie]:
+        """Get all movies, ranked by a precomputed score column"""
+        return self.list_movies(sort)['movies']
+    
+    def list_movies(self, sort: str = rating_stats.DEFAULT_SORT, genre: Optional[str] = None,
+                    limit: Optional[int] = None, cursor: Optional[Dict] = None) -> Dict:
+        """
+        One page of the ranked catalog: {'movies': [Movie], 'next': position}
+
+        Keyset paged on (score, id) so pages stay stable while scores move;
+        limit None returns the rest of the catalog.
+        """
+        order_by = rating_stats.SORT_FIELDS.get(sort, rating_stats.SORT_FIELDS[rating_stats.DEFAULT_SORT])
+        where, params = [], []
+        if genre:
+            where.append('genre = ?')
+            params.append(genre)
+        if cursor:
+            try:
+                params.extend((float(cursor['score']), int(cursor['id'])))
+            except (KeyError, TypeError, ValueError):
+                raise ValueError('Invalid cursor')
+            where.append(f'({order_by}, id) < (?, ?)')
+        sql = f'SELECT {Movie.sql_columns()} FROM movies'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += f' ORDER BY {order_by} DESC, id DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit + 1)
+
+        conn = self.get_connection()
+        db_cursor = conn.cursor()
+        # Plain tuples: Movie.from_row reads positionally, so sqlite3.Row buys nothing
+        db_cursor.row_factory = None
+        db_cursor.execute(sql, params)
+        movies = [Movie.from_row(row) for row in db_cursor.fetchall()]
+        conn.close()
+
+        next_position = None
+        if limit is not None and len(movies) > limit:
+            movies = movies[:limit]
+            last = movies[-1]
+            next_position = {'score': getattr(last, order_by), 'id': last.id}
+        return {'movies': movies, 'next': next_position}
+
+    def get_movie_by_id(self, movie_id: int) -> Optional[Movie]:
+        """Get movie by ID"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute('SELECT * FROM movies ORDER BY avg_rating DESC')
-        movies = [dict(row) for row in cursor.fetchall()]
+        cursor.execute(f'SELECT {Movie.sql_columns()} FROM movies WHERE id = ?', (movie_id,))
+        movie = cursor.fetchone()
+        conn.close()
+        return Movie.from_row(movie) if movie else None
+    
+    def get_movies_by_ids(self, movie_ids: List[int]) -> List[Movie]:
+        """Fetch several movies in one query (order not preserved)"""
+        if not movie_ids:
+            return []
+        placeholders = ', '.join('?' for _ in movie_ids)
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(f'SELECT {Movie.sql_columns()} FROM movies WHERE id IN ({placeholders})', tuple(movie_ids))
+        movies = [Movie.from_row(row) for row in cursor.fetchall()]
         conn.close()
         return movies
     
-    def get_movie_by_id(self, movie_id: int) -> Optional[Dict]:
-        """Get movie by ID"""
+    def create_movie(self, title: str, description: str, poster_url: str, genre: str) -> Optional[int]:
+        """Add a movie with an empty histogram; returns the new id"""
+        scores = rating_stats.compute_scores([0] * len(rating_stats.STAR_LEVELS))
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute('SELECT * FROM movies WHERE id = ?', (movie_id,))
-        movie = cursor.fetchone()
+        cursor.execute('''
+            INSERT INTO movies (title, description, poster_url, genre, avg_rating, total_reviews,
+                                bayesian_score, wilson_score)
+            VALUES (?, ?, ?, ?, 0, 0, ?, ?)
+        ''', (title, description, poster_url, genre, scores['bayesian_score'], scores['wilson_score']))
+        movie_id = cursor.lastrowid
+        conn.commit()
         conn.close()
-        return dict(movie) if movie else None
+        return movie_id
+    
+    def delete_movie(self, movie_id: int, progress=None) -> Optional[Dict]:
+        """
+        Delete a movie and everything derived from it
+
+        The movie, its rollups (subtracted from the all-movies totals) and
+        its trending counters go in one transaction; its reviews are then
+        deleted in DELETE_BATCH_SIZE chunks, each committed on its own so
+        the write lock is never held for long. progress(reviews_deleted) is
+        called after every chunk. Re-running finishes an interrupted delete.
+        Returns None if there was nothing to delete.
+        """
+        fields = ', '.join(rollups.FIELDS)
+        decrements = ', '.join(f'{f} = {f} - ?' for f in rollups.FIELDS)
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute('DELETE FROM movies WHERE id = ?', (movie_id,))
+            found = cursor.rowcount > 0
+            cursor.execute(f'SELECT day, {fields} FROM daily_rollups WHERE movie_id = ?', (movie_id,))
+            cursor.executemany(
+                f'UPDATE daily_rollups SET {decrements} WHERE movie_id = ? AND day = ?',
+                [(*row[1:], rollups.ALL_MOVIES, row[0]) for row in cursor.fetchall()]
+            )
+            cursor.execute('DELETE FROM daily_rollups WHERE movie_id = ?', (movie_id,))
+            cursor.execute('DELETE FROM movie_activity WHERE movie_id = ?', (movie_id,))
+            conn.commit()
+
+            deleted = 0
+            while True:
+                cursor.execute('''
+                    DELETE FROM feedback WHERE id IN (
+                        SELECT id FROM feedback WHERE movie_id = ? LIMIT ?
+                    )
+                ''', (movie_id, DELETE_BATCH_SIZE))
+                conn.commit()
+                if cursor.rowcount <= 0:
+                    break
+                deleted += cursor.rowcount
+                if progress:
+                    progress(deleted)
+        finally:
+            conn.close()
+
+        if not found and not deleted:
+            return None
+        return {'movie_id': movie_id, 'reviews_deleted': deleted}
     
     def update_movie_rating(self, movie_id: int):
-        """Recalculate and update movie average rating"""
+        """Rebuild one movie's histogram and scores from its feedback"""
         conn = self.get_connection()
         cursor = conn.cursor()
+        self._rebuild_rating_stats(cursor, movie_id)
+        conn.commit()
+        conn.close()
+    
+    def rebuild_rating_stats(self):
+        """Rebuild every movie's histogram and scores (migration/backfill)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        self._rebuild_rating_stats(cursor)
+        conn.commit()
+        conn.close()
+    
+    def _rebuild_rating_stats(self, cursor, movie_id: Optional[int] = None):
+        """Recount histograms from feedback, for one movie or all of them"""
+        if movie_id is None:
+            cursor.execute('SELECT id FROM movies')
+            histograms = {row['id']: [0] * 5 for row in cursor.fetchall()}
+            cursor.execute('''
+                SELECT movie_id, rating, COUNT(*) AS n
+                FROM feedback
+                GROUP BY movie_id, rating
+            ''')
+        else:
+            histograms = {movie_id: [0] * 5}
+            cursor.execute('''
+                SELECT movie_id, rating, COUNT(*) AS n
+                FROM feedback
+                WHERE movie_id = ?
+                GROUP BY rating
+            ''', (movie_id,))
         
-        cursor.execute('''
-            SELECT AVG(rating) as avg_rating, COUNT(*) as total_reviews
-            FROM feedback
-            WHERE movie_id = ?
-        ''', (movie_id,))
-        
-        result = cursor.fetchone()
-        avg_rating = round(result['avg_rating'], 1) if result['avg_rating'] else 0
-        total_reviews = result['total_reviews']
+        for row in cursor.fetchall():
+            if row['movie_id'] in histograms:
+                histograms[row['movie_id']][row['rating'] - 1] = row['n']
         
-        cursor.execute('''
-            UPDATE movies 
-            SET avg_rating = ?, total_reviews = ?
+        for mid, histogram in histograms.items():
+            self._store_rating_stats(cursor, mid, histogram)
+    
+    def _store_rating_stats(self, cursor, movie_id: int, histogram: List[int]):
+        """Write a histogram and the scores derived from it"""
+        scores = rating_stats.compute_scores(histogram)
+        histogram_sql = ', '.join(f'{field} = ?' for field in rating_stats.STAR_FIELDS)
+        cursor.execute(f'''
+            UPDATE movies
+            SET {histogram_sql}, avg_rating = ?, total_reviews = ?,
+                bayesian_score = ?, wilson_score = ?
             WHERE id = ?
-        ''', (avg_rating, total_reviews, movie_id))
-        
-        conn.commit()
-        conn.close()
+        ''', (*histogram, scores['avg_rating'], scores['total_reviews'],
+              scores['bayesian_score'], scores['wilson_score'], movie_id))
+    
+    def _apply_ratings(self, cursor, movie_id: int, ratings: List[int]):
+        """Add new ratings to a movie's histogram and recompute its scores"""
+        cursor.execute(
+            f'SELECT {", ".join(rating_stats.STAR_FIELDS)} FROM movies WHERE id = ?',
+            (movie_id,)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return
+        histogram = rating_stats.histogram_from(dict(row))
+        for rating in ratings:
+            histogram[rating - 1] += 1
+        self._store_rating_stats(cursor, movie_id, histogram)
     
     # ========== FEEDBACK OPERATIONS ==========
     
     def create_feedback(self, movie_id: int, user_email: str, rating: int, 
-                       comment: str, sentiment: str = 'neutral') -> int:
+                       comment: str, sentiment: str = 'neutral',
+                       sentiment_confidence: float = None,
+                       sentiment_disagreement: bool = False) -> int:
         """Create new feedback"""
+        row = (movie_id, user_email, rating, comment, sentiment,
+               sentiment_confidence, int(bool(sentiment_disagreement)))
+        if self.feedback_writer is not None:
+            future = self.feedback_writer.submit(row)
+            return future.result(timeout=FEEDBACK_WRITE_TIMEOUT)
+        
+        # Insert and histogram update share one transaction
         conn = self.get_connection()
         cursor = conn.cursor()
+        feedback_id = self._insert_feedback_batch(cursor, [row])[0]
+        conn.commit()
+        conn.close()
         
-        cursor.execute('''
-            INSERT INTO feedback (movie_id, user_email, rating, comment, sentiment)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (movie_id, user_email, rating, comment, sentiment))
+        return feedback_id
+    
+    def _insert_feedback_batch(self, cursor, rows) -> List[int]:
+        """Insert a group of feedback rows and update each touched movie once"""
+        feedback_ids = []
+        rows_by_movie = {}
+        for row in rows:
+            cursor.execute('''
+                INSERT INTO feedback (movie_id, user_email, rating, comment, sentiment,
+                                      sentiment_confidence, sentiment_disagreement)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', row)
+            feedback_ids.append(cursor.lastrowid)
+            rows_by_movie.setdefault(row[0], []).append(row)
         
-        feedback_id = cursor.lastrowid
+        for movie_id, movie_rows in rows_by_movie.items():
+            self._apply_ratings(cursor, movie_id, [r[2] for r in movie_rows])
+            self._apply_sentiments(cursor, movie_id, movie_rows)
+        
+        self._record_activity(cursor, {mid: len(r) for mid, r in rows_by_movie.items()})
+        self._record_rollups(cursor, rows)
+        
+        return feedback_ids
+    
+    # ========== SENTIMENT OPERATIONS ==========
+    
+    def _apply_sentiments(self, cursor, movie_id: int, rows):
+        """Add feedback rows' stored sentiment to the movie's counters"""
+        increments = ', '.join(f'{f} = {f} + ?' for f in sentiment_stats.FIELDS)
+        cursor.execute(
+            f'UPDATE movies SET {increments} WHERE id = ?',
+            (*sentiment_stats.deltas(rows), movie_id)
+        )
+    
+    def rebuild_sentiment_stats(self):
+        """Recount every movie's sentiment counters from stored labels (backfill)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE movies SET
+                sentiment_positive = (SELECT COUNT(*) FROM feedback f
+                                      WHERE f.movie_id = movies.id AND f.sentiment = 'positive'),
+                sentiment_negative = (SELECT COUNT(*) FROM feedback f
+                                      WHERE f.movie_id = movies.id AND f.sentiment = 'negative'),
+                sentiment_neutral = (SELECT COUNT(*) FROM feedback f
+                                     WHERE f.movie_id = movies.id
+                                     AND (f.sentiment IS NULL OR f.sentiment NOT IN ('positive', 'negative'))),
+                sentiment_scored = (SELECT COUNT(f.sentiment_confidence) FROM feedback f
+                                    WHERE f.movie_id = movies.id),
+                sentiment_confidence_sum = (SELECT COALESCE(SUM(f.sentiment_confidence), 0) FROM feedback f
+                                            WHERE f.movie_id = movies.id),
+                sentiment_disagreements = (SELECT COALESCE(SUM(f.sentiment_disagreement), 0) FROM feedback f
+                                           WHERE f.movie_id = movies.id)
+        ''')
+        conn.commit()
+        conn.close()
+    
+    def get_sentiment_counters(self, movie_id: Optional[int] = None) -> Optional[Dict]:
+        """Summed sentiment counters for one movie, or across all movies"""
+        sums = ', '.join(f'COALESCE(SUM({f}), 0) AS {f}' for f in sentiment_stats.FIELDS)
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        if movie_id is None:
+            cursor.execute(f'SELECT {sums} FROM movies')
+        else:
+            cursor.execute(f'SELECT {sums}, COUNT(*) AS found FROM movies WHERE id = ?', (movie_id,))
+        row = dict(cursor.fetchone())
+        conn.close()
+        if movie_id is not None and not row.pop('found'):
+            return None
+        return row
+    
+    # ========== ROLLUP OPERATIONS ==========
+    
+    def _record_rollups(self, cursor, rows):
+        """Add a group of feedback rows to today's rollups"""
+        fields = ', '.join(rollups.FIELDS)
+        updates = ', '.join(f'{f} = {f} + excluded.{f}' for f in rollups.FIELDS)
+        placeholders = ', '.join('?' for _ in rollups.FIELDS)
+        cursor.executemany(f'''
+            INSERT INTO daily_rollups (movie_id, day, {fields})
+            VALUES (?, ?, {placeholders})
+            ON CONFLICT (movie_id, day) DO UPDATE SET {updates}
+        ''', [(*key, *values) for key, values in rollups.deltas(rows, rollups.day_of()).items()])
+    
+    def rebuild_rollups(self):
+        """Recompute all rollups from the feedback table (backfill)"""
+        aggregates = '''
+            COUNT(*), SUM(rating), SUM(rating >= 4),
+            SUM(sentiment = 'positive'),
+            SUM(sentiment IS NULL OR sentiment NOT IN ('positive', 'negative')),
+            SUM(sentiment = 'negative')
+        '''
+        fields = ', '.join(rollups.FIELDS)
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM daily_rollups')
+        cursor.execute(f'''
+            INSERT INTO daily_rollups (movie_id, day, {fields})
+            SELECT movie_id, date(timestamp), {aggregates}
+            FROM feedback GROUP BY movie_id, date(timestamp)
+        ''')
+        cursor.execute(f'''
+            INSERT INTO daily_rollups (movie_id, day, {fields})
+            SELECT ?, date(timestamp), {aggregates}
+            FROM feedback GROUP BY date(timestamp)
+        ''', (rollups.ALL_MOVIES,))
         conn.commit()
         conn.close()
+    
+    def get_daily_rollups(self, movie_id: int, from_day: str, to_day: str) -> Dict[str, Dict]:
+        """Rollup rows as {day: {field: value}} for one movie (or ALL_MOVIES)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT day, {', '.join(rollups.FIELDS)}
+            FROM daily_rollups
+            WHERE movie_id = ? AND day BETWEEN ? AND ?
+        ''', (movie_id, from_day, to_day))
+        result = {row['day']: dict(row) for row in cursor.fetchall()}
+        conn.close()
+        return result
+    
+    # ========== SEARCH OPERATIONS ==========
+    
+    @staticmethod
+    def _fts_query(text: str) -> str:
+        """
+        Turn free text into a safe FTS5 MATCH expression
+
+        Every word is quoted (so user input can't inject FTS syntax) and the
+        last one is a prefix match for search-as-you-type.
+        """
+        words = re.findall(r'\w+', text)
+        if not words:
+            return ''
+        terms = [f'"{w}"' for w in words]
+        terms[-1] += '*'
+        return ' '.join(terms)
+    
+    @staticmethod
+    def _mark_snippet(snippet: str) -> str:
+        """HTML-escape a snippet, then turn the \\x02/\\x03 hit markers into <mark> tags"""
+        return html.escape(snippet or '').replace('\x02', '<mark>').replace('\x03', '</mark>')
+    
+    def search(self, text: str, kind: str = 'all', limit: int = 20, offset: int = 0) -> Dict:
+        """
+        BM25-ranked full-text search over movies and review comments
+
+        Returns {'movies': [Movie], 'reviews': [dict], 'has_more': {...}};
+        each list holds at most `limit` hits starting at `offset`.
+        """
+        result = {'movies': [], 'reviews': [], 'has_more': {'movies': False, 'reviews': False}}
+        match = self._fts_query(text)
+        if not match:
+            return result
         
-        # Update movie rating
-        self.update_movie_rating(movie_id)
+        conn = self.get_connection()
+        cursor = conn.cursor()
         
-        return feedback_id
+        if kind in ('all', 'movies'):
+            # Title hits outrank genre hits, which outrank description hits
+            cursor.execute(f'''
+                SELECT {Movie.sql_columns('m')}, bm25(movies_fts, 10.0, 3.0, 1.0) AS score
+                FROM movies_fts
+                JOIN movies m ON m.id = movies_fts.rowid
+                WHERE movies_fts MATCH ?
+                ORDER BY score
+                LIMIT ? OFFSET ?
+            ''', (match, limit + 1, offset))
+            rows = [Movie.from_row(row) for row in cursor.fetchall()]
+            result['has_more']['movies'] = len(rows) > limit
+            result['movies'] = rows[:limit]
+        
+        if kind in ('all', 'reviews'):
+            cursor.execute('''
+                SELECT f.id, f.movie_id, m.title AS movie_title, f.user_email, f.rating, f.timestamp,
+                       snippet(feedback_fts, 0, char(2), char(3), '…', 16) AS snippet,
+                       bm25(feedback_fts) AS score
+                FROM feedback_fts
+                JOIN feedback f ON f.id = feedback_fts.rowid
+                JOIN movies m ON m.id = f.movie_id
+                WHERE feedback_fts MATCH ?
+                ORDER BY score
+                LIMIT ? OFFSET ?
+            ''', (match, limit + 1, offset))
+            rows = [dict(row) for row in cursor.fetchall()]
+            for row in rows:
+                row['snippet'] = self._mark_snippet(row['snippet'])
+            result['has_more']['reviews'] = len(rows) > limit
+            result['reviews'] = rows[:limit]
+        
+        conn.close()
+        return result
     
-    def get_feedback_by_movie(self, movie_id: int) -> List[Dict]:
-        """Get all feedback for a movie"""
+    # ========== TRENDING OPERATIONS ==========
+    
+    def _record_activity(self, cursor, counts: Dict[int, int]):
+        """Add review counts to the current bucket of every granularity"""
+        now = time.time()
+        cursor.executemany('''
+            INSERT INTO movie_activity (granularity, bucket_start, movie_id, reviews)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (granularity, bucket_start, movie_id)
+            DO UPDATE SET reviews = reviews + excluded.reviews
+        ''', [
+            (granularity, trending.bucket_start(granularity, now), movie_id, n)
+            for granularity in trending.GRANULARITIES
+            for movie_id, n in counts.items()
+        ])
+        
+        # Drop expired buckets at most once per 5-minute bucket
+        current = trending.bucket_start('5m', now)
+        if self._activity_pruned_bucket != current:
+            self._activity_pruned_bucket = current
+            cursor.executemany(
+                'DELETE FROM movie_activity WHERE granularity = ? AND bucket_start < ?',
+                [(granularity, now - retention)
+                 for granularity, (_, retention) in trending.GRANULARITIES.items()]
+            )
+    
+    def get_activity_counts(self, granularity: str, bucket_starts: List[int]) -> Dict[int, Dict[int, int]]:
+        """Review counts as {bucket_start: {movie_id: reviews}} for the given buckets"""
+        counts = {start: {} for start in bucket_starts}
+        if not bucket_starts:
+            return counts
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute('''
-            SELECT * FROM feedback 
+            SELECT bucket_start, movie_id, reviews
+            FROM movie_activity
+            WHERE granularity = ? AND bucket_start BETWEEN ? AND ?
+        ''', (granularity, min(bucket_starts), max(bucket_starts)))
+        for row in cursor.fetchall():
+            if row['bucket_start'] in counts:
+                counts[row['bucket_start']][row['movie_id']] = row['reviews']
+        conn.close()
+        return counts
+    
+    def get_movie_with_reviews(self, movie_id: int, limit: int = 10):
+        """
+        A movie and its newest `limit` reviews from one joined statement
+
+        Returns (movie, reviews, next position) or (None, [], None).
+        """
+        width = len(Movie.COLUMNS)
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(f'''
+            SELECT {Movie.sql_columns('m')}, {Feedback.sql_columns('f')}
+            FROM movies m LEFT JOIN feedback f ON f.movie_id = m.id
+            WHERE m.id = ?
+            ORDER BY f.timestamp DESC, f.id DESC
+            LIMIT ?
+        ''', (movie_id, limit + 1))
+        rows = cursor.fetchall()
+        conn.close()
+        if not rows:
+            return None, [], None
+        movie = Movie.from_row(rows[0][:width])
+        # LEFT JOIN: a movie without reviews comes back as one all-NULL review
+        feedback = [Feedback.from_row(row[width:]) for row in rows if row[width] is not None]
+        return (movie, *self._review_page(feedback, limit))
+    
+    @staticmethod
+    def _review_page(feedback: List[Feedback], limit: int):
+        """Trim a limit+1 fetch to a page plus the keyset position after it"""
+        if len(feedback) <= limit:
+            return feedback, None
+        last = feedback[limit - 1]
+        return feedback[:limit], {'timestamp': last.timestamp, 'id': last.id}
+    
+    def get_reviews_page(self, movie_id: int, limit: int, cursor: Optional[Dict] = None):
+        """Reviews older than the cursor position, newest first: (reviews, next position)"""
+        return self._feedback_page('movie_id', movie_id, limit, cursor)
+    
+    def get_user_reviews(self, user_email: str, limit: int, cursor: Optional[Dict] = None):
+        """A user's reviews, newest first: (reviews, next position)"""
+        return self._feedback_page('user_email', user_email, limit, cursor)
+    
+    def _feedback_page(self, column: str, value, limit: int, cursor: Optional[Dict]):
+        """Feedback with column = value, keyset paged on (timestamp, id) descending"""
+        params = [value]
+        after = ''
+        if cursor:
+            try:
+                params.extend((cursor['timestamp'], cursor['id']))
+            except KeyError:
+                raise ValueError('Invalid cursor')
+            after = 'AND (timestamp, id) < (?, ?)'
+        conn = self.get_connection()
+        db_cursor = conn.cursor()
+        db_cursor.row_factory = None
+        db_cursor.execute(f'''
+            SELECT {Feedback.sql_columns()} FROM feedback
+            WHERE {column} = ? {after}
+            ORDER BY timestamp DESC, id DESC
+            LIMIT ?
+        ''', (*params, limit + 1))
+        feedback = [Feedback.from_row(row) for row in db_cursor.fetchall()]
+        conn.close()
+        return self._review_page(feedback, limit)
+    
+    def get_reviewed_movie_ids(self, user_email: str) -> Set[int]:
+        """Ids of every movie the user has reviewed (one index-only query)"""
+        conn = self.get_connection()
+        rows = conn.execute('SELECT DISTINCT movie_id FROM feedback WHERE user_email = ?', (user_email,)).fetchall()
+        conn.close()
+        return {row[0] for row in rows}
+    
+    def get_feedback_by_movie(self, movie_id: int) -> List[Feedback]:
+        """Get all feedback for a movie"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT {Feedback.sql_columns()} FROM feedback 
             WHERE movie_id = ? 
             ORDER BY timestamp DESC
         ''', (movie_id,))
-        feedback = [dict(row) for row in cursor.fetchall()]
+        feedback = [Feedback.from_row(row) for row in cursor.fetchall()]
         conn.close()
         return feedback
     
+    # ========== JOB OPERATIONS ==========
+    
+    def save_job(self, job: Dict, expires_at: float):
+        """Insert or replace a job's status; expired jobs are pruned on the way"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('INSERT OR REPLACE INTO jobs (id, data, expires_at) VALUES (?, ?, ?)',
+                       (job['id'], json.dumps(job), expires_at))
+        cursor.execute('DELETE FROM jobs WHERE expires_at < ?', (time.time(),))
+        conn.commit()
+        conn.close()
+    
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT data FROM jobs WHERE id = ?', (job_id,))
+        row = cursor.fetchone()
+        conn.close()
+        return json.loads(row[0]) if row else None
+    
     # ========== ANALYTICS OPERATIONS ==========
     
     def get_analytics(self) -> Dict:
@@ -264,18 +993,17 @@ class SQLiteDatabase:
         cursor.execute('SELECT COUNT(*) as count FROM feedback')
         total_reviews = cursor.fetchone()['count']
         
-        # Average rating across all movies
-        cursor.execute('SELECT AVG(avg_rating) as avg FROM movies')
-        overall_avg = cursor.fetchone()['avg']
-        
-        # Positive feedback percentage
+        # Average rating over all reviews (as rating_stats.catalog_summary)
+        # and positive feedback percentage
         cursor.execute('''
             SELECT 
                 COUNT(*) as total,
+                AVG(rating) as avg,
                 SUM(CASE WHEN rating >= 4 THEN 1 ELSE 0 END) as positive
             FROM feedback
         ''')
         feedback_stats = cursor.fetchone()
+        overall_avg = feedback_stats['avg']
         positive_percentage = (feedback_stats['positive'] / feedback_stats['total'] * 100) if feedback_stats['total'] > 0 else 0
         
         conn.close()
@@ -0,0 +1,48 @@
+"""
+Trending Activity Buckets
+Per-movie review counters in fixed time buckets at three granularities,
+so any trending window is answered from a handful of buckets
+"""
+
+import time
+from typing import List
+
+# granularity -> (bucket length in seconds, retention in seconds)
+GRANULARITIES = {
+    '5m': (300, 2 * 3600),
+    '1h': (3600, 2 * 86400),
+    '1d': (86400, 8 * 86400)
+}
+
+# window -> (granularity, number of buckets read)
+WINDOWS = {
+    '1h': ('5m', 12),
+    '24h': ('1h', 24),
+    '7d': ('1d', 7)
+}
+DEFAULT_WINDOW = '24h'
+
+
+def bucket_start(granularity: str, ts: float = None) -> int:
+    """Start (epoch seconds) of the bucket containing `ts`"""
+    step = GRANULARITIES[granularity][0]
+    ts = time.time() if ts is None else ts
+    return int(ts // step) * step
+
+
+def window_buckets(window: str, ts: float = None) -> List[int]:
+    """Bucket starts covering a window, oldest first, ending with the current bucket"""
+    granularity, count = WINDOWS[window]
+    step = GRANULARITIES[granularity][0]
+    current = bucket_start(granularity, ts)
+    return [current - step * i for i in range(count - 1, -1, -1)]
+
+
+def expires_at(granularity: str, start: int) -> int:
+    """When a bucket falls out of retention (DynamoDB TTL / SQLite pruning)"""
+    return start + GRANULARITIES[granularity][1]
+
+
+def bucket_key(granularity: str, start: int) -> str:
+    """Partition key for a bucket in DynamoDB, e.g. '5m#1700000100'"""
+    return f'{granularity}#{start}'
@@ -0,0 +1,60 @@
+"""
+Gunicorn Configuration
+Pre-forked workers with request threads, sized from config:
+    gunicorn -c gunicorn.conf.py
+
+The app is imported once in the master (preload_app) and each worker
+rebuilds its own clients and threads right after fork. SIGHUP replaces
+the workers gracefully; with preload the code itself is not reloaded, so
+deploy code changes with USR2 + TERM on the old master (or a restart).
+
+Metrics and the response cache are per worker, as with serve.py: /metrics
+shows the answering worker (pid label) and another worker's write reaches
+this worker's cached responses only after RESPONSE_CACHE_TTL seconds.
+The admin stack sampler is started and stopped in every worker through a
+control file in PROFILE_DIR (polled once a second).
+"""
+
+import itertools
+import os
+from config import get_config
+
+app_config = get_config()
+
+wsgi_app = 'wsgi:application'
+bind = f'{app_config.HOST}:{app_config.PORT}'
+
+workers = app_config.WEB_WORKERS
+worker_class = 'gthread'
+threads = app_config.WEB_THREADS
+timeout = app_config.WEB_TIMEOUT
+graceful_timeout = app_config.WEB_GRACEFUL_TIMEOUT
+keepalive = 5
+max_requests = app_config.WEB_MAX_REQUESTS
+max_requests_jitter = app_config.WEB_MAX_REQUESTS // 10
+
+preload_app = True
+
+
+def when_ready(server):
+    # In the master, before the first fork: SQLite schema setup and seeding
+    # run once, and workers inherit the imported libraries
+    from services.worker_service import worker_service
+    print(f"✓ Warmed up in {worker_service.warmup()} ms")
+
+
+def post_fork(server, worker):
+    from services.worker_service import worker_service
+    worker_service.post_fork()
+    # gunicorn closes the worker's heartbeat file before worker_exit runs;
+    # a duplicate lets that hook keep signalling it is alive (see below)
+    worker.heartbeat_fd = os.dup(worker.tmp.fileno())
+
+
+def worker_exit(server, worker):
+    # Background jobs finish before the process goes. Touching the
+    # heartbeat stops the master from killing it as hung after `timeout`;
+    # on a full stop it is still killed after graceful_timeout
+    from services.worker_service import worker_service
+    spinner = itertools.cycle((0, 1))
+    worker_service.wait_for_jobs(lambda: os.fchmod(worker.heartbeat_fd, next(spinner)))
@@ -0,0 +1,69 @@
+"""
+Feedback Model
+Slotted review record produced by both database backends
+"""
+
+from typing import Dict, Optional
+
+
+class Feedback:
+    __slots__ = (
+        'id', 'movie_id', 'user_email', 'rating', 'comment', 'sentiment',
+        'timestamp', 'sentiment_confidence', 'sentiment_disagreement'
+    )
+
+    # SQLite columns in from_row order (same as the attributes)
+    COLUMNS = __slots__
+
+    def __init__(self, id, movie_id: int, user_email: str, rating: int, comment: Optional[str] = None,
+                 sentiment: Optional[str] = None, timestamp: str = '',
+                 sentiment_confidence: Optional[float] = None, sentiment_disagreement: bool = False):
+        self.id = id
+        self.movie_id = movie_id
+        self.user_email = user_email
+        self.rating = rating
+        self.comment = comment
+        self.sentiment = sentiment
+        self.timestamp = timestamp
+        self.sentiment_confidence = sentiment_confidence
+        self.sentiment_disagreement = sentiment_disagreement
+
+    @classmethod
+    def sql_columns(cls, alias: str = '') -> str:
+        prefix = f'{alias}.' if alias else ''
+        return ', '.join(prefix + column for column in cls.COLUMNS)
+
+    @classmethod
+    def from_row(cls, row) -> 'Feedback':
+        """From a SQLite row selected with sql_columns()"""
+        return cls(row[0], row[1], row[2], row[3], row[4], row[5],
+                   row[6] or '', row[7], bool(row[8]))
+
+    @classmethod
+    def from_item(cls, item: Dict) -> 'Feedback':
+        """From a DynamoDB item (numbers arrive as Decimal; the sort key timestamp is the id)"""
+        confidence = item.get('sentiment_confidence')
+        return cls(
+            item.get('timestamp'), int(item['movie_id']), item.get('user_email', ''),
+            int(item.get('rating', 0)), item.get('comment'), item.get('sentiment'),
+            item.get('timestamp', ''),
+            float(confidence) if confidence is not None else None,
+            bool(item.get('sentiment_disagreement', False))
+        )
+
+    @property
+    def name(self) -> str:
+        """Display name: the email username"""
+        return (self.user_email or '').split('@')[0].title()
+
+    def to_dict(self) -> Dict:
+        """API representation of a review"""
+        return {
+            'name': self.name,
+            'rating': self.rating,
+            'comment': self.comment,
+            'timestamp': self.timestamp
+        }
+
+    def __repr__(self):
+        return f'Feedback(id={self.id!r}, movie_id={self.movie_id!r}, rating={self.rating!r})'
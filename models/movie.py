@@ -0,0 +1,90 @@
+"""
+Movie Model
+Slotted record produced by both database backends and serialized once
+by the routes
+"""
+
+from typing import Dict, Optional, Tuple
+from database.rating_stats import STAR_FIELDS, STAR_LEVELS
+
+
+class Movie:
+    # SQLite columns in from_row order; rows are read as plain tuples
+    COLUMNS = (
+        'id', 'title', 'description', 'poster_url', 'genre',
+        'avg_rating', 'total_reviews', 'bayesian_score', 'wilson_score',
+        'created_at'
+    ) + STAR_FIELDS
+
+    __slots__ = (
+        'id', 'title', 'description', 'poster_url', 'genre',
+        'avg_rating', 'total_reviews', 'bayesian_score', 'wilson_score',
+        'histogram', 'created_at'
+    )
+
+    def __init__(self, id: int, title: str, description: Optional[str] = None,
+                 poster_url: Optional[str] = None, genre: Optional[str] = None,
+                 avg_rating: float = 0.0, total_reviews: int = 0,
+                 bayesian_score: float = 0.0, wilson_score: float = 0.0,
+                 histogram: Tuple[int, ...] = (0, 0, 0, 0, 0), created_at: Optional[str] = None):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.poster_url = poster_url
+        self.genre = genre or 'General'
+        self.avg_rating = avg_rating
+        self.total_reviews = total_reviews
+        self.bayesian_score = bayesian_score
+        self.wilson_score = wilson_score
+        self.histogram = histogram
+        self.created_at = created_at
+
+    @classmethod
+    def sql_columns(cls, alias: str = '') -> str:
+        """SELECT list for from_row, e.g. 'm.id, m.title, ...'"""
+        prefix = f'{alias}.' if alias else ''
+        return ', '.join(prefix + column for column in cls.COLUMNS)
+
+    @classmethod
+    def from_row(cls, row) -> 'Movie':
+        """From a SQLite row selected with sql_columns() (positional, no name lookups)"""
+        return cls(row[0], row[1], row[2], row[3], row[4],
+                   row[5], row[6], row[7], row[8], tuple(row[10:15]), row[9])
+
+    @classmethod
+    def from_item(cls, item: Dict) -> 'Movie':
+        """From a DynamoDB item (numbers arrive as Decimal)"""
+        return cls(
+            int(item['movie_id']), item.get('title'), item.get('description'),
+            item.get('poster_url'), item.get('genre'),
+            float(item.get('avg_rating', 0)), int(item.get('total_reviews', 0)),
+            float(item.get('bayesian_score', 0)), float(item.get('wilson_score', 0)),
+            tuple(int(item.get(field, 0)) for field in STAR_FIELDS), item.get('created_at')
+        )
+
+    @property
+    def rating_distribution(self) -> Dict[str, int]:
+        """Histogram as {"1": n, ..., "5": n}"""
+        return {str(star): count for star, count in zip(STAR_LEVELS, self.histogram)}
+
+    def to_dict(self) -> Dict:
+        """
+        API representation used by every movie listing
+
+        'poster' is the stored URL; routes replace it with what the browser
+        should load via poster_service.poster_fields.
+        """
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'poster': self.poster_url,
+            'genre': self.genre,
+            'rating': float(self.avg_rating),
+            'total_reviews': self.total_reviews,
+            'bayesian_score': float(self.bayesian_score),
+            'wilson_score': float(self.wilson_score)
+        }
+
+    def __repr__(self):
+        return f'Movie(id={self.id!r}, title={self.title!r})'
@@ -0,0 +1,49 @@
+"""
+User Model
+Slotted user record; password/salt are only set on SQLite, where the
+app does its own password checks
+"""
+
+from typing import Dict, Optional
+
+
+class User:
+    __slots__ = ('email', 'name', 'role', 'password', 'salt', 'created_at')
+
+    # SQLite columns in from_row order (same as the attributes)
+    COLUMNS = __slots__
+
+    def __init__(self, email: str, name: Optional[str] = None, role: str = 'viewer',
+                 password: Optional[str] = None, salt: Optional[str] = None,
+                 created_at: Optional[str] = None):
+        self.email = email
+        self.name = name or 'User'
+        self.role = role or 'viewer'
+        self.password = password
+        self.salt = salt
+        self.created_at = created_at
+
+    @classmethod
+    def sql_columns(cls) -> str:
+        return ', '.join(cls.COLUMNS)
+
+    @classmethod
+    def from_row(cls, row) -> 'User':
+        """From a SQLite row selected with sql_columns()"""
+        return cls(*row)
+
+    @classmethod
+    def from_item(cls, item: Dict) -> 'User':
+        """From a DynamoDB item"""
+        return cls(item['user_email'], item.get('name'), item.get('role'), created_at=item.get('created_at'))
+
+    @property
+    def has_password(self) -> bool:
+        return self.password is not None and self.salt is not None
+
+    def to_dict(self) -> Dict:
+        """Session/API representation (never includes credentials)"""
+        return {'email': self.email, 'name': self.name, 'role': self.role}
+
+    def __repr__(self):
+        return f'User(email={self.email!r}, role={self.role!r})'
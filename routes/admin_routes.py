@@ -1,24 +1,27 @@
 """
 Admin Routes
 Admin-only endpoints for managing movies
-SQLite enabled locally, write operations disabled on AWS
+All endpoints work on both backends (SQLite locally, DynamoDB on AWS)
 """
 
-from config import get_config
-config = get_config()
-
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, send_from_directory
 from services.db_service import db_service
+from services.profiler_service import profiler_service
+from services.poster_service import poster_service
+from services.job_service import job_service
+from database import pagination
 import os
-from werkzeug.utils import secure_filename
+import re
 
 admin_bp = Blueprint('admin_api', __name__)
 
 # Upload configuration
-UPLOAD_FOLDER = 'static/images/uploads'
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
+# Background job ids are UUID4 hex strings
+JOB_ID_RE = re.compile(r'[0-9a-f]{32}')
+
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -51,17 +54,14 @@ def upload_poster():
 
     if file and allowed_file(file.filename):
         try:
-            os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
-            filename = secure_filename(file.filename)
-            import time
-            filename = f"{int(time.time())}_{filename}"
-            filepath = os.path.join(UPLOAD_FOLDER, filename)
-            file.save(filepath)
+            # Stored under its content hash; resized variants are built in
+            # the background and the response lists their srcset URLs
+            extension = file.filename.rsplit('.', 1)[1].lower()
+            poster = poster_service.store(file.read(), extension)
 
             return jsonify({
                 'success': True,
-                'url': f'/static/images/uploads/{filename}',
+                **poster,
                 'message': 'Image uploaded successfully'
             }), 200
 
@@ -72,47 +72,72 @@ def upload_poster():
     return jsonify({'success': False, 'error': 'Invalid file type'}), 400
 
 
+# ===================== OVERVIEW =====================
+
+@admin_bp.route('/api/admin/overview', methods=['GET'])
+def get_overview():
+    """
+    Admin dashboard data in one round trip
+
+    Query params:
+        users: newest users to include (default 10, max 200)
+
+    Returns:
+    {
+        "success": true,
+        "movies": [...],
+        "users": {"total": 120, "recent": [...], "next_cursor": "..."},
+        "analytics": {"total_movies": 4, "total_reviews": 20, "overall_avg_rating": 4.1,
+                      "positive_percentage": 75.0, "sentiment": {...}}
+    }
+    """
+
+    if 'user_email' not in session or session.get('user_role') != 'admin':
+        return jsonify({'success': False, 'error': 'Admin access required'}), 403
+
+    try:
+        user_limit = min(max(request.args.get('users', 10, type=int), 1), pagination.MAX_PAGE_SIZE)
+        overview = db_service.get_admin_overview(user_limit)
+
+        return jsonify({
+            'success': True,
+            'movies': [dict(movie.to_dict(), **poster_service.poster_fields(movie)) for movie in overview['movies']],
+            'users': {
+                'total': overview['total_users'],
+                'recent': [dict(user.to_dict(), created_at=user.created_at) for user in overview['users']],
+                'next_cursor': overview['users_next_cursor']
+            },
+            'analytics': overview['analytics']
+        }), 200
+
+    except Exception as e:
+        print(f"Error building admin overview: {e}")
+        return jsonify({'success': False, 'error': 'Failed to load overview'}), 500
+
+
 # ===================== ADD MOVIE =====================
 
 @admin_bp.route('/api/admin/movies', methods=['POST'])
 def add_movie():
-    """Add new movie (SQLite only)"""
+    """Add new movie"""
 
     if 'user_email' not in session or session.get('user_role') != 'admin':
         return jsonify({'success': False, 'error': 'Admin access required'}), 403
 
-    # 🚫 Disable write ops on AWS
-    if config.ENV_MODE == "aws":
-        return jsonify({
-            "success": False,
-            "error": "Admin write operations disabled in AWS demo"
-        }), 403
-
     try:
         data = request.get_json()
 
         if not data.get('title') or not data.get('description'):
             return jsonify({'success': False, 'error': 'Title and description are required'}), 400
 
-        conn = db_service.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            '''
-            INSERT INTO movies (title, description, poster_url, genre, avg_rating, total_reviews)
-            VALUES (?, ?, ?, ?, 0, 0)
-            ''',
-            (
-                data['title'],
-                data['description'],
-                data.get('poster_url', 'https://via.placeholder.com/400x600'),
-                data.get('genre', 'General')
-            )
+        movie_id = db_service.create_movie(
+            data['title'],
+            data['description'],
+            data.get('poster_url', 'https://via.placeholder.com/400x600'),
+            data.get('genre', 'General')
         )
-
-        movie_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        if movie_id is None:
+            return jsonify({'success': False, 'error': 'Failed to add movie'}), 500
 
         return jsonify({
             'success': True,
@@ -129,30 +154,33 @@ def add_movie():
 
 @admin_bp.route('/api/admin/movies/<int:movie_id>', methods=['DELETE'])
 def delete_movie(movie_id):
-    """Delete movie (SQLite only)"""
+    """
+    Delete movie with all its reviews
+
+    Query params:
+        background: 'true' to run as a job and return 202 with its status URL
+                    (for movies with very many reviews)
+    """
 
     if 'user_email' not in session or session.get('user_role') != 'admin':
         return jsonify({'success': False, 'error': 'Admin access required'}), 403
 
-    # 🚫 Disable write ops on AWS
-    if config.ENV_MODE == "aws":
-        return jsonify({
-            "success": False,
-            "error": "Admin write operations disabled in AWS demo"
-        }), 403
-
     try:
-        conn = db_service.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('DELETE FROM feedback WHERE movie_id = ?', (movie_id,))
-        cursor.execute('DELETE FROM movies WHERE id = ?', (movie_id,))
+        if request.args.get('background', 'false').lower() == 'true':
+            job = job_service.start('delete_movie', db_service.delete_movie, movie_id=movie_id)
+            return jsonify({
+                'success': True,
+                'job': job,
+                'status_url': f"/api/admin/jobs/{job['id']}"
+            }), 202
 
-        conn.commit()
-        conn.close()
+        result = db_service.delete_movie(movie_id)
+        if result is None:
+            return jsonify({'success': False, 'error': 'Movie not found'}), 404
 
         return jsonify({
             'success': True,
+            'reviews_deleted': result['reviews_deleted'],
             'message': 'Movie deleted successfully'
         }), 200
 
@@ -161,38 +189,145 @@ def delete_movie(movie_id):
         return jsonify({'success': False, 'error': 'Failed to delete movie'}), 500
 
 
+# ===================== JOBS =====================
+
+@admin_bp.route('/api/admin/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status and progress of a background admin job (from any worker)"""
+
+    if 'user_email' not in session or session.get('user_role') != 'admin':
+        return jsonify({'success': False, 'error': 'Admin access required'}), 403
+
+    job = job_service.get(job_id) if JOB_ID_RE.fullmatch(job_id) else None
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job}), 200
+
+
 # ===================== GET ALL USERS =====================
 
 @admin_bp.route('/api/admin/users', methods=['GET'])
 def get_all_users():
-    """Get all users (SQLite only)"""
+    """
+    One page of users, newest first
+
+    Query params:
+        limit: page size (default 50, max 200)
+        cursor: next_cursor from the previous page
+        q: email prefix
+        role: 'admin' or 'viewer'
+
+    The first page (no cursor) also carries the total user count.
+    """
 
     if 'user_email' not in session or session.get('user_role') != 'admin':
         return jsonify({'success': False, 'error': 'Admin access required'}), 403
 
-    # 🚫 Disable on AWS (no SQL)
-    if config.ENV_MODE == "aws":
-        return jsonify({
-            "success": False,
-            "error": "Admin user listing disabled in AWS demo"
-        }), 403
+    limit = min(max(request.args.get('limit', pagination.DEFAULT_PAGE_SIZE, type=int), 1), pagination.MAX_PAGE_SIZE)
+    cursor = request.args.get('cursor')
+    email_prefix = request.args.get('q', '').strip().lower() or None
+    role = request.args.get('role') or None
+    if role not in (None, 'admin', 'viewer'):
+        return jsonify({'success': False, 'error': f"Invalid role: {role}"}), 400
 
     try:
-        conn = db_service.db.get_connection()
-        cursor = conn.cursor()
+        page = db_service.list_users(limit, cursor, email_prefix, role)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
 
-        cursor.execute(
-            'SELECT email, name, role, created_at FROM users ORDER BY created_at DESC'
-        )
-        users = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-
-        return jsonify({
+    try:
+        result = {
             'success': True,
-            'users': users,
-            'count': len(users)
-        }), 200
+            'users': [dict(user.to_dict(), created_at=user.created_at) for user in page['users']],
+            'count': len(page['users']),
+            'next_cursor': page['next_cursor']
+        }
+        if not cursor:
+            result['total'] = db_service.count_users()
+        return jsonify(result), 200
 
     except Exception as e:
         print(f"Error getting users: {e}")
         return jsonify({'success': False, 'error': 'Failed to fetch users'}), 500
+
+
+# ===================== PROFILING =====================
+
+@admin_bp.route('/api/admin/profiles', methods=['GET'])
+def list_profiles():
+    """List captured request profiles and sampler dumps"""
+
+    if 'user_email' not in session or session.get('user_role') != 'admin':
+        return jsonify({'success': False, 'error': 'Admin access required'}), 403
+
+    return jsonify({
+        'success': True,
+        'profiles': profiler_service.list_profiles(),
+        'sampler': profiler_service.sampler_status()
+    }), 200
+
+
+@admin_bp.route('/api/admin/profiles/<path:name>', methods=['GET'])
+def download_profile(name):
+    """Download a .pstats or .collapsed profile file"""
+
+    if 'user_email' not in session or session.get('user_role') != 'admin':
+        return jsonify({'success': False, 'error': 'Admin access required'}), 403
+
+    if not name.endswith(('.pstats', '.collapsed')):
+        return jsonify({'success': False, 'error': 'Profile not found'}), 404
+
+    # send_from_directory rejects paths escaping the profile directory
+    return send_from_directory(
+        os.path.abspath(profiler_service.profile_dir), name, as_attachment=True
+    )
+
+
+@admin_bp.route('/api/admin/profiler/sampler', methods=['POST'])
+def start_sampler():
+    """
+    Start the stack sampler in every worker process
+
+    Optional JSON: {"interval_ms": 10, "duration": 30}
+    """
+
+    if 'user_email' not in session or session.get('user_role') != 'admin':
+        return jsonify({'success': False, 'error': 'Admin access required'}), 403
+
+    data = request.get_json(silent=True) or {}
+    try:
+        interval_ms = int(data['interval_ms']) if data.get('interval_ms') else None
+        duration = float(data['duration']) if data.get('duration') else None
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'Invalid interval or duration'}), 400
+
+    if interval_ms is not None and interval_ms < 1:
+        return jsonify({'success': False, 'error': 'Interval must be at least 1 ms'}), 400
+
+    if not profiler_service.start_sampler(interval_ms, duration):
+        return jsonify({'success': False, 'error': 'Sampler already running'}), 409
+
+    return jsonify({
+        'success': True,
+        'sampler': profiler_service.sampler_status()
+    }), 200
+
+
+@admin_bp.route('/api/admin/profiler/sampler', methods=['DELETE'])
+def stop_sampler():
+    """
+    Stop the stack sampler in every worker; each writes its collapsed
+    stacks (profile is this worker's file, the rest follow within a second)
+    """
+
+    if 'user_email' not in session or session.get('user_role') != 'admin':
+        return jsonify({'success': False, 'error': 'Admin access required'}), 403
+
+    stopped, name = profiler_service.stop_sampler()
+    if not stopped:
+        return jsonify({'success': False, 'error': 'Sampler not running'}), 409
+
+    return jsonify({
+        'success': True,
+        'profile': name
+    }), 200
@@ -3,8 +3,11 @@ Analytics Routes
 Admin-only analytics API
 """
 
-from flask import Blueprint, jsonify, session
+from datetime import date, datetime, timedelta
+from flask import Blueprint, jsonify, request, session
 from services.db_service import db_service
+from services.poster_service import poster_service
+from database import rollups
 
 analytics_bp = Blueprint('analytics', __name__)
 
@@ -22,16 +25,17 @@ def get_analytics():
             }), 403
 
         analytics = db_service.get_analytics()
+        analytics['sentiment'] = db_service.get_sentiment_summary()
         movies = db_service.get_all_movies()
 
         formatted_movies = []
         for m in movies:
             formatted_movies.append({
-                'id': m.get('movie_id'),
-                'title': m.get('title'),
-                'rating': float(m.get('avg_rating', 0)),
-                'total_reviews': m.get('total_reviews', 0),
-                'poster': m.get('poster_url', '/static/images/default-poster.jpg')
+                'id': m.id,
+                'title': m.title,
+                'rating': float(m.avg_rating),
+                'total_reviews': m.total_reviews,
+                'poster': poster_service.display_url(m.id, m.poster_url) or f'/posters/{m.id}'
             })
 
         return jsonify({
@@ -43,3 +47,85 @@ def get_analytics():
     except Exception as e:
         print("Analytics route error:", e)
         return jsonify({'success': False, 'error': 'Failed to fetch analytics'}), 500
+
+
+@analytics_bp.route('/api/analytics/timeseries', methods=['GET'])
+def get_timeseries():
+    """
+    Time-range analytics from daily rollups
+
+    Query params:
+        from, to: YYYY-MM-DD (default: last 30 days)
+        movie_id: restrict to one movie (default: all movies)
+        granularity: 'day' (default), 'week' or 'month'
+    """
+    try:
+        if 'user_email' not in session:
+            return jsonify({'success': False, 'error': 'Not logged in'}), 401
+
+        if session.get('user_role') != 'admin':
+            return jsonify({
+                'success': False,
+                'error': 'Access denied. Admin privileges required.'
+            }), 403
+
+        try:
+            end = date.fromisoformat(request.args['to']) if request.args.get('to') else datetime.utcnow().date()
+            start = date.fromisoformat(request.args['from']) if request.args.get('from') else end - timedelta(days=29)
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Dates must be YYYY-MM-DD'}), 400
+
+        if start > end:
+            return jsonify({'success': False, 'error': "'from' must not be after 'to'"}), 400
+
+        if (end - start).days >= rollups.MAX_RANGE_DAYS:
+            return jsonify({'success': False, 'error': f'Range limited to {rollups.MAX_RANGE_DAYS} days'}), 400
+
+        granularity = request.args.get('granularity', 'day')
+        if granularity not in rollups.GRANULARITIES:
+            return jsonify({'success': False, 'error': f"Invalid granularity: {granularity}"}), 400
+
+        movie_id = request.args.get('movie_id', type=int)
+
+        points = db_service.get_timeseries(start, end, movie_id, granularity)
+
+        return jsonify({
+            'success': True,
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'movie_id': movie_id,
+            'granularity': granularity,
+            'points': points
+        }), 200
+
+    except Exception as e:
+        print("Timeseries route error:", e)
+        return jsonify({'success': False, 'error': 'Failed to fetch timeseries'}), 500
+
+
+@analytics_bp.route('/api/analytics/movies/<int:movie_id>/sentiment', methods=['GET'])
+def get_movie_sentiment(movie_id):
+    """Sentiment distribution, disagreement rate and confidence for one movie"""
+    try:
+        if 'user_email' not in session:
+            return jsonify({'success': False, 'error': 'Not logged in'}), 401
+
+        if session.get('user_role') != 'admin':
+            return jsonify({
+                'success': False,
+                'error': 'Access denied. Admin privileges required.'
+            }), 403
+
+        summary = db_service.get_sentiment_summary(movie_id)
+        if summary is None:
+            return jsonify({'success': False, 'error': 'Movie not found'}), 404
+
+        return jsonify({
+            'success': True,
+            'movie_id': movie_id,
+            'sentiment': summary
+        }), 200
+
+    except Exception as e:
+        print("Movie sentiment route error:", e)
+        return jsonify({'success': False, 'error': 'Failed to fetch sentiment'}), 500
@@ -0,0 +1,40 @@
+"""
+Asset Routes
+Serves fingerprinted static files with immutable caching and
+precompressed gzip/brotli bodies
+"""
+
+from flask import Blueprint, abort, current_app, request
+from services.asset_service import asset_manifest
+from services.response_service import negotiate_encoding
+
+asset_bp = Blueprint('assets', __name__)
+
+# The URL changes whenever the content does
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+@asset_bp.route('/assets/<path:name>', methods=['GET'])
+def get_asset(name):
+    """Fingerprinted static file (css/main.<hash>.css) in the best accepted encoding"""
+    asset = asset_manifest.lookup(name)
+    if asset is None:
+        abort(404)
+
+    response = current_app.response_class(mimetype=asset.mimetype)
+    # Weak: the same tag covers the identity and compressed bodies
+    response.set_etag(asset.etag, weak=True)
+    response.headers['Cache-Control'] = IMMUTABLE
+    if asset.variants:
+        response.vary.add('Accept-Encoding')
+    if request.if_none_match.contains_weak(asset.etag):
+        response.status_code = 304
+        return response
+
+    encoding = negotiate_encoding() if asset.variants else None
+    if encoding in asset.variants:
+        response.set_data(asset.variants[encoding])
+        response.headers['Content-Encoding'] = encoding
+    else:
+        response.set_data(asset.body)
+    return response
@@ -1,13 +1,17 @@
 """
 Feedback Routes
-Handles feedback submission
+Handles feedback submission and the logged-in user's review history
 """
 
 from flask import Blueprint, request, jsonify, session
 from services.db_service import db_service
 from services.notification_service import notification_service
 from services.sentiment_service import analyze_sentiment
+from services.poster_service import poster_service
+from database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from config import get_config
 feedback_bp = Blueprint('feedback', __name__)
+MAX_COMMENT_LENGTH = get_config().MAX_COMMENT_LENGTH
 
 @feedback_bp.route('/api/feedback', methods=['POST'])
 def submit_feedback():
@@ -49,22 +53,30 @@ def submit_feedback():
         if not isinstance(rating, int) or rating < 1 or rating > 5:
             return jsonify({'success': False, 'error': 'Rating must be between 1 and 5'}), 400
         
-        # Check if movie exists
-        movie = db_service.get_movie_by_id(movie_id)
-        if not movie:
-            return jsonify({'success': False, 'error': 'Movie not found'}), 404
+        if len(comment) > MAX_COMMENT_LENGTH:
+            return jsonify({'success': False, 'error': f'Comment must be at most {MAX_COMMENT_LENGTH} characters'}), 400
+        
+        # Look the movie up while the comment is scored
+        movie_lookup = db_service.run_async(lambda: db_service.get_movie_by_id(movie_id))
         
         # Simple sentiment analysis (basic)
         sentiment_result = analyze_sentiment(comment, rating, method='vader')
         sentiment = sentiment_result['sentiment']
+        
+        # Check if movie exists
+        movie = movie_lookup.result()
+        if not movie:
+            return jsonify({'success': False, 'error': 'Movie not found'}), 404
 
-        # Save feedback
+        # Save feedback (confidence/disagreement stored so analytics never re-score)
         feedback_id = db_service.create_feedback(
             movie_id=movie_id,
             user_email=email,
             rating=rating,
             comment=comment,
-            sentiment=sentiment
+            sentiment=sentiment,
+            sentiment_confidence=sentiment_result.get('confidence'),
+            sentiment_disagreement=sentiment_result.get('disagreement', False)
         )
         
         if not feedback_id:
@@ -72,7 +84,7 @@ def submit_feedback():
         
         # Send SNS notification (AWS only, mocked in local)
         notification_service.send_feedback_notification(
-            movie_title=movie.get('title'),
+            movie_title=movie.title,
             user_email=email,
             rating=rating,
             comment=comment
@@ -86,4 +98,90 @@ def submit_feedback():
         
     except Exception as e:
         print(f"Error submitting feedback: {e}")
-        return jsonify({'success': False, 'error': 'Failed to submit feedback'}), 500
\ No newline at end of file
+        return jsonify({'success': False, 'error': 'Failed to submit feedback'}), 500
+
+
+@feedback_bp.route('/api/me/reviews', methods=['GET'])
+def get_my_reviews():
+    """
+    The logged-in user's reviews, newest first
+    
+    Query params:
+        limit: page size (default 50, max 200)
+        cursor: next_cursor of the previous page
+    
+    Returns:
+    {
+        "success": true,
+        "reviews": [
+            {
+                "movie": {"id": 1, "title": "...", "poster": "..."},
+                "rating": 5,
+                "comment": "...",
+                "sentiment": "positive",
+                "timestamp": "..."
+            }
+        ],
+        "next_cursor": "..." or null
+    }
+    """
+    try:
+        if 'user_email' not in session:
+            return jsonify({'success': False, 'error': 'Not logged in'}), 401
+        
+        limit = min(max(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+        try:
+            page = db_service.get_user_reviews(session['user_email'], limit, request.args.get('cursor') or None)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        # Titles for the whole page in one batch read
+        reviews = page['reviews']
+        movies = {movie.id: movie for movie in db_service.get_movies_by_ids([f.movie_id for f in reviews])}
+        
+        formatted_reviews = []
+        for f in reviews:
+            movie = movies.get(f.movie_id)
+            formatted_reviews.append({
+                'movie': {
+                    'id': f.movie_id,
+                    'title': movie.title if movie else None,
+                    'poster': poster_service.display_url(f.movie_id, movie.poster_url) if movie else None
+                },
+                'rating': f.rating,
+                'comment': f.comment,
+                'sentiment': f.sentiment,
+                'timestamp': f.timestamp
+            })
+        
+        return jsonify({
+            'success': True,
+            'reviews': formatted_reviews,
+            'next_cursor': page['next_cursor']
+        }), 200
+        
+    except Exception as e:
+        print(f"Error getting user reviews: {e}")
+        return jsonify({'success': False, 'error': 'Failed to fetch reviews'}), 500
+
+
+@feedback_bp.route('/api/me/reviewed', methods=['GET'])
+def get_my_reviewed_movies():
+    """
+    Ids of the movies the logged-in user has reviewed, for "already
+    reviewed" flags on the catalog (kept out of /api/movies, whose
+    cached response is shared by every user)
+    
+    Returns:
+    {
+        "success": true,
+        "movie_ids": [1, 4]
+    }
+    """
+    if 'user_email' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'}), 401
+    
+    movie_ids = db_service.get_reviewed_movie_ids(session['user_email'])
+    response = jsonify({'success': True, 'movie_ids': sorted(movie_ids)})
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response, 200
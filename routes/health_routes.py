@@ -0,0 +1,27 @@
+"""
+Health Routes
+Liveness and readiness probes for load balancers and process managers
+"""
+
+from flask import Blueprint, jsonify
+from services.worker_service import worker_service
+
+health_bp = Blueprint('health', __name__)
+
+
+@health_bp.route('/healthz', methods=['GET'])
+def liveness():
+    """The worker process is up and serving requests"""
+    return jsonify({'status': 'ok', 'pid': worker_service.pid}), 200
+
+
+@health_bp.route('/ready', methods=['GET'])
+def readiness():
+    """
+    Whether this worker should get traffic: 200 when it can reach its
+    database, 503 while draining for shutdown/reload or when it can't
+    """
+    status = worker_service.readiness()
+    response = jsonify(status)
+    response.headers['Cache-Control'] = 'no-store'
+    return response, 200 if status['ready'] else 503
@@ -0,0 +1,21 @@
+"""
+Metrics Routes
+Prometheus-style text endpoint for scraping
+"""
+
+from flask import Blueprint, Response, jsonify
+from services.metrics_service import metrics_service
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Expose latency histograms, gauges and counters in text format"""
+    if not metrics_service.enabled:
+        return jsonify({'success': False, 'error': 'Metrics disabled'}), 404
+
+    return Response(
+        metrics_service.render(),
+        mimetype='text/plain; version=0.0.4; charset=utf-8'
+    )
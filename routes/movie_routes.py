@@ -3,15 +3,32 @@ Movie Routes
 Handles movie data endpoints
 """
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
+from config import get_config
 from services.db_service import db_service
+from services.poster_service import poster_service
+from services.response_service import cached_response
+from database.rating_stats import SORT_FIELDS, DEFAULT_SORT
+from database.pagination import MAX_PAGE_SIZE
+from database.trending import WINDOWS, DEFAULT_WINDOW
 
 movie_bp = Blueprint('movie', __name__)
 
+# Reviews included with a movie; older ones via /api/movies/<id>/reviews
+RECENT_REVIEWS = get_config().RECENT_REVIEWS
+MAX_REVIEWS_PAGE = 50
+
 @movie_bp.route('/api/movies', methods=['GET'])
+@cached_response
 def get_movies():
     """
-    Get all movies
+    Get movies, ranked
+    
+    Query params:
+        sort: 'bayesian' (default), 'wilson' or 'rating' (raw average)
+        genre: only movies of this genre
+        limit: page size (max 200); without it (or cursor) the whole catalog
+        cursor: next_cursor of the previous page
     
     Returns:
     {
@@ -21,43 +38,100 @@ def get_movies():
                 "id": 1,
                 "title": "Movie Title",
                 "description": "...",
-                "poster_url": "...",
-                "avg_rating": 4.5,
-                "total_reviews": 10
+                "poster": "...",
+                "genre": "Drama",
+                "rating": 4.5,
+                "total_reviews": 10,
+                "bayesian_score": 4.1,
+                "wilson_score": 0.72
             }
+        ],
+        "next_cursor": "..." or null
+    }
+    """
+    try:
+        sort = request.args.get('sort', DEFAULT_SORT)
+        if sort not in SORT_FIELDS:
+            return jsonify({'success': False, 'error': f"Invalid sort: {sort}"}), 400
+        genre = request.args.get('genre', '').strip() or None
+        cursor = request.args.get('cursor') or None
+        limit = request.args.get('limit', type=int)
+        
+        if limit is None and cursor is None and genre is None:
+            movies, next_cursor = db_service.get_all_movies(sort), None
+        else:
+            if limit is not None:
+                limit = min(max(limit, 1), MAX_PAGE_SIZE)
+            elif cursor is not None:
+                limit = MAX_PAGE_SIZE
+            try:
+                page = db_service.list_movies(sort, genre, limit, cursor)
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+            movies, next_cursor = page['movies'], page['next_cursor']
+        
+        return jsonify({
+            'success': True,
+            'movies': [dict(movie.to_dict(), **poster_service.poster_fields(movie)) for movie in movies],
+            'next_cursor': next_cursor
+        }), 200
+        
+    except Exception as e:
+        print(f"Error getting movies: {e}")
+        return jsonify({'success': False, 'error': 'Failed to fetch movies'}), 500
+
+
+@movie_bp.route('/api/movies/trending', methods=['GET'])
+def get_trending_movies():
+    """
+    Get movies with the most reviews in a recent window
+    
+    Query params:
+        window: '1h', '24h' (default) or '7d'
+        limit: max movies (default 10, max 50)
+    
+    Returns:
+    {
+        "success": true,
+        "window": "24h",
+        "movies": [
+            {"id": 1, "title": "...", "poster": "...", "rating": 4.5, "recent_reviews": 12}
         ]
     }
     """
     try:
-        movies = db_service.get_all_movies()
+        window = request.args.get('window', DEFAULT_WINDOW)
+        if window not in WINDOWS:
+            return jsonify({'success': False, 'error': f"Invalid window: {window}"}), 400
+        
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+        movies = db_service.get_trending_movies(window, limit)
         
-        # Convert for frontend (handle both SQLite and DynamoDB formats)
         formatted_movies = []
-        for movie in movies:
-            formatted_movies.append({
-                'id': movie.get('id') or movie.get('movie_id'),
-                'title': movie.get('title'),
-                'description': movie.get('description'),
-                'poster': movie.get('poster_url'),
-                'genre': movie.get('genre', 'General'),
-                'rating': float(movie.get('avg_rating', 0)),
-                'total_reviews': movie.get('total_reviews', 0)
-            })
+        for movie, recent_reviews in movies:
+            data = dict(movie.to_dict(), **poster_service.poster_fields(movie))
+            data['recent_reviews'] = recent_reviews
+            formatted_movies.append(data)
         
         return jsonify({
             'success': True,
+            'window': window,
             'movies': formatted_movies
         }), 200
         
     except Exception as e:
-        print(f"Error getting movies: {e}")
-        return jsonify({'success': False, 'error': 'Failed to fetch movies'}), 500
+        print(f"Error getting trending movies: {e}")
+        return jsonify({'success': False, 'error': 'Failed to fetch trending movies'}), 500
 
 
 @movie_bp.route('/api/movies/<int:movie_id>', methods=['GET'])
+@cached_response
 def get_movie(movie_id):
     """
-    Get movie by ID with reviews
+    Get movie by ID with its newest reviews
+    
+    reviews_next_cursor is set when there are older reviews
+    (GET /api/movies/<id>/reviews?cursor=...).
     
     Returns:
     {
@@ -69,41 +143,23 @@ def get_movie(movie_id):
             "poster": "...",
             "rating": 4.5,
             "total_reviews": 10,
-            "reviews": [...]
+            "rating_distribution": {"1": 0, "2": 1, "3": 2, "4": 3, "5": 4},
+            "reviews": [...],
+            "reviews_next_cursor": "..."
         }
     }
     """
     try:
-        # Get movie
-        movie = db_service.get_movie_by_id(movie_id)
+        # Movie and its newest reviews in one backend round trip
+        movie, feedback, next_cursor = db_service.get_movie_with_reviews(movie_id, RECENT_REVIEWS)
         
         if not movie:
             return jsonify({'success': False, 'error': 'Movie not found'}), 404
         
-        # Get feedback/reviews
-        feedback = db_service.get_feedback_by_movie(movie_id)
-        
-        # Format reviews
-        reviews = []
-        for f in feedback:
-            reviews.append({
-                'name': f.get('user_email', '').split('@')[0].title(),  # Use email username as name
-                'rating': f.get('rating'),
-                'comment': f.get('comment'),
-                'timestamp': f.get('timestamp', '')
-            })
-        
-        # Format movie data
-        formatted_movie = {
-            'id': movie.get('id') or movie.get('movie_id'),
-            'title': movie.get('title'),
-            'description': movie.get('description'),
-            'poster': movie.get('poster_url'),
-            'genre': movie.get('genre', 'General'),
-            'rating': float(movie.get('avg_rating', 0)),
-            'total_reviews': movie.get('total_reviews', 0),
-            'reviews': reviews
-        }
+        formatted_movie = dict(movie.to_dict(), **poster_service.poster_fields(movie))
+        formatted_movie['rating_distribution'] = movie.rating_distribution
+        formatted_movie['reviews'] = [f.to_dict() for f in feedback]
+        formatted_movie['reviews_next_cursor'] = next_cursor
         
         return jsonify({
             'success': True,
@@ -112,4 +168,37 @@ def get_movie(movie_id):
         
     except Exception as e:
         print(f"Error getting movie: {e}")
-        return jsonify({'success': False, 'error': 'Failed to fetch movie'}), 500
\ No newline at end of file
+        return jsonify({'success': False, 'error': 'Failed to fetch movie'}), 500
+
+
+@movie_bp.route('/api/movies/<int:movie_id>/reviews', methods=['GET'])
+@cached_response
+def get_movie_reviews(movie_id):
+    """
+    Older reviews of a movie, newest first
+    
+    Query params:
+        cursor: reviews_next_cursor / next_cursor from the previous page
+        limit: page size (default RECENT_REVIEWS, max 50)
+    
+    Returns:
+    {
+        "success": true,
+        "reviews": [...],
+        "next_cursor": "..." (null on the last page)
+    }
+    """
+    limit = min(max(request.args.get('limit', RECENT_REVIEWS, type=int), 1), MAX_REVIEWS_PAGE)
+    try:
+        reviews, next_cursor = db_service.get_reviews_page(movie_id, limit, request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        print(f"Error getting reviews: {e}")
+        return jsonify({'success': False, 'error': 'Failed to fetch reviews'}), 500
+    
+    return jsonify({
+        'success': True,
+        'reviews': [f.to_dict() for f in reviews],
+        'next_cursor': next_cursor
+    }), 200
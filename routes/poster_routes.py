@@ -0,0 +1,95 @@
+"""
+Poster Routes
+Serves uploaded posters and their resized variants with long-lived caching,
+and remote posters through the caching proxy
+"""
+
+import os
+from flask import Blueprint, send_file, abort, redirect
+from services.db_service import db_service
+from services.poster_service import poster_service, ORIGINAL_RE, VARIANT_RE, DEFAULT_POSTER_PATH
+from services.poster_proxy_service import poster_proxy
+
+poster_bp = Blueprint('posters', __name__)
+
+# File names embed the content hash, so a URL's bytes never change
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+# Proxied posters can change upstream; the placeholder is retried soon
+PROXY_CACHE_CONTROL = 'public, max-age=86400'
+FALLBACK_CACHE_CONTROL = 'public, max-age=300'
+
+
+def _default_poster():
+    response = send_file(os.path.abspath(DEFAULT_POSTER_PATH), mimetype='image/svg+xml', conditional=True)
+    response.headers['Cache-Control'] = FALLBACK_CACHE_CONTROL
+    return response
+
+
+@poster_bp.route('/posters/<int:movie_id>', methods=['GET'])
+def get_movie_poster(movie_id):
+    """
+    A movie's poster via the proxy cache
+
+    Remote posters are fetched once and then served from disk; uploads and
+    other local paths redirect to their own URL. Anything that fails (no
+    movie, no poster, upstream down with nothing cached) gets the default
+    image.
+    """
+    try:
+        movie = db_service.get_movie_by_id(movie_id)
+    except Exception as e:
+        print(f"Error loading movie {movie_id} for poster: {e}")
+        movie = None
+    if not movie or not movie.poster_url:
+        return _default_poster()
+    if not poster_service.is_remote(movie.poster_url):
+        return redirect(movie.poster_url)
+
+    cached = poster_proxy.get(movie.poster_url)
+    if cached is None:
+        return _default_poster()
+    try:
+        response = send_file(os.path.abspath(cached['path']), mimetype=cached['content_type'], conditional=True)
+    except OSError:
+        # Evicted between lookup and open
+        return _default_poster()
+    response.headers['Cache-Control'] = PROXY_CACHE_CONTROL
+    response.headers['X-Poster-Cache'] = cached['status']
+    return response
+
+
+@poster_bp.route('/posters/uploads/<name>', methods=['GET'])
+def get_uploaded_poster(name):
+    """
+    Uploaded poster original (<digest>.<ext>) or variant (<digest>-<variant>.<webp|jpg>)
+
+    A variant that hasn't been generated yet is answered with the original
+    and a no-cache header, so the browser asks again later instead of
+    caching the full-size file under the variant's URL forever.
+    """
+    if ORIGINAL_RE.match(name):
+        path = poster_service.original_path(name)
+        if not path:
+            abort(404)
+        response = send_file(os.path.abspath(path), conditional=True)
+        response.headers['Cache-Control'] = IMMUTABLE
+        return response
+
+    match = VARIANT_RE.match(name)
+    if not match:
+        abort(404)
+
+    path = poster_service.variant_path(name)
+    if path:
+        response = send_file(os.path.abspath(path), conditional=True)
+        response.headers['Cache-Control'] = IMMUTABLE
+        return response
+
+    original = poster_service.find_original(match.group(1))
+    if not original:
+        abort(404)
+    poster_service.schedule_variants(original)
+    response = send_file(os.path.abspath(poster_service.original_path(original)), conditional=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
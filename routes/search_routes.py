@@ -0,0 +1,76 @@
+"""
+Search Routes
+Full-text search over movies and review comments
+"""
+
+from flask import Blueprint, request, jsonify
+from services.db_service import db_service
+from services.poster_service import poster_service
+
+search_bp = Blueprint('search', __name__)
+
+MAX_QUERY_LENGTH = 200
+MAX_PER_PAGE = 50
+
+
+@search_bp.route('/api/search', methods=['GET'])
+def search():
+    """
+    Search movies and reviews
+
+    Query params:
+        q: search text (required)
+        type: 'all' (default), 'movies' or 'reviews'
+        page: 1-based page number (default 1)
+        per_page: hits per type per page (default 20, max 50)
+
+    Returns:
+    {
+        "success": true,
+        "movies": [{"id": 1, "title": "...", "poster": "...", "rating": 4.5, ...}],
+        "reviews": [{"movie_id": 1, "movie_title": "...", "snippet": "...<mark>hit</mark>...", ...}],
+        "has_more": {"movies": false, "reviews": true}
+    }
+
+    On DynamoDB only movies are searchable (in-memory index); reviews is empty.
+    """
+    try:
+        text = request.args.get('q', '').strip()
+        if not text:
+            return jsonify({'success': False, 'error': 'Missing search query'}), 400
+        if len(text) > MAX_QUERY_LENGTH:
+            return jsonify({'success': False, 'error': 'Search query too long'}), 400
+
+        kind = request.args.get('type', 'all')
+        if kind not in ('all', 'movies', 'reviews'):
+            return jsonify({'success': False, 'error': f"Invalid type: {kind}"}), 400
+
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), MAX_PER_PAGE)
+
+        results = db_service.search(text, kind, per_page, (page - 1) * per_page)
+
+        reviews = []
+        for f in results['reviews']:
+            reviews.append({
+                'movie_id': f.get('movie_id'),
+                'movie_title': f.get('movie_title'),
+                'name': f.get('user_email', '').split('@')[0].title(),
+                'rating': f.get('rating'),
+                'snippet': f.get('snippet'),
+                'timestamp': f.get('timestamp', '')
+            })
+
+        return jsonify({
+            'success': True,
+            'query': text,
+            'page': page,
+            'per_page': per_page,
+            'movies': [dict(movie.to_dict(), **poster_service.poster_fields(movie)) for movie in results['movies']],
+            'reviews': reviews,
+            'has_more': results['has_more']
+        }), 200
+
+    except Exception as e:
+        print(f"Search error: {e}")
+        return jsonify({'success': False, 'error': 'Search failed'}), 500
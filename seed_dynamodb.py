@@ -16,12 +16,14 @@ users = [
     {
         "user_email": "admin@cinemapulse.com",
         "role": "admin",
-        "created_at": datetime.utcnow().isoformat()
+        "created_at": datetime.utcnow().isoformat(),
+        "user_list": "ALL"
     },
     {
         "user_email": "viewer@cinemapulse.com",
         "role": "viewer",
-        "created_at": datetime.utcnow().isoformat()
+        "created_at": datetime.utcnow().isoformat(),
+        "user_list": "ALL"
     }
 ]
 
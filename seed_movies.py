@@ -1,6 +1,8 @@
-from database.dynamodb_db import DynamoDBDatabase
+from database.dynamodb_db import DynamoDBDatabase, CATALOG_PARTITION
+from database import rating_stats
 from config import get_config
 from datetime import datetime
+from decimal import Decimal
 
 config = get_config()
 
@@ -38,7 +40,15 @@ movies = [
     }
 ]
 
+# Empty histogram and scores, so the catalog GSIs (sorted by score) include them
+empty_scores = rating_stats.compute_scores([0] * len(rating_stats.STAR_LEVELS))
+
 for movie in movies:
+    movie["catalog"] = CATALOG_PARTITION
+    for field in rating_stats.STAR_FIELDS:
+        movie[field] = 0
+    for field, value in empty_scores.items():
+        movie[field] = Decimal(str(value))
     try:
         db.movies_table.put_item(
             Item=movie,
@@ -0,0 +1,224 @@
+"""
+CinemaPulse Pre-fork Server (standard library only)
+Fallback for hosts without gunicorn, same model as gunicorn.conf.py:
+    python serve.py
+
+The master binds the port and imports the app once, then forks
+WEB_WORKERS processes that each serve the shared socket with a pool of
+WEB_THREADS request threads.
+
+Signals to the master:
+    TERM / INT  graceful stop (workers finish in-flight requests)
+    HUP         graceful reload: a new set of workers is started, then the
+                old ones are drained (the code is not re-imported)
+Workers that exit (crash, WEB_MAX_REQUESTS reached) are replaced.
+
+State is per worker process: /metrics reports the worker that answered the
+scrape (series carry its pid), and a write drops cached responses only in
+the worker that made it; the others serve theirs for up to
+RESPONSE_CACHE_TTL seconds. The admin stack sampler reaches every worker
+through a control file in PROFILE_DIR, polled once a second.
+"""
+
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.simple_server import WSGIServer, WSGIRequestHandler
+from config import get_config
+
+# Seconds between master checks on its workers
+MASTER_TICK = 0.5
+
+
+class QuietHandler(WSGIRequestHandler):
+    """No per-request access log (request metrics are at /metrics)"""
+
+    def log_request(self, code='-', size='-'):
+        pass
+
+
+class PooledWSGIServer(WSGIServer):
+    """wsgiref server on an inherited listening socket, requests on a bounded thread pool"""
+
+    def __init__(self, sock, app, threads, max_requests=0):
+        super().__init__(sock.getsockname()[:2], QuietHandler, bind_and_activate=False)
+        self.socket.close()
+        self.socket = sock
+        host, port = sock.getsockname()[:2]
+        self.server_name = socket.getfqdn(host)
+        self.server_port = port
+        self.setup_environ()
+        self.set_app(app)
+        self.max_requests = max_requests
+        self._handled = 0
+        self._count_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='http')
+
+    def get_request(self):
+        # The listener is non-blocking (see main); connections are not
+        conn, address = self.socket.accept()
+        conn.setblocking(True)
+        return conn, address
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+        if self.max_requests:
+            with self._count_lock:
+                self._handled += 1
+                recycle = self._handled == self.max_requests
+            if recycle:
+                self.drain()
+
+    def drain(self):
+        """Stop accepting; serve_forever returns once the accept loop notices"""
+        from services.worker_service import worker_service
+        worker_service.begin_drain()
+        # shutdown() blocks until the loop exits, so never call it on the loop's thread
+        threading.Thread(target=self.shutdown, daemon=True).start()
+
+    def server_close(self):
+        # In-flight requests finish before the worker exits
+        self._pool.shutdown(wait=True)
+
+
+def run_worker(sock, app, config):
+    """Body of a forked worker process; never returns"""
+    status = 1
+    try:
+        from services.worker_service import worker_service
+        worker_service.post_fork()
+        server = PooledWSGIServer(sock, app, config.WEB_THREADS, config.WEB_MAX_REQUESTS)
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: server.drain())
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        server.serve_forever(poll_interval=MASTER_TICK)
+        server.server_close()
+        # On stop the master still kills it after WEB_GRACEFUL_TIMEOUT;
+        # on reload or recycling the job runs to the end
+        worker_service.wait_for_jobs()
+        status = 0
+    except Exception as e:
+        print(f"✗ Worker {os.getpid()} failed: {e}")
+    finally:
+        sys.stdout.flush()
+        os._exit(status)
+
+
+class Master:
+    def __init__(self, sock, app, config):
+        self.sock = sock
+        self.app = app
+        self.config = config
+        self.workers = {}  # pid -> generation
+        self.generation = 0
+        self.stopping = False
+        self.reload_requested = False
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            run_worker(self.sock, self.app, self.config)
+        self.workers[pid] = self.generation
+
+    def signal_workers(self, pids, signum):
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def reap(self):
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.workers.clear()
+                return
+            if pid == 0:
+                return
+            generation = self.workers.pop(pid, None)
+            if generation == self.generation and not self.stopping and status != 0:
+                print(f"⚠️ Worker {pid} exited unexpectedly (status {status}), replacing it")
+
+    def reload(self):
+        """Start a fresh generation of workers, then drain the old one"""
+        self.reload_requested = False
+        old = list(self.workers)
+        self.generation += 1
+        for _ in range(self.config.WEB_WORKERS):
+            self.spawn()
+        self.signal_workers(old, signal.SIGTERM)
+        print(f"✓ Reloaded: {self.config.WEB_WORKERS} new workers, draining {len(old)}")
+
+    def stop(self):
+        """Drain every worker; kill what's left after WEB_GRACEFUL_TIMEOUT"""
+        self.signal_workers(list(self.workers), signal.SIGTERM)
+        deadline = time.time() + self.config.WEB_GRACEFUL_TIMEOUT
+        while self.workers and time.time() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        self.signal_workers(list(self.workers), signal.SIGKILL)
+        self.reap()
+
+    def run(self):
+        signal.signal(signal.SIGTERM, lambda *_: setattr(self, 'stopping', True))
+        signal.signal(signal.SIGINT, lambda *_: setattr(self, 'stopping', True))
+        signal.signal(signal.SIGHUP, lambda *_: setattr(self, 'reload_requested', True))
+
+        while not self.stopping:
+            self.reap()
+            if self.reload_requested:
+                self.reload()
+            current = sum(1 for generation in self.workers.values() if generation == self.generation)
+            for _ in range(self.config.WEB_WORKERS - current):
+                self.spawn()
+            time.sleep(MASTER_TICK)
+
+        print("✓ Shutting down, draining workers")
+        self.stop()
+
+
+def main():
+    config = get_config()
+    sock = socket.create_server((config.HOST, config.PORT), backlog=2048)
+    # Every worker selects on this socket; the ones that lose the race for
+    # a connection get an error from accept() instead of blocking in it
+    sock.setblocking(False)
+
+    # Preload: workers share the parent's imported modules copy-on-write.
+    # Warming up here runs SQLite setup once instead of racing in each worker
+    from wsgi import application
+    from services.worker_service import worker_service
+    print(f"✓ Warmed up in {worker_service.warmup()} ms")
+
+    if not hasattr(os, 'fork'):
+        print("⚠️ os.fork unavailable - serving from a single process")
+        server = PooledWSGIServer(sock, application, config.WEB_THREADS)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        server.server_close()
+        worker_service.wait_for_jobs()
+        return
+
+    print(f"✓ CinemaPulse serving on {config.HOST}:{config.PORT} "
+          f"({config.WEB_WORKERS} workers x {config.WEB_THREADS} threads, pid {os.getpid()})")
+    Master(sock, application, config).run()
+    sock.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Asset Service - Fingerprinted Static Files
+Builds a manifest of static assets at startup: each file gets a
+content-hash URL (safe to cache forever) and its gzip/brotli variants are
+compressed once, up front
+"""
+
+import hashlib
+import mimetypes
+import os
+import threading
+from typing import Dict, Optional
+from config import get_config
+from services.response_service import COMPRESSIBLE_TYPES, compress, brotli
+
+STATIC_FOLDER = 'static'
+ASSET_URL_PREFIX = '/assets/'
+
+# Uploaded posters are already content-addressed (see poster_service)
+EXCLUDED_DIRS = {os.path.join('images', 'uploads')}
+
+HASH_LENGTH = 12
+
+
+class _Asset:
+    """One static file: its hashed name, bytes and precompressed variants"""
+    __slots__ = ('logical', 'hashed', 'path', 'mtime', 'mimetype', 'etag', 'body', 'variants')
+
+    def __init__(self, logical, path):
+        self.logical = logical
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        with open(path, 'rb') as f:
+            self.body = f.read()
+        self.etag = hashlib.sha256(self.body).hexdigest()[:HASH_LENGTH]
+        stem, extension = os.path.splitext(logical)
+        self.hashed = f'{stem}.{self.etag}{extension}'
+        self.mimetype = mimetypes.guess_type(logical)[0] or 'application/octet-stream'
+
+        self.variants = {}
+        if self.mimetype in COMPRESSIBLE_TYPES:
+            for encoding in ('gzip', 'br') if brotli is not None else ('gzip',):
+                data = compress(self.body, encoding)
+                if len(data) < len(self.body):
+                    self.variants[encoding] = data
+
+
+class AssetManifest:
+    """
+    Logical name (css/main.css) -> fingerprinted name (css/main.<hash>.css)
+
+    Built on first lookup (or by warmup()). With DEBUG on, url()
+    re-checks the file's mtime so edits show up without a restart;
+    otherwise the manifest is fixed once built.
+    """
+
+    def __init__(self, static_folder: str = STATIC_FOLDER):
+        config = get_config()
+        self.enabled = config.ASSET_FINGERPRINTING
+        self.auto_reload = config.DEBUG
+        self.static_folder = static_folder
+        self._by_logical = {}
+        self._by_hashed = {}
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._built = False
+
+    def warmup(self):
+        """Hash and compress every asset now instead of on the first page view"""
+        if self.enabled and not self._built:
+            with self._build_lock:
+                if not self._built:
+                    self.build()
+
+    def build(self):
+        by_logical = {}
+        for root, dirs, files in os.walk(self.static_folder):
+            relative_root = os.path.relpath(root, self.static_folder)
+            dirs[:] = [d for d in dirs if os.path.normpath(os.path.join(relative_root, d)) not in EXCLUDED_DIRS]
+            for name in files:
+                logical = os.path.normpath(os.path.join(relative_root, name)).replace(os.sep, '/')
+                by_logical[logical] = _Asset(logical, os.path.join(root, name))
+
+        with self._lock:
+            self._by_logical = by_logical
+            self._by_hashed = {asset.hashed: asset for asset in by_logical.values()}
+            self._built = True
+
+        compressed = sum(len(asset.variants) for asset in by_logical.values())
+        print(f"✓ Asset manifest: {len(by_logical)} files, {compressed} precompressed variants")
+
+    def _refresh(self, asset: _Asset) -> _Asset:
+        """Rehash an asset whose file changed on disk (DEBUG only)"""
+        try:
+            if os.path.getmtime(asset.path) == asset.mtime:
+                return asset
+            fresh = _Asset(asset.logical, asset.path)
+        except OSError:
+            return asset
+        with self._lock:
+            self._by_hashed.pop(asset.hashed, None)
+            self._by_logical[fresh.logical] = fresh
+            self._by_hashed[fresh.hashed] = fresh
+        return fresh
+
+    def url(self, filename: str) -> Optional[str]:
+        """Fingerprinted URL for a static file, or None if it isn't in the manifest"""
+        self.warmup()
+        asset = self._by_logical.get(filename)
+        if asset is None:
+            return None
+        if self.auto_reload:
+            asset = self._refresh(asset)
+        return ASSET_URL_PREFIX + asset.hashed
+
+    def lookup(self, hashed: str) -> Optional[_Asset]:
+        self.warmup()
+        return self._by_hashed.get(hashed)
+
+    def manifest(self) -> Dict[str, str]:
+        self.warmup()
+        return {logical: asset.hashed for logical, asset in self._by_logical.items()}
+
+
+# Singleton instance
+asset_manifest = AssetManifest()
@@ -99,19 +99,14 @@ class AuthService:
             return {"success": False, "message": "Invalid credentials"}
 
         # SQLite authentication
-        if "password" in user and "salt" in user:
-            if not AuthService.verify_password(password, user["password"], user["salt"]):
+        if user.has_password:
+            if not AuthService.verify_password(password, user.password, user.salt):
                 return {"success": False, "message": "Invalid credentials"}
 
-        # Unified response (CRITICAL FIX)
         return {
             "success": True,
             "message": "Login successful",
-            "user": {
-                "email": user.get("user_email") or user.get("email"),
-                "name": user.get("name", "User"),
-                "role": user.get("role", "viewer"),
-            },
+            "user": user.to_dict(),
         }
 
     # ================= ADMIN =================
@@ -3,7 +3,17 @@ Database Service - Abstraction Layer
 Automatically switches between SQLite (local) and DynamoDB (AWS)
 """
 
+import contextvars
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from config import get_config
+from services.metrics_service import metrics_service
+from services.trending_service import trending_service
+from database import rating_stats
+from database import rollups
+from database import sentiment_stats
+from database import pagination
 
 class DatabaseService:
     _instance = None
@@ -20,37 +30,150 @@ class DatabaseService:
         
         config = get_config()
         
+        # Bumped on every catalog/review write made through this service;
+        # cached responses built from an older version are discarded
+        self._versions = itertools.count(1)
+        self.data_version = 0
+        
+        # Shared pool for independent backend reads issued by one request
+        self._fanout = ThreadPoolExecutor(max_workers=config.DB_FANOUT_WORKERS, thread_name_prefix='db-fanout')
+        
+        if config.ENV_MODE not in ('local', 'aws'):
+            raise ValueError(f"Unknown ENV_MODE: {config.ENV_MODE}")
+        
+        # The backend (schema setup and seeding on SQLite, boto3 and the
+        # search index on DynamoDB) is built on first use or by warmup(),
+        # so importing the app stays cheap
+        self._db = None
+        self._db_lock = threading.Lock()
+        
+        self._initialized = True
+
+    @property
+    def db(self):
+        """The SQLite or DynamoDB backend, built on first use"""
+        db = self._db
+        if db is None:
+            with self._db_lock:
+                if self._db is None:
+                    # In an empty context, so schema setup isn't traced
+                    # as the queries of whichever request got here first
+                    self._db = contextvars.Context().run(self._create_backend)
+                db = self._db
+        return db
+
+    def _create_backend(self):
+        config = get_config()
         if config.ENV_MODE == 'local':
             from database.sqlite_db import SQLiteDatabase
-            self.db = SQLiteDatabase(config.SQLITE_DB_PATH)
+            db = SQLiteDatabase(
+                config.SQLITE_DB_PATH,
+                trace_queries=config.QUERY_TRACE_ENABLED,
+                group_commit=config.FEEDBACK_GROUP_COMMIT,
+                group_commit_size=config.FEEDBACK_GROUP_COMMIT_SIZE,
+                group_commit_ms=config.FEEDBACK_GROUP_COMMIT_MS
+            )
             print("✓ Using SQLite database (LOCAL mode)")
         
-        elif config.ENV_MODE == 'aws':
+        else:
             from database.dynamodb_db import DynamoDBDatabase
-            self.db = DynamoDBDatabase(
+            db = DynamoDBDatabase(
                 region_name=config.AWS_REGION,
                 users_table=config.DYNAMODB_USERS_TABLE,
                 movies_table=config.DYNAMODB_MOVIES_TABLE,
-                feedback_table=config.DYNAMODB_FEEDBACK_TABLE
+                feedback_table=config.DYNAMODB_FEEDBACK_TABLE,
+                trending_table=config.DYNAMODB_TRENDING_TABLE,
+                rollups_table=config.DYNAMODB_ROLLUPS_TABLE,
+                counters_table=config.DYNAMODB_COUNTERS_TABLE,
+                jobs_table=config.DYNAMODB_JOBS_TABLE,
+                trace_queries=config.QUERY_TRACE_ENABLED,
+                users_created_index=config.DYNAMODB_USERS_CREATED_INDEX or None,
+                catalog_indexes=config.DYNAMODB_CATALOG_INDEXES,
+                feedback_user_index=config.DYNAMODB_FEEDBACK_USER_INDEX or None,
+                recent_reviews=config.RECENT_REVIEWS,
+                search_index_segments=config.SEARCH_INDEX_SEGMENTS,
+                search_index_refresh_seconds=config.SEARCH_INDEX_REFRESH_SECONDS
             )
             print("✓ Using DynamoDB (AWS mode)")
         
-        else:
-            raise ValueError(f"Unknown ENV_MODE: {config.ENV_MODE}")
-        
-        self._initialized = True
+        return db
+
+    def warmup(self):
+        """Build the backend now (schema, seed data, clients) rather than on the first request"""
+        self.db
+
+    def after_fork(self):
+        """
+        Per-worker resources, rebuilt in each process forked from a
+        preloaded parent: the fan-out pool (its threads stay behind in
+        the parent) and the backend's clients and writer threads
+        """
+        self._fanout = ThreadPoolExecutor(max_workers=get_config().DB_FANOUT_WORKERS, thread_name_prefix='db-fanout')
+        self._db_lock = threading.Lock()
+        if self._db is not None:
+            self._db.after_fork()
+
+    def ping(self):
+        """Raise if the backend can't serve a query (readiness check)"""
+        self.db.ping()
+
+    def mark_changed(self):
+        """Record that catalog or review data changed (invalidates cached responses)"""
+        self.data_version = next(self._versions)
+
+    def run_async(self, call):
+        """
+        Start a zero-argument call on the shared pool and return its Future
+
+        The call runs in a copy of the caller's context, so its queries
+        still land in the request's query trace.
+        """
+        return self._fanout.submit(contextvars.copy_context().run, call)
+
+    def _gather(self, *calls):
+        """Run calls concurrently; results in call order, first exception re-raised"""
+        futures = [self.run_async(call) for call in calls]
+        return [future.result() for future in futures]
 
     # ========= USER =========
+    @metrics_service.timed('db')
     def get_user_by_email(self, email):
         return self.db.get_user_by_email(email)
 
+    @metrics_service.timed('db')
     def create_user(self, email, role='viewer'):
         return self.db.create_user(email, role)
 
+    @metrics_service.timed('db')
+    def list_users(self, limit=pagination.DEFAULT_PAGE_SIZE, cursor=None, email_prefix=None, role=None):
+        """
+        One page of users as {'users': [User], 'next_cursor': token or None}
+
+        Raises ValueError for a malformed cursor token.
+        """
+        page = self.db.list_users(limit, pagination.decode_cursor(cursor), email_prefix, role)
+        return {'users': page['users'], 'next_cursor': pagination.encode_cursor(page['next'])}
+
+    @metrics_service.timed('db')
+    def count_users(self):
+        return self.db.count_users()
+
     # ========= MOVIES =========
-    def get_all_movies(self):
-        return self.db.get_all_movies()
+    @metrics_service.timed('db')
+    def get_all_movies(self, sort='bayesian'):
+        return self.db.get_all_movies(sort)
+
+    @metrics_service.timed('db')
+    def list_movies(self, sort='bayesian', genre=None, limit=None, cursor=None):
+        """
+        One page of the ranked catalog as {'movies': [Movie], 'next_cursor': token or None}
 
+        Raises ValueError for a malformed cursor token.
+        """
+        page = self.db.list_movies(sort, genre, limit, pagination.decode_cursor(cursor))
+        return {'movies': page['movies'], 'next_cursor': pagination.encode_cursor(page['next'])}
+
+    @metrics_service.timed('db')
     def get_movie_by_id(self, movie_id):
         """
         IMPORTANT:
@@ -62,20 +185,92 @@ class DatabaseService:
             print("❌ Error getting movie by id:", e)
             return None
 
+    @metrics_service.timed('db')
+    def get_movies_by_ids(self, movie_ids):
+        """Several movies in one backend read (order not preserved)"""
+        try:
+            return self.db.get_movies_by_ids([int(movie_id) for movie_id in movie_ids])
+        except Exception as e:
+            print("❌ Error getting movies by ids:", e)
+            return []
+
+    @metrics_service.timed('db')
+    def get_movie_with_reviews(self, movie_id, limit=10):
+        """
+        (Movie, newest `limit` reviews, next_cursor) in one backend round trip
+
+        (None, [], None) if the movie doesn't exist; next_cursor (None when
+        every review is included) pages on via get_reviews_page.
+        """
+        try:
+            movie, reviews, position = self.db.get_movie_with_reviews(int(movie_id), limit)
+            return movie, reviews, pagination.encode_cursor(position)
+        except Exception as e:
+            print("❌ Error getting movie with reviews:", e)
+            return None, [], None
+
+    @metrics_service.timed('db')
+    def get_reviews_page(self, movie_id, limit=10, cursor=None):
+        """
+        Older reviews of a movie as (reviews, next_cursor)
+
+        Raises ValueError for a malformed cursor token.
+        """
+        reviews, position = self.db.get_reviews_page(int(movie_id), limit, pagination.decode_cursor(cursor))
+        return reviews, pagination.encode_cursor(position)
+
+    @metrics_service.timed('db')
+    def create_movie(self, title, description, poster_url, genre):
+        movie_id = self.db.create_movie(title, description, poster_url, genre)
+        if movie_id is not None:
+            self.mark_changed()
+        return movie_id
+
+    @metrics_service.timed('db')
+    def delete_movie(self, movie_id, progress=None):
+        """Delete a movie with its reviews and derived counters (None if not found)"""
+        result = self.db.delete_movie(int(movie_id), progress)
+        if result is not None:
+            self.mark_changed()
+            trending_service.forget(int(movie_id))
+        return result
+
+    @metrics_service.timed('db')
+    def search(self, text, kind='all', limit=20, offset=0):
+        return self.db.search(text, kind, limit, offset)
+
+    @metrics_service.timed('db')
+    def get_trending_movies(self, window, limit=10):
+        """Top movies by reviews in a window as [(Movie, recent_reviews)]"""
+        top = trending_service.get_trending(self.db, window, limit)
+        if not top:
+            return []
+        movies = {m.id: m for m in self.db.get_movies_by_ids([movie_id for movie_id, _ in top])}
+        return [(movies[movie_id], reviews) for movie_id, reviews in top if movie_id in movies]
+
     # ========= FEEDBACK =========
-    def create_feedback(self, movie_id, user_email, rating, comment, sentiment='neutral'):
+    @metrics_service.timed('db')
+    def create_feedback(self, movie_id, user_email, rating, comment, sentiment='neutral',
+                        sentiment_confidence=None, sentiment_disagreement=False):
         try:
-            return self.db.create_feedback(
+            feedback_id = self.db.create_feedback(
                 movie_id=int(movie_id),
                 user_email=user_email,
                 rating=rating,
                 comment=comment,
-                sentiment=sentiment
+                sentiment=sentiment,
+                sentiment_confidence=sentiment_confidence,
+                sentiment_disagreement=sentiment_disagreement
             )
         except Exception as e:
             print("❌ Error creating feedback:", e)
             return None
+        if feedback_id:
+            self.mark_changed()
+            trending_service.record(int(movie_id))
+        return feedback_id
 
+    @metrics_service.timed('db')
     def get_feedback_by_movie(self, movie_id):
         try:
             return self.db.get_feedback_by_movie(int(movie_id))
@@ -83,10 +278,88 @@ class DatabaseService:
             print("❌ Error fetching feedback:", e)
             return []
 
+    @metrics_service.timed('db')
+    def get_user_reviews(self, user_email, limit=pagination.DEFAULT_PAGE_SIZE, cursor=None):
+        """
+        One page of a user's reviews as {'reviews': [Feedback], 'next_cursor': token or None}
+
+        Raises ValueError for a malformed cursor token.
+        """
+        reviews, position = self.db.get_user_reviews(user_email, limit, pagination.decode_cursor(cursor))
+        return {'reviews': reviews, 'next_cursor': pagination.encode_cursor(position)}
+
+    @metrics_service.timed('db')
+    def get_reviewed_movie_ids(self, user_email):
+        try:
+            return self.db.get_reviewed_movie_ids(user_email)
+        except Exception as e:
+            print("❌ Error fetching reviewed movies:", e)
+            return set()
+
+    # ========= JOBS =========
+    @metrics_service.timed('db')
+    def save_job(self, job, expires_at):
+        self.db.save_job(job, expires_at)
+
+    @metrics_service.timed('db')
+    def get_job(self, job_id):
+        return self.db.get_job(job_id)
+
     # ========= ANALYTICS =========
+    @metrics_service.timed('db')
+    def get_admin_overview(self, user_limit=10):
+        """
+        Everything the admin dashboard shows, fetched concurrently
+
+        The review summary is derived from the catalog's rating histograms
+        instead of a second movie read plus a feedback scan.
+        """
+        movies, users, total_users, sentiment = self._gather(
+            self.db.get_all_movies,
+            lambda: self.db.list_users(user_limit),
+            self.db.count_users,
+            lambda: sentiment_stats.summarize(self.db.get_sentiment_counters(None))
+        )
+        analytics = rating_stats.catalog_summary(movie.histogram for movie in movies)
+        analytics['sentiment'] = sentiment
+        return {
+            'movies': movies,
+            'users': users['users'],
+            'users_next_cursor': pagination.encode_cursor(users['next']),
+            'total_users': total_users,
+            'analytics': analytics
+        }
+
+    @metrics_service.timed('db')
     def get_analytics(self):
         return self.db.get_analytics()
 
+    @metrics_service.timed('db')
+    def get_timeseries(self, start, end, movie_id=None, granularity='day'):
+        """Review/rating/sentiment series between two dates, from daily rollups"""
+        rows = self.db.get_daily_rollups(
+            rollups.ALL_MOVIES if movie_id is None else int(movie_id),
+            start.isoformat(), end.isoformat()
+        )
+        return rollups.timeseries(rows, start, end, granularity)
+
+    @metrics_service.timed('db')
+    def get_sentiment_summary(self, movie_id=None):
+        """Sentiment distribution from stored labels (None if the movie doesn't exist)"""
+        counters = self.db.get_sentiment_counters(None if movie_id is None else int(movie_id))
+        if counters is None:
+            return None
+        return sentiment_stats.summarize(counters)
+
+    def rebuild_rollups(self):
+        self.db.rebuild_rollups()
+
+    def rebuild_rating_stats(self):
+        self.db.rebuild_rating_stats()
+
+    def rebuild_sentiment_stats(self):
+        self.db.rebuild_sentiment_stats()
+
 
 # Singleton instance
 db_service = DatabaseService()
@@ -0,0 +1,115 @@
+"""
+Job Service - Background Admin Jobs
+Runs long admin operations (e.g. cascade deletes) on a background thread
+and keeps their progress in the database, so any worker can answer a
+status poll
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+from services.db_service import db_service
+
+# Job status is kept this long after its last update
+JOB_RETENTION_SECONDS = 7 * 24 * 3600
+# Progress is saved at most this often (plus on start and finish)
+PROGRESS_SAVE_SECONDS = 1.0
+# A running job not updated for this long lost its worker (killed or crashed)
+STALE_JOB_SECONDS = 300
+
+
+class JobService:
+    def __init__(self):
+        self._threads = set()
+        self._lock = threading.Lock()
+
+    def after_fork(self):
+        """In a forked worker: the parent's job threads didn't come along"""
+        self._threads = set()
+        self._lock = threading.Lock()
+
+    def start(self, kind: str, target, **params) -> Dict:
+        """
+        Run target(progress=..., **params) in the background
+
+        target reports progress by calling progress(done); its return value
+        becomes the job's result.
+        """
+        job = {
+            'id': uuid.uuid4().hex,
+            'kind': kind,
+            'params': params,
+            'status': 'running',
+            'progress': 0,
+            'result': None,
+            'error': None,
+            'worker': f'{socket.gethostname()}:{os.getpid()}',
+            'started_at': time.time(),
+            'updated_at': None,
+            'finished_at': None
+        }
+        self._save(job)
+
+        def progress(done):
+            job['progress'] = done
+            if time.time() - job['updated_at'] >= PROGRESS_SAVE_SECONDS:
+                self._save(job)
+
+        def run():
+            try:
+                job['result'] = target(progress=progress, **params)
+                job['status'] = 'done'
+            except Exception as e:
+                print(f"Job {job['id']} ({kind}) failed: {e}")
+                job['error'] = str(e)
+                job['status'] = 'failed'
+            finally:
+                job['finished_at'] = time.time()
+                self._save(job)
+                with self._lock:
+                    self._threads.discard(thread)
+
+        thread = threading.Thread(target=run, name=f"job-{kind}", daemon=True)
+        with self._lock:
+            self._threads.add(thread)
+        thread.start()
+        return dict(job)
+
+    def _save(self, job: Dict):
+        job['updated_at'] = time.time()
+        try:
+            db_service.save_job(job, job['updated_at'] + JOB_RETENTION_SECONDS)
+        except Exception as e:
+            print(f"⚠️ Job {job['id']} status not saved: {e}")
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """A job's last saved status; 'interrupted' if its worker died while running it"""
+        job = db_service.get_job(job_id)
+        if job and job['status'] == 'running' and time.time() - job['updated_at'] > STALE_JOB_SECONDS:
+            job['status'] = 'interrupted'
+            job['error'] = 'The worker running this job exited; start it again to finish'
+        return job
+
+    def running(self) -> int:
+        with self._lock:
+            return len(self._threads)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait for this process's running jobs; True once none are left"""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            with self._lock:
+                thread = next(iter(self._threads), None)
+            if thread is None:
+                return True
+            remaining = None if deadline is None else deadline - time.time()
+            if remaining is not None and remaining <= 0:
+                return False
+            thread.join(remaining)
+
+
+# Singleton instance
+job_service = JobService()
@@ -0,0 +1,275 @@
+"""
+Metrics Service - Request and Operation Instrumentation
+Latency histograms, in-flight gauges, error counters and cache hit ratios
+exposed in Prometheus text format (see /metrics)
+
+Metrics live in each worker process. Every series carries a pid label, so
+scrapes that land on different workers stay separate series; sum by
+route/operation (dropping pid) in queries.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from config import get_config
+
+# Histogram bucket upper bounds (seconds)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Shard:
+    """
+    Per-thread metric storage
+
+    Only the owning thread writes to a shard, so observations need no lock.
+    The collector reads shards while they are being written; a scrape may
+    therefore be off by an in-progress observation, which is fine for metrics.
+    """
+    __slots__ = ('thread', 'histograms', 'counters')
+
+    def __init__(self, thread):
+        self.thread = thread
+        self.histograms = {}  # (name, labels) -> [bucket counts..., +Inf count, sum]
+        self.counters = {}    # (name, labels) -> value
+
+
+class _Timer:
+    """Context manager timing one operation into a histogram"""
+    __slots__ = ('service', 'component', 'operation', 'start')
+
+    def __init__(self, service, component, operation):
+        self.service = service
+        self.component = component
+        self.operation = operation
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.service.observe_operation(
+            self.component, self.operation,
+            time.perf_counter() - self.start,
+            error=exc_type is not None
+        )
+        return False
+
+
+class MetricsService:
+    def __init__(self):
+        config = get_config()
+        self.enabled = config.METRICS_ENABLED
+
+        self._local = threading.local()
+        self._shards = []
+        # Taken only when a thread registers its shard or during a scrape,
+        # never on the observation path
+        self._registry_lock = threading.Lock()
+        # Totals folded in from threads that have exited
+        self._retired = _Shard(None)
+
+    # ========== SHARDS ==========
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = _Shard(threading.current_thread())
+            self._local.shard = shard
+            with self._registry_lock:
+                self._shards.append(shard)
+        return shard
+
+    @staticmethod
+    def _merge_into(target, shard):
+        for key, values in list(shard.histograms.items()):
+            existing = target.histograms.get(key)
+            if existing is None:
+                target.histograms[key] = list(values)
+            else:
+                for i, v in enumerate(values):
+                    existing[i] += v
+        for key, value in list(shard.counters.items()):
+            target.counters[key] = target.counters.get(key, 0) + value
+
+    def _collect(self):
+        """Merge all thread shards into one snapshot, retiring dead threads"""
+        snapshot = _Shard(None)
+        with self._registry_lock:
+            alive = []
+            for shard in self._shards:
+                if shard.thread.is_alive():
+                    alive.append(shard)
+                else:
+                    # Thread is gone, nothing writes to this shard anymore
+                    self._merge_into(self._retired, shard)
+            self._shards = alive
+            self._merge_into(snapshot, self._retired)
+            for shard in alive:
+                self._merge_into(snapshot, shard)
+        return snapshot
+
+    # ========== RECORDING ==========
+
+    def observe(self, name, labels, seconds):
+        """Record one latency observation in a histogram"""
+        if not self.enabled:
+            return
+        histograms = self._shard().histograms
+        key = (name, labels)
+        values = histograms.get(key)
+        if values is None:
+            # One slot per bucket, one for +Inf, one for the running sum
+            values = [0] * (len(LATENCY_BUCKETS) + 2)
+            histograms[key] = values
+        values[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        values[-1] += seconds
+
+    def increment(self, name, labels, amount=1):
+        """Increment a counter"""
+        if not self.enabled:
+            return
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + amount
+
+    def request_started(self):
+        self.increment('http_requests_started', ())
+
+    def request_finished(self, method, route, status, seconds):
+        self.increment('http_requests_finished', ())
+        self.observe('http_request_duration_seconds', (('method', method), ('route', route)), seconds)
+        self.increment('http_requests_total', (('method', method), ('route', route), ('status', str(status))))
+        if status >= 500:
+            self.increment('http_request_errors_total', (('method', method), ('route', route)))
+
+    def observe_operation(self, component, operation, seconds, error=False):
+        labels = (('component', component), ('operation', operation))
+        self.observe('operation_duration_seconds', labels, seconds)
+        if error:
+            self.increment('operation_errors_total', labels)
+
+    def record_cache(self, cache, hit):
+        """Record a cache lookup result"""
+        self.increment('cache_requests_total', (('cache', cache), ('result', 'hit' if hit else 'miss')))
+
+    # ========== TIMING HELPERS ==========
+
+    def timer(self, component, operation):
+        """
+        Time a block of code
+
+        Usage:
+            with metrics_service.timer('sns', 'publish'):
+                client.publish(...)
+        """
+        return _Timer(self, component, operation)
+
+    def timed(self, component, operation=None):
+        """Decorator timing every call of a function"""
+        def decorator(func):
+            op = operation or func.__name__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception:
+                    self.observe_operation(component, op, time.perf_counter() - start, error=True)
+                    raise
+                self.observe_operation(component, op, time.perf_counter() - start)
+                return result
+            return wrapper
+        return decorator
+
+    # ========== EXPORT ==========
+
+    @staticmethod
+    def _format_labels(labels, extra=()):
+        pairs = tuple(labels) + tuple(extra)
+        if not pairs:
+            return ''
+        body = ','.join(
+            '%s="%s"' % (k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for k, v in pairs
+        )
+        return '{' + body + '}'
+
+    def render(self):
+        """Render all metrics in Prometheus text exposition format"""
+        snapshot = self._collect()
+        prefix = 'cinemapulse_'
+        lines = []
+        # This worker's series, apart from the other workers'
+        worker = (('pid', os.getpid()),)
+
+        # In-flight gauge
+        started = snapshot.counters.get(('http_requests_started', ()), 0)
+        finished = snapshot.counters.get(('http_requests_finished', ()), 0)
+        lines.append(f'# HELP {prefix}http_requests_in_flight Requests currently being served')
+        lines.append(f'# TYPE {prefix}http_requests_in_flight gauge')
+        lines.append(f'{prefix}http_requests_in_flight{self._format_labels(worker)} {max(started - finished, 0)}')
+
+        # Histograms
+        help_text = {
+            'http_request_duration_seconds': 'Request latency by route',
+            'operation_duration_seconds': 'Backend operation latency (db, sentiment, sns)'
+        }
+        by_name = {}
+        for (name, labels), values in snapshot.histograms.items():
+            by_name.setdefault(name, []).append((labels, values))
+        for name in sorted(by_name):
+            lines.append(f'# HELP {prefix}{name} {help_text.get(name, name)}')
+            lines.append(f'# TYPE {prefix}{name} histogram')
+            for labels, values in sorted(by_name[name]):
+                labels = worker + labels
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, values):
+                    cumulative += count
+                    lines.append(f'{prefix}{name}_bucket{self._format_labels(labels, (("le", bound),))} {cumulative}')
+                cumulative += values[len(LATENCY_BUCKETS)]
+                lines.append(f'{prefix}{name}_bucket{self._format_labels(labels, (("le", "+Inf"),))} {cumulative}')
+                lines.append(f'{prefix}{name}_sum{self._format_labels(labels)} {values[-1]:.6f}')
+                lines.append(f'{prefix}{name}_count{self._format_labels(labels)} {cumulative}')
+
+        # Counters
+        help_text = {
+            'http_requests_total': 'Finished requests by route and status',
+            'http_request_errors_total': 'Requests that ended in a 5xx response',
+            'operation_errors_total': 'Backend operations that raised',
+            'cache_requests_total': 'Cache lookups by result'
+        }
+        by_name = {}
+        for (name, labels), value in snapshot.counters.items():
+            if name in ('http_requests_started', 'http_requests_finished'):
+                continue
+            by_name.setdefault(name, []).append((labels, value))
+        for name in sorted(by_name):
+            lines.append(f'# HELP {prefix}{name} {help_text.get(name, name)}')
+            lines.append(f'# TYPE {prefix}{name} counter')
+            for labels, value in sorted(by_name[name]):
+                lines.append(f'{prefix}{name}{self._format_labels(worker + labels)} {value}')
+
+        # Cache hit ratios
+        caches = {}
+        for labels, value in by_name.get('cache_requests_total', []):
+            label_map = dict(labels)
+            hits, total = caches.get(label_map['cache'], (0, 0))
+            if label_map['result'] == 'hit':
+                hits += value
+            caches[label_map['cache']] = (hits, total + value)
+        if caches:
+            lines.append(f'# HELP {prefix}cache_hit_ratio Fraction of cache lookups that hit')
+            lines.append(f'# TYPE {prefix}cache_hit_ratio gauge')
+            for cache in sorted(caches):
+                hits, total = caches[cache]
+                ratio = hits / total if total else 0
+                lines.append(f'{prefix}cache_hit_ratio{self._format_labels(worker + (("cache", cache),))} {ratio:.4f}')
+
+        return '\n'.join(lines) + '\n'
+
+
+# Singleton instance
+metrics_service = MetricsService()
@@ -3,23 +3,47 @@ Notification Service - SNS Integration
 Sends notifications when new feedback is submitted (AWS only)
 """
 
-import boto3
+import threading
 from config import get_config
+from services.metrics_service import metrics_service
 from datetime import datetime
 
 class NotificationService:
     def __init__(self):
-        """Initialize SNS client"""
+        """SNS settings; the client itself is built lazily (see sns_client)"""
         config = get_config()
         self.enabled = config.USE_SNS
         
+        # boto3 is imported and the client built on first publish (or warmup)
+        self._sns_client = None
+        self._lock = threading.Lock()
+        
         if self.enabled:
-            self.sns_client = boto3.client('sns', region_name=config.AWS_REGION)
+            self.region_name = config.AWS_REGION
             self.topic_arn = config.SNS_TOPIC_ARN
             print("✓ SNS notifications enabled")
         else:
             print("✓ SNS notifications disabled (LOCAL mode)")
     
+    @property
+    def sns_client(self):
+        if self._sns_client is None:
+            with self._lock:
+                if self._sns_client is None:
+                    import boto3
+                    self._sns_client = boto3.client('sns', region_name=self.region_name)
+        return self._sns_client
+    
+    def warmup(self):
+        """Build the SNS client now instead of on the first notification"""
+        if self.enabled:
+            self.sns_client
+    
+    def after_fork(self):
+        """Forget the parent's SNS client (boto3 clients aren't fork-safe)"""
+        self._sns_client = None
+        self._lock = threading.Lock()
+    
     def send_feedback_notification(self, movie_title, user_email, rating, comment):
         """
         Send notification when new feedback is submitted
@@ -56,11 +80,12 @@ This is an automated notification from CinemaPulse.
             """
             
             # Publish to SNS topic
-            response = self.sns_client.publish(
-                TopicArn=self.topic_arn,
-                Subject=subject,
-                Message=message
-            )
+            with metrics_service.timer('sns', 'publish'):
+                response = self.sns_client.publish(
+                    TopicArn=self.topic_arn,
+                    Subject=subject,
+                    Message=message
+                )
             
             print(f"✓ SNS notification sent: MessageId {response['MessageId']}")
             return True
@@ -82,11 +107,12 @@ This is an automated notification from CinemaPulse.
             return True
         
         try:
-            response = self.sns_client.publish(
-                TopicArn=self.topic_arn,
-                Subject=subject,
-                Message=message
-            )
+            with metrics_service.timer('sns', 'publish'):
+                response = self.sns_client.publish(
+                    TopicArn=self.topic_arn,
+                    Subject=subject,
+                    Message=message
+                )
             print(f"✓ SNS alert sent: MessageId {response['MessageId']}")
             return True
         except Exception as e:
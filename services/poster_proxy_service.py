@@ -0,0 +1,273 @@
+"""
+Poster Proxy Service - Disk Cache for Remote Posters
+Each remote poster is fetched once, kept in a size-bounded LRU disk cache
+and revalidated upstream with conditional requests once it goes stale
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from config import get_config
+from services.metrics_service import metrics_service
+
+USER_AGENT = 'CinemaPulse-PosterProxy/1.0'
+MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+class UpstreamResponse:
+    """What an upstream fetcher returns (status 304 carries no body)"""
+    __slots__ = ('status', 'body', 'content_type', 'etag', 'last_modified', 'max_age')
+
+    def __init__(self, status, body=b'', content_type=None, etag=None, last_modified=None, max_age=None):
+        self.status = status
+        self.body = body
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.max_age = max_age
+
+
+class HTTPUpstream:
+    """
+    Default fetcher: plain HTTP(S) GET with conditional headers
+
+    Any object with the same fetch() signature can replace it (see
+    PosterProxy.use_upstream), e.g. one that rewrites URLs to a local stub
+    server.
+    """
+
+    def __init__(self, timeout: float, max_bytes: int):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+
+    def fetch(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> UpstreamResponse:
+        import urllib.error
+        import urllib.request
+
+        headers = {'User-Agent': USER_AGENT, 'Accept': 'image/*'}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=self.timeout) as resp:
+                body = resp.read(self.max_bytes + 1)
+                if len(body) > self.max_bytes:
+                    raise ValueError(f'poster larger than {self.max_bytes} bytes')
+                return UpstreamResponse(resp.status, body, resp.headers.get('Content-Type'),
+                                        resp.headers.get('ETag'), resp.headers.get('Last-Modified'),
+                                        _max_age(resp.headers.get('Cache-Control')))
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return UpstreamResponse(304, max_age=_max_age(e.headers.get('Cache-Control')))
+            raise
+
+
+def _max_age(cache_control: Optional[str]) -> Optional[int]:
+    match = MAX_AGE_RE.search(cache_control or '')
+    return int(match.group(1)) if match else None
+
+
+class PosterProxy:
+    """
+    URL-keyed disk cache of remote posters
+
+    Each entry is <key>.img plus <key>.json metadata (content type,
+    validators, fetch time). Recency is kept in memory and mirrored to the
+    metadata file's mtime, so LRU order survives a restart.
+    """
+
+    def __init__(self, upstream=None):
+        config = get_config()
+        self.cache_dir = config.POSTER_CACHE_DIR
+        self.max_bytes = config.POSTER_CACHE_MAX_BYTES
+        self.default_ttl = config.POSTER_CACHE_TTL
+        self.upstream = upstream or HTTPUpstream(config.POSTER_FETCH_TIMEOUT, config.POSTER_MAX_FETCH_BYTES)
+        self._entries = OrderedDict()  # key -> size in bytes, least recently used first
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        # The cache directory is indexed on first use
+        self._indexed = False
+        self._index_lock = threading.Lock()
+
+    def use_upstream(self, upstream):
+        """Swap the fetcher (anything with fetch(url, etag, last_modified))"""
+        self.upstream = upstream
+
+    # ========== INDEX ==========
+
+    def _ensure_index(self):
+        if not self._indexed:
+            with self._index_lock:
+                if not self._indexed:
+                    self._load_index()
+                    self._indexed = True
+
+    def _load_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        found = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            key = name[:-5]
+            try:
+                found.append((os.path.getmtime(self._meta_path(key)), key, os.path.getsize(self._data_path(key))))
+            except OSError:
+                self._remove_files(key)
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def _data_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.img')
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.json')
+
+    def _remove_files(self, key: str):
+        for path in (self._data_path(key), self._meta_path(key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _touch(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        try:
+            os.utime(self._meta_path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its budget"""
+        with self._lock:
+            victims = []
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                key, size = self._entries.popitem(last=False)
+                self._total_bytes -= size
+                victims.append(key)
+        for key in victims:
+            self._remove_files(key)
+
+    def stats(self) -> Dict:
+        self._ensure_index()
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._total_bytes, 'max_bytes': self.max_bytes}
+
+    # ========== ENTRIES ==========
+
+    def _read_meta(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._meta_path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_entry(self, key: str, url: str, result: UpstreamResponse, body: Optional[bytes]) -> Dict:
+        """Store a fetched body (or, for a 304, just refreshed metadata)"""
+        meta = {
+            'url': url,
+            'content_type': result.content_type,
+            'etag': result.etag,
+            'last_modified': result.last_modified,
+            'max_age': result.max_age,
+            'fetched_at': time.time()
+        }
+        if body is not None:
+            tmp_path = f'{self._data_path(key)}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, self._data_path(key))
+        tmp_path = f'{self._meta_path(key)}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path(key))
+
+        if body is not None:
+            with self._lock:
+                self._total_bytes += len(body) - self._entries.get(key, 0)
+                self._entries[key] = len(body)
+                self._entries.move_to_end(key)
+            self._evict()
+        return meta
+
+    def _is_fresh(self, meta: Dict) -> bool:
+        ttl = meta.get('max_age')
+        if ttl is None:
+            ttl = self.default_ttl
+        return time.time() - meta['fetched_at'] < ttl
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    # ========== LOOKUP ==========
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Cached poster for a remote URL: {'path', 'content_type', 'status'}
+
+        status is 'hit', 'miss', 'revalidated' or 'stale' (upstream failed,
+        previous copy served). None when there is no copy at all.
+        """
+        self._ensure_index()
+        key = hashlib.sha256(url.encode()).hexdigest()[:32]
+        # One fetch per URL at a time; other requests for it wait and then hit
+        with self._key_lock(key):
+            with self._lock:
+                cached = key in self._entries
+            meta = self._read_meta(key) if cached else None
+
+            if meta and self._is_fresh(meta):
+                self._touch(key)
+                metrics_service.record_cache('poster', True)
+                return self._result(key, meta, 'hit')
+            metrics_service.record_cache('poster', False)
+
+            try:
+                if meta:
+                    result = self.upstream.fetch(url, meta.get('etag'), meta.get('last_modified'))
+                else:
+                    result = self.upstream.fetch(url)
+
+                if result.status == 304 and meta:
+                    kept = UpstreamResponse(304, content_type=meta['content_type'], etag=meta.get('etag'),
+                                            last_modified=meta.get('last_modified'),
+                                            max_age=result.max_age if result.max_age is not None else meta.get('max_age'))
+                    meta = self._write_entry(key, url, kept, None)
+                    self._touch(key)
+                    return self._result(key, meta, 'revalidated')
+
+                content_type = (result.content_type or '').split(';', 1)[0].strip().lower()
+                if result.status != 200 or not content_type.startswith('image/') or not result.body:
+                    raise ValueError(f'unusable upstream response ({result.status}, {content_type or "no type"})')
+                result.content_type = content_type
+                meta = self._write_entry(key, url, result, result.body)
+                return self._result(key, meta, 'miss')
+
+            except Exception as e:
+                print(f"Poster fetch failed ({url}): {e}")
+                if meta:
+                    self._touch(key)
+                    return self._result(key, meta, 'stale')
+                return None
+
+    def _result(self, key: str, meta: Dict, status: str) -> Dict:
+        return {'path': self._data_path(key), 'content_type': meta['content_type'], 'status': status}
+
+
+# Singleton instance
+poster_proxy = PosterProxy()
@@ -0,0 +1,224 @@
+"""
+Poster Service - Content-Addressed Uploads and Responsive Variants
+Uploaded posters are stored under their content hash (identical uploads
+share one file) and resized to WebP/JPEG variants on a background thread
+"""
+
+import hashlib
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Dict, Optional
+from config import get_config
+
+UPLOAD_FOLDER = 'static/images/uploads'
+VARIANT_FOLDER = os.path.join(UPLOAD_FOLDER, 'variants')
+
+# URL prefix served by routes/poster_routes.py with immutable caching
+UPLOAD_URL_PREFIX = '/posters/uploads/'
+
+# Served when a poster is missing or its remote copy can't be fetched
+DEFAULT_POSTER_PATH = 'static/images/default-poster.svg'
+
+# variant -> target width in pixels (never upscaled)
+VARIANTS = {
+    'thumb': 200,
+    'card': 400,
+    'detail': 800
+}
+VARIANT_FORMATS = {'webp': 'WEBP', 'jpg': 'JPEG'}
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+# Digest length in hex characters (128 bits)
+DIGEST_LENGTH = 32
+
+ORIGINAL_RE = re.compile(r'^([0-9a-f]{%d})\.(png|jpg|jpeg|gif|webp)$' % DIGEST_LENGTH)
+VARIANT_RE = re.compile(r'^([0-9a-f]{%d})-(%s)\.(webp|jpg)$' % (DIGEST_LENGTH, '|'.join(VARIANTS)))
+
+
+def _pillow():
+    """PIL.Image if Pillow is installed (imported on first use), else None"""
+    try:
+        from PIL import Image
+        return Image
+    except ImportError:
+        return None
+
+
+class PosterService:
+    def __init__(self):
+        self.proxy_enabled = get_config().POSTER_PROXY_ENABLED
+        self._executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+        # Pillow is looked for on first need, not at import
+        self._variants_supported = None
+
+    @property
+    def variants_supported(self) -> bool:
+        if self._variants_supported is None:
+            self._variants_supported = _pillow() is not None
+            if not self._variants_supported:
+                print("⚠️ Pillow not installed - posters served without resized variants")
+        return self._variants_supported
+
+    def after_fork(self):
+        """Drop the parent's variant pool; a forked worker starts its own on first upload"""
+        self._executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    # ========== STORAGE ==========
+
+    def store(self, data: bytes, extension: str) -> Dict:
+        """
+        Save an upload under its content hash and queue its variants
+
+        Returns the URLs for the poster plus whether an identical file was
+        already stored.
+        """
+        extension = extension.lower()
+        digest = hashlib.sha256(data).hexdigest()[:DIGEST_LENGTH]
+        filename = f'{digest}.{extension}'
+        path = os.path.join(UPLOAD_FOLDER, filename)
+
+        duplicate = os.path.exists(path)
+        if not duplicate:
+            os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+            # Write-then-rename so a concurrent reader never sees half a file
+            tmp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        self.schedule_variants(filename)
+        return dict(self.urls(filename), deduplicated=duplicate)
+
+    def original_path(self, filename: str) -> Optional[str]:
+        path = os.path.join(UPLOAD_FOLDER, filename)
+        return path if os.path.exists(path) else None
+
+    def find_original(self, digest: str) -> Optional[str]:
+        """Stored original filename for a digest (extension unknown to variant URLs)"""
+        for extension in ('jpg', 'jpeg', 'png', 'webp', 'gif'):
+            filename = f'{digest}.{extension}'
+            if os.path.exists(os.path.join(UPLOAD_FOLDER, filename)):
+                return filename
+        return None
+
+    # ========== VARIANTS ==========
+
+    def schedule_variants(self, filename: str):
+        """Generate missing variants of an original off the request thread"""
+        if not self.variants_supported:
+            return
+        digest = filename.split('.', 1)[0]
+        with self._lock:
+            if digest in self._pending or self._variants_complete(digest):
+                return
+            self._pending.add(digest)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='poster-variants')
+        self._executor.submit(self._generate_variants, filename, digest)
+
+    def _variants_complete(self, digest: str) -> bool:
+        return all(
+            os.path.exists(os.path.join(VARIANT_FOLDER, f'{digest}-{variant}.{fmt}'))
+            for variant in VARIANTS for fmt in VARIANT_FORMATS
+        )
+
+    def _generate_variants(self, filename: str, digest: str):
+        Image = _pillow()
+        try:
+            os.makedirs(VARIANT_FOLDER, exist_ok=True)
+            with Image.open(os.path.join(UPLOAD_FOLDER, filename)) as source:
+                source.seek(0)  # first frame of animated GIF/WebP
+                image = source.convert('RGBA') if source.mode in ('P', 'LA', 'RGBA') else source.convert('RGB')
+            if image.mode == 'RGBA':
+                # JPEG has no alpha: flatten onto the card background colour
+                background = Image.new('RGB', image.size, (26, 31, 58))
+                background.paste(image, mask=image.split()[3])
+                image = background
+
+            for variant, width in VARIANTS.items():
+                resized = image
+                if image.width > width:
+                    height = round(image.height * width / image.width)
+                    resized = image.resize((width, height), Image.LANCZOS)
+                for fmt, pil_format in VARIANT_FORMATS.items():
+                    buffer = BytesIO()
+                    if pil_format == 'JPEG':
+                        resized.save(buffer, pil_format, quality=JPEG_QUALITY, optimize=True, progressive=True)
+                    else:
+                        resized.save(buffer, pil_format, quality=WEBP_QUALITY, method=4)
+                    path = os.path.join(VARIANT_FOLDER, f'{digest}-{variant}.{fmt}')
+                    tmp_path = f'{path}.tmp'
+                    with open(tmp_path, 'wb') as f:
+                        f.write(buffer.getvalue())
+                    os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Poster variant error ({filename}): {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(digest)
+
+    def variant_path(self, name: str) -> Optional[str]:
+        path = os.path.join(VARIANT_FOLDER, name)
+        return path if os.path.exists(path) else None
+
+    # ========== URLS ==========
+
+    def urls(self, filename: str) -> Dict:
+        """Original URL plus variant URLs and srcset strings for an uploaded poster"""
+        digest = filename.split('.', 1)[0]
+        result = {'url': UPLOAD_URL_PREFIX + filename}
+        if not self.variants_supported:
+            return result
+        result['variants'] = {
+            variant: {
+                'width': width,
+                **{fmt: f'{UPLOAD_URL_PREFIX}{digest}-{variant}.{fmt}' for fmt in VARIANT_FORMATS}
+            }
+            for variant, width in VARIANTS.items()
+        }
+        result['srcset'] = self._srcset(digest, 'webp')
+        result['srcset_jpeg'] = self._srcset(digest, 'jpg')
+        return result
+
+    @staticmethod
+    def _srcset(digest: str, fmt: str) -> str:
+        return ', '.join(
+            f'{UPLOAD_URL_PREFIX}{digest}-{variant}.{fmt} {width}w'
+            for variant, width in VARIANTS.items()
+        )
+
+    @staticmethod
+    def is_remote(poster_url: Optional[str]) -> bool:
+        return bool(poster_url) and poster_url.startswith(('http://', 'https://'))
+
+    def display_url(self, movie_id, poster_url: Optional[str]) -> Optional[str]:
+        """URL the browser should load: remote posters go through /posters/<id>"""
+        if self.proxy_enabled and self.is_remote(poster_url):
+            return f'/posters/{movie_id}'
+        return poster_url
+
+    def poster_fields(self, movie) -> Dict:
+        """{'poster', 'poster_srcset'} for a Movie, merged into its to_dict() by the routes"""
+        return {
+            'poster': self.display_url(movie.id, movie.poster_url),
+            'poster_srcset': self.srcset_for(movie.poster_url)
+        }
+
+    def srcset_for(self, poster_url: Optional[str]) -> Optional[str]:
+        """WebP srcset for a movie's poster_url, if it is a content-addressed upload"""
+        if not poster_url or not poster_url.startswith(UPLOAD_URL_PREFIX) or not self.variants_supported:
+            return None
+        match = ORIGINAL_RE.match(poster_url[len(UPLOAD_URL_PREFIX):])
+        return self._srcset(match.group(1), 'webp') if match else None
+
+
+# Singleton instance
+poster_service = PosterService()
@@ -0,0 +1,263 @@
+"""
+Profiler Service - On-Demand Profiling for Admins
+Per-request cProfile captures and a periodic whole-process stack sampler
+Output is written to PROFILE_DIR as .pstats / .collapsed files
+
+The sampler is started and stopped through a control file in PROFILE_DIR
+that every worker process polls, so a request landing on any worker
+reaches all of them; each worker writes its own sampler_<pid> file.
+"""
+
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from config import get_config
+
+# Sampler session every worker follows: present (and not past `until`)
+# while sampling should run
+SAMPLER_CONTROL_FILE = 'sampler.json'
+# Seconds between a worker's checks of the control file
+CONTROL_POLL_SECONDS = 1.0
+
+
+class StackSampler:
+    """
+    Low-overhead sampling profiler
+
+    A daemon thread wakes every `interval` seconds, walks the current frame
+    of every other thread and counts the resulting stack. Output uses the
+    collapsed-stack format understood by flamegraph.pl and speedscope:
+        outer;middle;inner <count>
+    """
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.counts = Counter()
+        self.samples = 0
+        self.started_at = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _frame_label(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_label(frame))
+                    frame = frame.f_back
+                self.counts[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self.started_at = time.time()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def collapsed(self) -> str:
+        return ''.join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+class ProfilerService:
+    def __init__(self):
+        config = get_config()
+        self.profile_dir = config.PROFILE_DIR
+        self.sample_interval = config.PROFILER_SAMPLE_INTERVAL_MS / 1000.0
+        self.control_path = os.path.join(self.profile_dir, SAMPLER_CONTROL_FILE)
+        self.sampler = None
+        self._session = None  # control file id the local sampler belongs to
+        self._lock = threading.Lock()
+        self._watcher = None
+
+    def after_fork(self):
+        """In a forked worker: no sampler or watcher thread came along; start watching"""
+        self.sampler = None
+        self._session = None
+        self._lock = threading.Lock()
+        self._watcher = None
+        self.watch()
+
+    # ========== FILES ==========
+
+    def _output_path(self, label, extension):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', label).strip('_') or 'root'
+        stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')
+        return os.path.join(self.profile_dir, f"{stamp}_{slug}.{extension}")
+
+    def list_profiles(self):
+        """List captured profile files, newest first"""
+        if not os.path.isdir(self.profile_dir):
+            return []
+        profiles = []
+        for name in os.listdir(self.profile_dir):
+            if not name.endswith(('.pstats', '.collapsed')):
+                continue
+            stat = os.stat(os.path.join(self.profile_dir, name))
+            profiles.append({
+                'name': name,
+                'type': name.rsplit('.', 1)[1],
+                'size': stat.st_size,
+                'created_at': datetime.utcfromtimestamp(stat.st_mtime).isoformat()
+            })
+        profiles.sort(key=lambda p: p['name'], reverse=True)
+        return profiles
+
+    # ========== PER-REQUEST PROFILING ==========
+
+    @staticmethod
+    def start_request_profile():
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def finish_request_profile(self, profile, label):
+        """Stop a request profile and save it; returns the file name"""
+        profile.disable()
+        path = self._output_path(label, 'pstats')
+        profile.dump_stats(path)
+        return os.path.basename(path)
+
+    # ========== WHOLE-PROCESS SAMPLING ==========
+
+    def watch(self):
+        """Start this process's control file watcher (once)"""
+        with self._lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return
+            self._watcher = threading.Thread(target=self._watch, name='sampler-control', daemon=True)
+            self._watcher.start()
+
+    def _watch(self):
+        while True:
+            try:
+                self._sync()
+            except Exception as e:
+                print(f"⚠️ Sampler control check failed: {e}")
+            time.sleep(CONTROL_POLL_SECONDS)
+
+    def _read_control(self):
+        """The active sampler session, or None (no file, unreadable or past `until`)"""
+        try:
+            with open(self.control_path) as f:
+                control = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if control.get('until') is not None and time.time() >= control['until']:
+            return None
+        return control
+
+    def _sync(self):
+        """
+        Match the local sampler to the control file
+        Returns the file written if the local sampler was stopped
+        """
+        control = self._read_control()
+        with self._lock:
+            running = self.sampler is not None and self.sampler.running
+            if running and (control is None or control['id'] != self._session):
+                self.sampler.stop()
+                self._session = None
+                path = self._output_path(f'sampler_{os.getpid()}', 'collapsed')
+                with open(path, 'w') as f:
+                    f.write(self.sampler.collapsed())
+                return os.path.basename(path)
+            if control is not None and control['id'] != self._session:
+                self.sampler = StackSampler(control['interval_ms'] / 1000.0)
+                self.sampler.start()
+                self._session = control['id']
+            return None
+
+    def start_sampler(self, interval_ms=None, duration=None):
+        """
+        Start the stack sampler in every worker; optionally stop it after
+        `duration` seconds. False if a session is already running
+        """
+        self.watch()
+        if self._read_control() is not None:
+            return False
+        now = time.time()
+        control = {
+            'id': uuid.uuid4().hex,
+            'interval_ms': interval_ms or self.sample_interval * 1000,
+            'started_at': now,
+            'until': now + duration if duration else None
+        }
+        os.makedirs(self.profile_dir, exist_ok=True)
+        try:
+            os.remove(self.control_path)  # an ended session's file
+        except FileNotFoundError:
+            pass
+        # Linking the complete temp file fails if another worker created a
+        # session meanwhile, and pollers never see a half-written file
+        temp = f'{self.control_path}.{os.getpid()}.tmp'
+        with open(temp, 'w') as f:
+            json.dump(control, f)
+        try:
+            os.link(temp, self.control_path)
+        except FileExistsError:
+            return False
+        finally:
+            os.remove(temp)
+        self._sync()
+        return True
+
+    def stop_sampler(self):
+        """
+        Stop the sampler in every worker
+        Returns (stopped, file written by this worker or None); the other
+        workers write theirs within CONTROL_POLL_SECONDS
+        """
+        self.watch()
+        active = self._read_control() is not None
+        try:
+            os.remove(self.control_path)
+        except FileNotFoundError:
+            pass
+        name = self._sync()
+        return active or name is not None, name
+
+    def sampler_status(self):
+        """The running session, with this worker's sample count"""
+        self.watch()
+        control = self._read_control()
+        if control is None:
+            return {'running': False}
+        sampler = self.sampler if self._session == control['id'] else None
+        return {
+            'running': True,
+            'interval_ms': control['interval_ms'],
+            'samples': sampler.samples if sampler is not None else 0,
+            'pid': os.getpid(),
+            'started_at': datetime.utcfromtimestamp(control['started_at']).isoformat(),
+            'until': datetime.utcfromtimestamp(control['until']).isoformat() if control['until'] else None
+        }
+
+
+# Singleton instance
+profiler_service = ProfilerService()
@@ -0,0 +1,227 @@
+"""
+Response Service - Encoding, Compression and Caching
+Fast JSON encoding (orjson when installed), negotiated gzip/brotli
+compression, and a cache of pre-encoded, pre-compressed bodies for the
+hottest API responses, keyed by the database's data version
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request
+from flask.json.provider import DefaultJSONProvider
+from config import get_config
+from services.metrics_service import metrics_service
+from services.db_service import db_service
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies worth compressing (everything else, e.g. images, already is)
+COMPRESSIBLE_TYPES = {
+    'application/json', 'application/javascript', 'text/javascript',
+    'text/html', 'text/css', 'text/plain', 'image/svg+xml'
+}
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+# ========== JSON ==========
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes with orjson when it is installed
+
+    Falls back to Flask's encoder otherwise (or when dumps() is given
+    json.dumps-specific options). Types orjson doesn't know (Decimal,
+    datetime, dataclasses) go through Flask's default, so output matches.
+    """
+
+    def _orjson_options(self):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._orjson_options()).decode()
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._orjson_options())
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+# ========== COMPRESSION ==========
+
+def negotiate_encoding():
+    """Best encoding the client accepts: br (if brotli is installed), then gzip"""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br'] > 0:
+        return 'br'
+    if accepted['gzip'] > 0:
+        return 'gzip'
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    # mtime=0 keeps output deterministic for identical bodies
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_response(response):
+    """
+    after_request hook: compress text responses above the size threshold
+
+    Skips streamed/file responses, already-encoded bodies (e.g. from the
+    response cache) and anything that isn't a text type.
+    """
+    config = get_config()
+    if not config.COMPRESSION_ENABLED:
+        return response
+    if (response.direct_passthrough
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if response.content_length is None or response.content_length < config.COMPRESSION_MIN_SIZE:
+        return response
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    response.set_data(compress(response.get_data(), encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+# ========== RESPONSE CACHE ==========
+
+class _CachedBody:
+    """One encoded response body plus its lazily built compressed variants"""
+    __slots__ = ('version', 'created', 'body', 'mimetype', 'etag', 'variants')
+
+    def __init__(self, version, body, mimetype):
+        self.version = version
+        self.created = time.time()
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.variants = {}
+
+    def encoded(self, encoding):
+        data = self.variants.get(encoding)
+        if data is None:
+            data = self.variants[encoding] = compress(self.body, encoding)
+        return data
+
+
+class ResponseCache:
+    """
+    LRU of pre-encoded response bodies keyed by (path, query args)
+
+    An entry is served only while the data version it was built from is
+    still current and it is younger than RESPONSE_CACHE_TTL; the TTL bounds
+    staleness for writes made by other worker processes, whose version
+    bumps this process never sees.
+    """
+
+    def __init__(self):
+        config = get_config()
+        self.enabled = config.RESPONSE_CACHE_ENABLED
+        self.ttl = config.RESPONSE_CACHE_TTL
+        self.max_entries = config.RESPONSE_CACHE_MAX_ENTRIES
+        self.min_size = config.COMPRESSION_MIN_SIZE
+        self.compression = config.COMPRESSION_ENABLED
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.version != version or time.time() - entry.created > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, version, body, mimetype):
+        entry = _CachedBody(version, body, mimetype)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def build_response(self, entry):
+        """Response for a cached body: 304 on a matching ETag, else the best encoding"""
+        response = current_app.response_class(mimetype=entry.mimetype)
+        response.set_etag(entry.etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.vary.add('Accept-Encoding')
+        if request.if_none_match.contains_weak(entry.etag):
+            response.status_code = 304
+            return response
+
+        encoding = negotiate_encoding() if self.compression and len(entry.body) >= self.min_size else None
+        if encoding:
+            response.set_data(entry.encoded(encoding))
+            response.headers['Content-Encoding'] = encoding
+        else:
+            response.set_data(entry.body)
+        return response
+
+
+def cached_response(view):
+    """
+    Serve a view's 200 responses from the response cache
+
+    Only for views whose output depends on nothing but the URL and the
+    database contents (no session-specific data).
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not response_cache.enabled:
+            return view(*args, **kwargs)
+
+        key = (request.path, tuple(sorted(request.args.items(multi=True))))
+        version = db_service.data_version
+        entry = response_cache.get(key, version)
+        metrics_service.record_cache('response', entry is not None)
+        if entry is None:
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            entry = response_cache.put(key, version, response.get_data(), response.mimetype)
+        return response_cache.build_response(entry)
+    return wrapper
+
+
+# Singleton instance
+response_cache = ResponseCache()
@@ -3,6 +3,56 @@ Sentiment Analysis Service
 Multiple methods from basic to advanced ML
 """
 
+import threading
+from services.metrics_service import metrics_service
+
+# Analyzers are imported and built on first use (or by warmup()), then
+# reused: VADER's lexicon load and the transformer model are the slow part
+_analyzers = {}
+_analyzers_lock = threading.Lock()
+
+
+def _analyzer(name: str, build):
+    """Cached analyzer `name`, built with build() the first time (ImportError propagates)"""
+    analyzer = _analyzers.get(name)
+    if analyzer is None:
+        with _analyzers_lock:
+            analyzer = _analyzers.get(name)
+            if analyzer is None:
+                analyzer = _analyzers[name] = build()
+    return analyzer
+
+
+def _build_vader():
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
+
+def _build_transformers():
+    from transformers import pipeline
+    # Downloads ~500MB model on first run!
+    return pipeline('sentiment-analysis', model='distilbert-base-uncased-finetuned-sst-2-english')
+
+
+def _build_comprehend():
+    import boto3
+    return boto3.client('comprehend', region_name='us-east-1')
+
+
+def after_fork():
+    """In a forked worker: drop the Comprehend client (boto3 isn't fork-safe); local models are kept"""
+    global _analyzers_lock
+    _analyzers_lock = threading.Lock()
+    _analyzers.pop('comprehend', None)
+
+
+def warmup():
+    """Load the default analyzer (VADER) now instead of on the first review"""
+    try:
+        _analyzer('vader', _build_vader)
+    except ImportError:
+        pass
+
 # Method 1: Simple keyword-based (current - no dependencies)
 def analyze_sentiment_basic(comment: str, rating: int) -> dict:
     """
@@ -61,9 +111,7 @@ def analyze_sentiment_vader(comment: str, rating: int) -> dict:
     Install: pip install vaderSentiment
     """
     try:
-        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-        
-        analyzer = SentimentIntensityAnalyzer()
+        analyzer = _analyzer('vader', _build_vader)
         scores = analyzer.polarity_scores(comment)
         
         # VADER returns: {'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0}
@@ -147,12 +195,8 @@ def analyze_sentiment_transformers(comment: str, rating: int) -> dict:
     NOTE: This is heavy! Use only on EC2 with GPU, not locally
     """
     try:
-        from transformers import pipeline
-        
-        # Load pre-trained sentiment analysis model
-        # This downloads ~500MB model on first run!
-        classifier = pipeline('sentiment-analysis', 
-                            model='distilbert-base-uncased-finetuned-sst-2-english')
+        # Pre-trained model, loaded once per process
+        classifier = _analyzer('transformers', _build_transformers)
         
         result = classifier(comment)[0]
         
@@ -182,9 +226,7 @@ def analyze_sentiment_aws_comprehend(comment: str, rating: int) -> dict:
     Cost: $0.0001 per request (very cheap!)
     """
     try:
-        import boto3
-        
-        comprehend = boto3.client('comprehend', region_name='us-east-1')
+        comprehend = _analyzer('comprehend', _build_comprehend)
         
         response = comprehend.detect_sentiment(
             Text=comment,
@@ -220,6 +262,7 @@ def analyze_sentiment_aws_comprehend(comment: str, rating: int) -> dict:
 
 
 # Main function - automatically selects best available method
+@metrics_service.timed('sentiment')
 def analyze_sentiment(comment: str, rating: int, method: str = 'auto') -> dict:
     """
     Main sentiment analysis function
@@ -277,6 +320,9 @@ def analyze_all_feedback(feedbacks: list) -> dict:
     """
     Analyze sentiment distribution across all feedback
     
+    Re-runs the analyzer on every comment; dashboards should use the stored
+    counters via db_service.get_sentiment_summary() instead.
+    
     Args:
         feedbacks: List of feedback dicts with 'comment' and 'rating'
     
@@ -0,0 +1,99 @@
+"""
+Trending Service
+In-memory top-K per trending window, maintained incrementally from local
+feedback writes and periodically reloaded from the bucket counters
+"""
+
+import heapq
+import threading
+import time
+from collections import Counter
+from operator import itemgetter
+from config import get_config
+from database import trending
+
+
+class WindowCounter:
+    """Running per-movie totals over the buckets of one trending window"""
+
+    def __init__(self, window):
+        self.window = window
+        self.granularity = trending.WINDOWS[window][0]
+        self.buckets = {}       # bucket_start -> Counter(movie_id -> reviews)
+        self.totals = Counter()
+        self.loaded_at = 0.0
+
+    def load(self, counts):
+        """Replace state with counts read from storage"""
+        self.buckets = {start: Counter(movies) for start, movies in counts.items()}
+        self.totals = Counter()
+        for movies in self.buckets.values():
+            self.totals.update(movies)
+        self.loaded_at = time.time()
+
+    def advance(self, now=None):
+        """Expire buckets that slid out of the window"""
+        live = set(trending.window_buckets(self.window, now))
+        for start in [s for s in self.buckets if s not in live]:
+            self.totals.subtract(self.buckets.pop(start))
+        for start in live:
+            self.buckets.setdefault(start, Counter())
+        # Drop movies whose count fell to zero so top-K stays small
+        self.totals = +self.totals
+
+    def add(self, movie_id, n=1, now=None):
+        start = trending.bucket_start(self.granularity, now)
+        if start not in self.buckets:
+            self.advance(now)
+        self.buckets[start][movie_id] += n
+        self.totals[movie_id] += n
+
+    def forget(self, movie_id):
+        for movies in self.buckets.values():
+            movies.pop(movie_id, None)
+        self.totals.pop(movie_id, None)
+
+    def top(self, k):
+        return heapq.nlargest(k, self.totals.items(), key=itemgetter(1))
+
+
+class TrendingService:
+    def __init__(self):
+        config = get_config()
+        self.refresh_seconds = config.TRENDING_REFRESH_SECONDS
+        self.windows = {window: WindowCounter(window) for window in trending.WINDOWS}
+        self._lock = threading.Lock()
+
+    def record(self, movie_id):
+        """Count a review written by this process (storage is updated by the backend)"""
+        with self._lock:
+            for counter in self.windows.values():
+                if counter.loaded_at:
+                    counter.add(movie_id)
+
+    def forget(self, movie_id):
+        """Drop a deleted movie from every window"""
+        with self._lock:
+            for counter in self.windows.values():
+                counter.forget(movie_id)
+
+    def get_trending(self, db, window, limit=10):
+        """
+        Top `limit` movies by reviews in the window as [(movie_id, reviews)]
+
+        Reads only the window's buckets from storage, and only when the
+        in-memory counter is older than TRENDING_REFRESH_SECONDS.
+        """
+        counter = self.windows[window]
+        now = time.time()
+        if now - counter.loaded_at > self.refresh_seconds:
+            counts = db.get_activity_counts(counter.granularity, trending.window_buckets(window, now))
+            with self._lock:
+                counter.load(counts)
+        with self._lock:
+            counter.advance(now)
+            return counter.top(limit)
+
+
+# Singleton instance
+trending_service = TrendingService()
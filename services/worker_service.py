@@ -0,0 +1,102 @@
+"""
+Worker Service - Pre-fork Process Lifecycle
+The app is imported once in the server's master process and forked into
+workers. Each worker rebuilds what doesn't survive fork (threads, boto3
+clients, the SQLite group-commit writer) and reports readiness
+"""
+
+import os
+import threading
+import time
+from typing import Dict
+
+
+class WorkerService:
+    def __init__(self):
+        self.pid = os.getpid()
+        self.started_at = time.time()
+        self.forked = False
+        self.draining = False
+        self._lock = threading.Lock()
+
+    def post_fork(self):
+        """Run in each worker right after fork, before it takes requests"""
+        # Imported here: this module is loaded by server config before the app
+        from services.db_service import db_service
+        from services.notification_service import notification_service
+        from services.poster_service import poster_service
+        from services.job_service import job_service
+        from services.profiler_service import profiler_service
+        from services import sentiment_service
+
+        self._lock = threading.Lock()
+        with self._lock:
+            self.pid = os.getpid()
+            self.started_at = time.time()
+            self.forked = True
+            self.draining = False
+        db_service.after_fork()
+        notification_service.after_fork()
+        poster_service.after_fork()
+        sentiment_service.after_fork()
+        job_service.after_fork()
+        profiler_service.after_fork()
+        self.warmup()
+        print(f"✓ Worker {self.pid} initialized")
+
+    def warmup(self):
+        """
+        Build what the app otherwise builds on first use: the database
+        backend, the SNS client, the sentiment analyzer and the asset
+        manifest. Called by the server before traffic arrives (in the
+        master, so SQLite setup runs once, and again in each worker)
+        """
+        from services.asset_service import asset_manifest
+        from services.db_service import db_service
+        from services.notification_service import notification_service
+        from services import sentiment_service
+
+        started = time.perf_counter()
+        db_service.warmup()
+        notification_service.warmup()
+        sentiment_service.warmup()
+        asset_manifest.warmup()
+        return round((time.perf_counter() - started) * 1000, 1)
+
+    def begin_drain(self):
+        """Stop reporting ready; in-flight requests still finish"""
+        with self._lock:
+            self.draining = True
+
+    def wait_for_jobs(self, notify=None):
+        """
+        Before the worker exits: let its background jobs (cascade deletes)
+        finish rather than die with the process. notify() is called about
+        once a second while waiting
+        """
+        from services.job_service import job_service
+
+        running = job_service.running()
+        if not running:
+            return
+        print(f"✓ Worker {self.pid} finishing {running} background job(s) before exiting")
+        while not job_service.drain(timeout=1):
+            if notify:
+                notify()
+
+    def readiness(self) -> Dict:
+        """{'ready': bool, ...}: not draining and the backend answers a query"""
+        from services.db_service import db_service
+
+        status = {'pid': self.pid, 'uptime_seconds': round(time.time() - self.started_at, 1)}
+        if self.draining:
+            return {'ready': False, 'reason': 'draining', **status}
+        try:
+            db_service.ping()
+        except Exception as e:
+            return {'ready': False, 'reason': f'database: {e}', **status}
+        return {'ready': True, **status}
+
+
+# Singleton instance
+worker_service = WorkerService()
@@ -2,8 +2,7 @@
 // CinemaPulse - Interactive JavaScript (STABLE)
 // ===============================================
 
-const DEFAULT_POSTER =
-  'https://via.placeholder.com/400x600?text=No+Poster';
+const DEFAULT_POSTER = '/static/images/default-poster.svg';
 
 // ===============================================
 // LOGIN VALIDATION (FIXED)
@@ -136,7 +135,7 @@ async function validateFeedback(event) {
 // ===============================================
 async function loadMovies() {
     try {
-        const response = await fetch('/api/movies');
+        const [response, reviewed] = await Promise.all([fetch('/api/movies'), fetchReviewedIds()]);
         const data = await response.json();
         if (!data.success || !data.movies) return;
 
@@ -145,7 +144,7 @@ async function loadMovies() {
 
         grid.innerHTML = '';
         data.movies.forEach(movie => {
-            grid.appendChild(createMovieCard(movie));
+            grid.appendChild(createMovieCard(movie, reviewed.has(movie.id)));
         });
 
     } catch (error) {
@@ -153,10 +152,64 @@ async function loadMovies() {
     }
 }
 
+// ===============================================
+// SEARCH (DASHBOARD)
+// ===============================================
+async function searchMovies() {
+    const query = document.getElementById('search-input')?.value.trim();
+    const genre = document.getElementById('genre-filter')?.value;
+    const minRating = parseFloat(document.getElementById('rating-filter')?.value || '0');
+
+    try {
+        const url = query
+            ? `/api/search?type=movies&per_page=50&q=${encodeURIComponent(query)}`
+            : '/api/movies';
+        const [response, reviewed] = await Promise.all([fetch(url), fetchReviewedIds()]);
+        const data = await response.json();
+        if (!data.success || !data.movies) return;
+
+        const grid = document.querySelector('.movie-grid');
+        if (!grid) return;
+
+        const movies = data.movies.filter(movie =>
+            (!genre || movie.genre === genre) && (movie.rating || 0) >= minRating
+        );
+
+        grid.innerHTML = movies.length ? '' :
+            '<div style="text-align: center; color: var(--text-gray); padding: 2rem;">No movies found</div>';
+        movies.forEach(movie => {
+            grid.appendChild(createMovieCard(movie, reviewed.has(movie.id)));
+        });
+
+    } catch (error) {
+        console.error('Search error:', error);
+    }
+}
+
+function resetSearch() {
+    ['search-input', 'genre-filter', 'rating-filter'].forEach(id => {
+        const el = document.getElementById(id);
+        if (el) el.value = '';
+    });
+    loadMovies();
+}
+
+// Ids of the movies the logged-in user has reviewed (empty when logged out)
+async function fetchReviewedIds() {
+    try {
+        const response = await fetch('/api/me/reviewed');
+        if (!response.ok) return new Set();
+        const data = await response.json();
+        return new Set(data.movie_ids || []);
+    } catch (error) {
+        return new Set();
+    }
+}
+
 // ===============================================
 // CREATE MOVIE CARD (BULLETPROOF)
 // ===============================================
-function createMovieCard(movie) {
+function createMovieCard(movie, reviewed = false) {
     const card = document.createElement('div');
     card.className = 'movie-card';
 
@@ -165,10 +218,16 @@ function createMovieCard(movie) {
         ? movie.description.substring(0, 100)
         : 'No description available';
 
+    // Uploaded posters come with resized variants; let the browser pick one
+    const srcset = movie.poster_srcset
+        ? `srcset="${movie.poster_srcset}" sizes="(max-width: 768px) 100vw, 400px"`
+        : '';
+
     card.innerHTML = `
-        <img src="${poster}"
+        <img src="${poster}" ${srcset}
              class="movie-poster"
-             onerror="this.src='${DEFAULT_POSTER}'">
+             loading="lazy"
+             onerror="this.removeAttribute('srcset'); this.src='${DEFAULT_POSTER}'">
 
         <div class="movie-info">
             <h2 class="movie-title">${movie.title}</h2>
@@ -176,6 +235,7 @@ function createMovieCard(movie) {
             <div class="movie-rating">
                 <span class="stars">★★★★★</span>
                 <span class="rating-text">${movie.rating || 0}/5</span>
+                ${reviewed ? '<span class="reviewed-badge">✓ Reviewed</span>' : ''}
             </div>
 
             <p class="movie-description">${description}...</p>
@@ -211,11 +271,19 @@ async function loadMovieDetails(movieId) {
 
         const posterEl = document.querySelector('.detail-poster');
         if (posterEl) {
+            if (movie.poster_srcset) {
+                posterEl.srcset = movie.poster_srcset;
+                posterEl.sizes = '(max-width: 768px) 100vw, 800px';
+            }
             posterEl.src = movie.poster || DEFAULT_POSTER;
-            posterEl.onerror = () => posterEl.src = DEFAULT_POSTER;
+            posterEl.onerror = () => {
+                posterEl.removeAttribute('srcset');
+                posterEl.src = DEFAULT_POSTER;
+            };
         }
 
         loadReviews(movie.reviews || []);
+        setReviewsCursor(movieId, movie.reviews_next_cursor);
 
     } catch (error) {
         console.error('Error loading movie details:', error);
@@ -225,11 +293,14 @@ async function loadMovieDetails(movieId) {
 // ===============================================
 // REVIEWS
 // ===============================================
-function loadReviews(reviews) {
+function loadReviews(reviews, append = false) {
     const section = document.querySelector('.reviews-section');
     if (!section) return;
 
-    section.querySelectorAll('.review-card').forEach(r => r.remove());
+    if (!append) {
+        section.querySelectorAll('.review-card').forEach(r => r.remove());
+    }
+    const more = section.querySelector('.load-more-reviews');
 
     reviews.forEach(review => {
         const div = document.createElement('div');
@@ -241,10 +312,42 @@ function loadReviews(reviews) {
             </div>
             <p>${review.comment}</p>
         `;
-        section.appendChild(div);
+        section.insertBefore(div, more);
     });
 }
 
+// Older reviews are fetched a page at a time
+function setReviewsCursor(movieId, cursor) {
+    const section = document.querySelector('.reviews-section');
+    if (!section) return;
+
+    let button = section.querySelector('.load-more-reviews');
+    if (!cursor) {
+        button && button.remove();
+        return;
+    }
+    if (!button) {
+        button = document.createElement('button');
+        button.className = 'btn btn-secondary load-more-reviews';
+        button.textContent = 'Load more reviews';
+        section.appendChild(button);
+    }
+    button.onclick = () => loadMoreReviews(movieId, cursor);
+}
+
+async function loadMoreReviews(movieId, cursor) {
+    try {
+        const response = await fetch(`/api/movies/${movieId}/reviews?cursor=${encodeURIComponent(cursor)}`);
+        const data = await response.json();
+        if (!data.success) return;
+
+        loadReviews(data.reviews, true);
+        setReviewsCursor(movieId, data.next_cursor);
+    } catch (error) {
+        console.error('Error loading reviews:', error);
+    }
+}
+
 // ===============================================
 // ANALYTICS
 // ===============================================
@@ -298,6 +401,9 @@ document.addEventListener('DOMContentLoaded', () => {
 
     if (document.querySelector('.movie-grid')) loadMovies();
 
+    document.getElementById('search-input')
+        ?.addEventListener('keydown', e => { if (e.key === 'Enter') searchMovies(); });
+
     if (location.pathname.startsWith('/movie/'))
         loadMovieDetails(location.pathname.split('/')[2]);
 
@@ -0,0 +1,11 @@
+"""
+Shared test setup: the repo root on sys.path, so tests import the app's
+packages the same way app.py does
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,231 @@
+"""
+Poster proxy against a local stub upstream
+The proxy's fetcher is swapped (use_upstream) for one that sends every
+poster URL to an HTTP server on localhost, so the real HTTP path is used
+with no network access
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+
+from models.movie import Movie
+from services.poster_proxy_service import HTTPUpstream, PosterProxy
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PNG = b'\x89PNG\r\n\x1a\n' + b'x' * 92  # 100 bytes
+
+
+class StubUpstream:
+    """
+    Poster origin on localhost: path -> (status, body, headers)
+
+    Answers 304 when If-None-Match matches the route's ETag and records
+    every request's path and conditional header.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append((self.path, self.headers.get('If-None-Match')))
+                status, body, headers = stub.routes.get(self.path, (404, b'', {}))
+                if status == 200 and headers.get('ETag') and self.headers.get('If-None-Match') == headers['ETag']:
+                    status, body = 304, b''
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def serve(self, path, body=PNG, status=200, content_type='image/png', etag=None, max_age=None):
+        headers = {'Content-Type': content_type}
+        if etag:
+            headers['ETag'] = etag
+        if max_age is not None:
+            headers['Cache-Control'] = f'max-age={max_age}'
+        self.routes[path] = (status, body, headers)
+
+    def fetcher(self):
+        """HTTPUpstream that rewrites any poster URL to this server"""
+        base = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+        class Rewriting(HTTPUpstream):
+            def fetch(self, url, etag=None, last_modified=None):
+                return super().fetch(base + urlsplit(url).path, etag, last_modified)
+
+        return Rewriting(timeout=2, max_bytes=1024 * 1024)
+
+    def hits(self, path):
+        return [header for requested, header in self.requests if requested == path]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def upstream():
+    stub = StubUpstream()
+    yield stub
+    stub.close()
+
+
+@pytest.fixture
+def make_proxy(tmp_path, upstream):
+    """PosterProxy on a temp cache dir; same dir across calls, like a restart"""
+    def make(max_bytes=10 * 1024 * 1024, ttl=3600):
+        proxy = PosterProxy()
+        proxy.cache_dir = str(tmp_path / 'cache')
+        proxy.max_bytes = max_bytes
+        proxy.default_ttl = ttl
+        proxy.use_upstream(upstream.fetcher())
+        return proxy
+    return make
+
+
+def read(result):
+    with open(result['path'], 'rb') as f:
+        return f.read()
+
+
+def test_miss_then_hit(upstream, make_proxy):
+    upstream.serve('/a.png')
+    proxy = make_proxy()
+
+    first = proxy.get('https://images.example.com/a.png')
+    second = proxy.get('https://images.example.com/a.png')
+
+    assert first['status'] == 'miss'
+    assert second['status'] == 'hit'
+    assert second['content_type'] == 'image/png'
+    assert read(second) == PNG
+    assert len(upstream.hits('/a.png')) == 1
+
+
+def test_stale_entry_is_revalidated_with_304(upstream, make_proxy):
+    upstream.serve('/a.png', etag='"v1"', max_age=0)
+    proxy = make_proxy()
+
+    proxy.get('https://images.example.com/a.png')
+    result = proxy.get('https://images.example.com/a.png')
+
+    assert result['status'] == 'revalidated'
+    assert read(result) == PNG
+    assert upstream.hits('/a.png') == [None, '"v1"']
+
+
+def test_changed_upstream_replaces_the_copy(upstream, make_proxy):
+    upstream.serve('/a.png', etag='"v1"', max_age=0)
+    proxy = make_proxy()
+    proxy.get('https://images.example.com/a.png')
+
+    upstream.serve('/a.png', body=b'\x89PNG new', etag='"v2"', max_age=0)
+    result = proxy.get('https://images.example.com/a.png')
+
+    assert result['status'] == 'miss'
+    assert read(result) == b'\x89PNG new'
+    assert proxy.stats()['bytes'] == len(b'\x89PNG new')
+
+
+def test_stale_copy_served_when_upstream_fails(upstream, make_proxy):
+    upstream.serve('/a.png', max_age=0)
+    proxy = make_proxy()
+    proxy.get('https://images.example.com/a.png')
+
+    upstream.serve('/a.png', body=b'boom', status=500, content_type='text/plain')
+    result = proxy.get('https://images.example.com/a.png')
+
+    assert result['status'] == 'stale'
+    assert read(result) == PNG
+
+
+def test_no_copy_and_unusable_upstream(upstream, make_proxy):
+    upstream.serve('/page.html', body=b'<html></html>', content_type='text/html')
+    proxy = make_proxy()
+
+    assert proxy.get('https://images.example.com/missing.png') is None
+    assert proxy.get('https://images.example.com/page.html') is None
+    assert proxy.stats()['entries'] == 0
+
+
+def test_lru_eviction_by_bytes(upstream, make_proxy):
+    for name in ('a', 'b', 'c'):
+        upstream.serve(f'/{name}.png')
+    proxy = make_proxy(max_bytes=250)
+
+    proxy.get('https://images.example.com/a.png')
+    proxy.get('https://images.example.com/b.png')
+    proxy.get('https://images.example.com/a.png')  # a is now the most recent
+    proxy.get('https://images.example.com/c.png')  # 300 bytes: b goes
+
+    assert proxy.stats() == {'entries': 2, 'bytes': 200, 'max_bytes': 250}
+    assert proxy.get('https://images.example.com/a.png')['status'] == 'hit'
+    assert proxy.get('https://images.example.com/b.png')['status'] == 'miss'
+    assert len(upstream.hits('/b.png')) == 2
+
+
+def test_cache_index_survives_restart(upstream, make_proxy):
+    upstream.serve('/a.png')
+    make_proxy().get('https://images.example.com/a.png')
+
+    restarted = make_proxy()
+
+    assert restarted.stats()['entries'] == 1
+    assert restarted.get('https://images.example.com/a.png')['status'] == 'hit'
+    assert len(upstream.hits('/a.png')) == 1
+
+
+@pytest.fixture
+def client(monkeypatch, make_proxy):
+    """App client whose poster route uses a temp proxy and a stub movie lookup"""
+    monkeypatch.chdir(ROOT)
+    from app import app
+    from routes import poster_routes
+
+    movies = {}
+    monkeypatch.setattr(poster_routes.db_service, 'get_movie_by_id', lambda movie_id: movies.get(movie_id))
+    monkeypatch.setattr(poster_routes, 'poster_proxy', make_proxy())
+    app.config['TESTING'] = True
+    client = app.test_client()
+    client.movies = movies
+    return client
+
+
+def test_route_serves_proxied_poster(upstream, client):
+    upstream.serve('/a.png')
+    client.movies[1] = Movie(1, 'A', poster_url='https://images.example.com/a.png')
+
+    response = client.get('/posters/1')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'image/png'
+    assert response.headers['X-Poster-Cache'] == 'miss'
+    assert response.data == PNG
+    response.close()
+
+
+def test_route_falls_back_to_default_image(upstream, client):
+    client.movies[1] = Movie(1, 'A', poster_url='https://images.example.com/missing.png')
+
+    for path in ('/posters/1', '/posters/2'):  # upstream 404, unknown movie
+        response = client.get(path)
+        assert response.status_code == 200
+        assert response.mimetype == 'image/svg+xml'
+        assert response.headers['Cache-Control'] == 'public, max-age=300'
+        assert 'X-Poster-Cache' not in response.headers
+        response.close()
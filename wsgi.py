@@ -0,0 +1,13 @@
+"""
+CinemaPulse WSGI Entry Point
+For production servers: gunicorn -c gunicorn.conf.py (or python serve.py)
+"""
+
+import os
+
+if os.environ.get('ENV_MODE', 'local') == 'aws':
+    from aws_app import app
+else:
+    from app import app
+
+application = app